@@ -1,50 +1,152 @@
+import os
 import atexit
 import logging
-from typing import List, Dict
+import threading
+from typing import Any, List, Dict
 
 from .utils.file_processor import FileProcessor
+from .utils.journal import Journal
+from .utils.autosave import Autosave
+from .utils.job_workspace import JobWorkspace
+from .utils.inventory_store import InventoryStore
+from .utils.records import PlateRecord, RouterRecord, RecordCollection, LazyRecords
+from .utils.plate_index import PlateIndex
+from .utils.plate_util import PlateUtil
+from .utils.contour_util import ContourUtil
+
+from ..config import JOURNAL_SYNC_INTERVAL, JOURNAL_COMPACTION_THRESHOLD, AUTOSAVE_INTERVAL
 
 class DataManager:
     """
     Class for loading, saving, and storing all application data with the exception of temporary matplotlib preview files. 
-    Loads permanent files at initialization and saves at exit. 
-    Cleans out temporary directories at exit.
+    Loads snapshot files at initialization and replays the journal of mutations made since they were saved.
+    Mutations are appended to the journal as they happen, and compacted into the snapshot files by a background
+    autosave at most once per autosave interval, or right away once the journal grows past the compaction
+    threshold. Only files of collections changed since the last snapshot are rewritten. Compacts and cleans out
+    temporary directories at exit.
+    If a database path is given, data is kept in an SQLite store instead, migrated from the files on first use,
+    and plates and routers are loaded lazily as they are accessed.
     
     ### Arguments:
     - user_pref_path: Path for user preference file (json).
     - router_data_path: Path for router data file (csv).
     - plate_data_path: Path for plate data file (csv).
     - temp_data_folders: List of directories for storing temporary data.
+    - journal_path: Path for mutation journal file (jsonl).
+    - sync_interval: Maximum time in seconds a journaled mutation waits to be synced to disk.
+    - compaction_threshold: Amount of journal entries triggering compaction.
+    - autosave_interval: Time in seconds from a mutation until changed collections are saved to snapshot files.
+    - database_path: Path for SQLite store, files and journal are used if not given.
+    - geometry_folder: Folder for plate contour sidecar files, contours are kept inline in plate data file if not given.
+    - workspace_folder: Folder for job workspace persisting imported parts across sessions, parts start empty each session if not given.
     """
 
-    def __init__(self, user_pref_path: str, router_data_path: str, plate_data_path: str, temp_data_folders: list):
+    PLATES = 'plates'
+    ROUTERS = 'routers'
+    PREFERENCES = 'preferences'
+
+    UPSERT = 'upsert'
+    REMOVE = 'remove'
+    SET = 'set'
+
+    def __init__(self, user_pref_path: str, router_data_path: str, plate_data_path: str, temp_data_folders: list, journal_path: str, sync_interval: float = JOURNAL_SYNC_INTERVAL, compaction_threshold: int = JOURNAL_COMPACTION_THRESHOLD, autosave_interval: float = AUTOSAVE_INTERVAL, database_path: str = None, geometry_folder: str = None, workspace_folder: str = None):
         self._user_preference_file_path = user_pref_path
         self._router_data_path = router_data_path
         self._plate_data_path = plate_data_path
         self._temp_data_folders = temp_data_folders
+        self._geometry_folder = geometry_folder
+        self._workspace: JobWorkspace = None
+        if workspace_folder is not None:
+            self._workspace = JobWorkspace(workspace_folder)
 
         self._logger = logging.getLogger(__name__)  
 
+        if geometry_folder is not None:
+            os.makedirs(geometry_folder, exist_ok=True)
+
+        self._journal = Journal(journal_path, sync_interval)
+        self._compaction_threshold = compaction_threshold
+        self._autosave = Autosave(self._compact, autosave_interval)
+        self._lock = threading.Lock() # guards mutations against snapshots taken on autosave thread
+        self._dirty = set() # collections changed since last snapshot
+
+        self._store: InventoryStore = None
+        if database_path is not None:
+            self._store = InventoryStore(database_path)
+
+        self._plate_index = PlateIndex(lambda material, thickness: self.query_plates(material, thickness))
+
         self._init_long_term_data()
         self._init_temp_data()
         atexit.register(self._atexit)
 
     def _init_long_term_data(self):
         """
-        Attempts to load long term data from paths specified at initialization, raises exception if an error occurs. 
+        Attempts to load long term data from paths specified at initialization and replay journal, logs exception if an error occurs. 
         """
+        self.user_preferences, self.router_data, self.plate_data = {}, RecordCollection(), RecordCollection()
         try:
-            self.user_preferences = self._get_user_preferences()
-            self.router_data = self._get_router_data()
-            self.plate_data = self._get_plate_data()
+            self.user_preferences = self._get_user_preferences() or {}
+            self.router_data = RecordCollection(RouterRecord.from_dict(router) for router in self._get_router_data() or [])
+            self.plate_data = RecordCollection(PlateRecord.from_dict(plate) for plate in self._get_plate_data() or [])
         except Exception as e:
             self._logger.error(f"Error initializing long-term data: {e}")
 
+        try:
+            interrupted_compaction = os.path.exists(self._journal.rotated_path)
+            entries = self._journal.replay()
+            for entry in entries:
+                self._apply(entry)
+            self._logger.debug(f"Replayed {len(entries)} journal entries.")
+
+            if interrupted_compaction: # rotated entries may belong to any collection
+                self._save_snapshot(self._get_snapshot({self.PREFERENCES, self.ROUTERS, self.PLATES}))
+                self._journal.remove_rotated()
+        except Exception as e:
+            self._logger.error(f"Error replaying journal: {e}")
+
+        if self._store is not None:
+            self._init_store_data()
+
+    def _init_store_data(self):
+        """
+        Migrates loaded data into empty store, then replaces it with lazily loaded store data.
+        """
+        try:
+            if self._store.is_empty():
+                self._logger.debug(f"Migrating data to {self._store.db_path}...")
+                self._store.import_data(self.user_preferences, self.router_data, self.plate_data)
+                if self._journal.rotate():
+                    self._journal.remove_rotated()
+
+            self.user_preferences = self._store.get_preferences()
+            self.router_data = LazyRecords(self._store.get_router_ids(), lambda id: RouterRecord.from_dict(self._store.get_router(id)))
+            self.plate_data = LazyRecords(self._store.get_plate_ids(), lambda id: PlateRecord.from_dict(self._store.get_plate(id)))
+        except Exception as e:
+            self._logger.error(f"Error initializing data store: {e}")
+
     def _init_temp_data(self):
         """
-        Initializes temporary data as empty lists.
+        Initializes temporary data, restoring imported parts from job workspace if available.
         """
         self.imported_parts = []
+        if self._workspace is None:
+            return
+        try:
+            self.imported_parts = self._workspace.load()
+        except Exception as e:
+            self._logger.error(f"Error restoring imported parts: {e}")
+
+    def save_imported_parts(self):
+        """
+        Saves imported parts to job workspace, if available.
+        """
+        if self._workspace is None:
+            return
+        try:
+            self._workspace.save(self.imported_parts)
+        except Exception as e:
+            self._logger.error(f"Error saving imported parts: {e}")
 
     def _get_user_preferences(self) -> dict:
         """
@@ -79,44 +181,288 @@ class DataManager:
             self._logger.error(f"Error reading plate data: {e}")
             return []
 
-    def _atexit(self):
+    # mutation functions, connected to widget signals
+
+    def update_plate(self, plate: Dict[str, Any]):
+        """
+        Records new or changed plate. Plates are added or replaced under the data lock, so callers pass a new plate
+        or an edited copy and never change plate data in place.
+        """
+        self._record({"collection": self.PLATES, "op": self.UPSERT, "id": plate['id'], "record": plate})
+
+    def add_digitized_plates(self, results: List[Any], processing_profile: str = None) -> List[PlateRecord]:
+        """
+        Records contours of plates digitized from a multi-plate photo. Plates matched to inventory get their contours
+        replaced, unmatched plates are added as new plates of measured size. Plates without contours are skipped.
+
+        Arguments:
+        - results: Plate results of MultiPlateConverter.process.
+        - processing_profile: Name of processing profile plates were digitized with.
+
+        Returns:
+        - Updated and added plates.
+        """
+        plates = []
+        for result in results:
+            if result.contours is None:
+                continue
+
+            plate = self.plate_data.get(result.plate_id) if result.plate_id is not None else None
+            if plate is not None:
+                plate = plate.copy()
+            else:
+                plate = PlateUtil.get_new_plate(self.plate_data)
+                plate['width_(x)'], plate['height_(y)'] = round(result.measured_size.w, 1), round(result.measured_size.h, 1)
+
+            plate['contours'] = result.contours
+            plate['contour_parents'] = result.contour_parents
+            plate['processing_profile'] = processing_profile
+            try:
+                PlateUtil.save_preview_image(plate)
+            except Exception as e:
+                self._logger.error(f"Error saving preview of plate {plate['id']}: {e}")
+            self.update_plate(plate)
+            plates.append(plate)
+
+        return plates
+
+    def remove_plate(self, id: int):
+        """
+        Records removal of plate with given id.
+        """
+        self._record({"collection": self.PLATES, "op": self.REMOVE, "id": id})
+
+    def update_router(self, router: Dict[str, Any]):
+        """
+        Records new or changed router. Routers are added or replaced under the data lock, so callers pass a new
+        router or an edited copy and never change router data in place.
+        """
+        self._record({"collection": self.ROUTERS, "op": self.UPSERT, "id": router['id'], "record": router})
+
+    def remove_router(self, id: int):
+        """
+        Records removal of router with given id.
+        """
+        self._record({"collection": self.ROUTERS, "op": self.REMOVE, "id": id})
+
+    def set_preference(self, key: str, value: Any):
+        """
+        Sets and records user preference.
+        """
+        self._record({"collection": self.PREFERENCES, "op": self.SET, "key": key, "value": value})
+
+    def query_plates(self, material: str = None, thickness: float = None, min_width: float = None, min_height: float = None) -> List[Dict[str, Any]]:
+        """
+        Finds plates matching all given criteria, plates fitting minimum dimensions when rotated also match.
+        Uses indexed columns of the store if available.
+        """
+        if self._store is not None:
+            ids = self._store.query_plates(material, thickness, min_width, min_height)
+            return [self.plate_data.get(id) for id in ids]
+
+        def fits(w: float, h: float) -> bool:
+            return w >= float(min_width or 0) and h >= float(min_height or 0)
+
+        return [plate for plate in self.plate_data
+                if (material is None or plate['material'] == material)
+                and (thickness is None or float(plate['thickness_(z)']) == float(thickness))
+                and (fits(float(plate['width_(x)']), float(plate['height_(y)'])) or fits(float(plate['height_(y)']), float(plate['width_(x)'])))]
+
+    def find_fitting_plates(self, material: str, thickness: float, part_width: float, part_height: float, allow_rotation: bool = True) -> List[PlateRecord]:
         """
-        Attempts to save all long-term data and clear temporary directories.
+        Finds plates whose usable region, i.e. plate area left by its contours, holds an axis-aligned rectangle fitting part's bounding box.
+        Usable rectangles of plates are indexed per material and thickness on first query and kept up to date as plates change.
         """
+        ids = self._plate_index.find(material, thickness, part_width, part_height, allow_rotation)
+        return [self.plate_data.get(id) for id in ids]
+
+    def _record(self, entry: Dict[str, Any]):
+        """
+        Applies mutation to data and appends it to journal, then notifies autosave, urgently if journal grew past threshold.
+        With a store, mutation is committed to it instead.
+        """
+        with self._lock:
+            self._apply(entry)
+        if self._store is not None:
+            self._write_to_store(entry)
+            return
+
         try:
-            self._save_user_preferences()
-            self._save_router_data()
-            self._save_plate_data()
-            self._clear_temporary_data()
+            self._journal.append(entry)
         except Exception as e:
-            self._logger.error(f"Error saving data or clearing temporary data: {e}")
+            self._logger.error(f"Error journaling {entry['collection']} mutation: {e}")
+            return
+
+        self._autosave.notify(urgent=self._journal.entry_count >= self._compaction_threshold)
 
-    def _save_user_preferences(self):
+    def _apply(self, entry: Dict[str, Any]):
         """
-        Saves user preferences to json file specified at initialization.
+        Applies journal entry to data. Entries are idempotent, so replaying entries already contained in snapshot is harmless.
+        """
+        self._dirty.add(entry['collection'])
+
+        if entry['collection'] == self.PREFERENCES:
+            self.user_preferences[entry['key']] = entry['value']
+            return
+
+        data = self.plate_data if entry['collection'] == self.PLATES else self.router_data
+        idx = data.find(entry['id'])
+
+        if entry['op'] == self.UPSERT:
+            record = entry['record']
+            if isinstance(record, dict): # replayed from journal
+                record = (PlateRecord if entry['collection'] == self.PLATES else RouterRecord).from_dict(record)
+            if idx == -1:
+                data.append(record)
+            elif data[idx] is not record:
+                data[idx] = record
+            if entry['collection'] == self.PLATES:
+                self._plate_index.update(record)
+        elif entry['op'] == self.REMOVE:
+            if idx != -1:
+                data.pop(idx)
+            if entry['collection'] == self.PLATES: # index is cleared even if record was already gone
+                self._plate_index.remove(entry['id'])
+
+    def _write_to_store(self, entry: Dict[str, Any]):
+        """
+        Commits journal entry to store.
         """
         try:
-            FileProcessor.write_file(self._user_preference_file_path, self.user_preferences)
+            if entry['collection'] == self.PREFERENCES:
+                self._store.set_preference(entry['key'], entry['value'])
+            elif entry['collection'] == self.PLATES and entry['op'] == self.UPSERT:
+                self._store.upsert_plate(entry['record'])
+            elif entry['collection'] == self.PLATES:
+                self._store.remove_plate(entry['id'])
+            elif entry['op'] == self.UPSERT:
+                self._store.upsert_router(entry['record'])
+            else:
+                self._store.remove_router(entry['id'])
         except Exception as e:
-            self._logger.error(f"Error saving user preferences: {e}")
+            self._logger.error(f"Error storing {entry['collection']} mutation: {e}")
 
-    def _save_router_data(self):
+    # compaction functions
+
+    def _compact(self):
         """
-        Saves router data to csv file specified at initialization.
+        Rotates journal and takes snapshot of changed collections under the data lock, then saves snapshot and discards
+        journal entries it covers. Collections are marked dirty again if saving fails. Runs on autosave thread, and at exit.
+        A rotated journal left by a failed save is covered too, since its collections were marked dirty again.
         """
+        snapshot = {}
         try:
-            FileProcessor.write_file(self._router_data_path, self.router_data)
+            with self._lock:
+                self._journal.rotate()
+                snapshot = self._take_dirty_snapshot()
+
+            self._save_snapshot(snapshot)
+            self._journal.remove_rotated()
+            self._logger.debug(f"Journal compacted.")
         except Exception as e:
-            self._logger.error(f"Error saving router data: {e}")
+            with self._lock:
+                self._dirty.update(snapshot)
+            self._logger.error(f"Error compacting journal: {e}")
 
-    def _save_plate_data(self):
+    def _take_dirty_snapshot(self) -> Dict[str, Any]:
         """
-        Saves plate data to csv file specified at initialization.
+        Copies changed collections and clears their dirty state, which is left untouched if copying fails.
+        """
+        snapshot = self._get_snapshot(self._dirty)
+        self._dirty = set()
+        return snapshot
+
+    def _get_snapshot(self, collections: set) -> Dict[str, Any]:
+        """
+        Copies collection lists, records themselves are shared rather than deep copied, so taking a snapshot holds
+        the data lock only briefly. Sharing is safe since recorded records are never changed in place: widgets edit
+        copies and record them, replacing the shared record under the data lock.
+        """
+        data = {self.PREFERENCES: self.user_preferences, self.ROUTERS: self.router_data, self.PLATES: self.plate_data}
+        return {collection: dict(data[collection]) if collection == self.PREFERENCES else list(data[collection]) for collection in collections}
+
+    def _save_snapshot(self, snapshot: Dict[str, Any]):
         """
+        Saves files of collections in snapshot, each replaced atomically so a crash never leaves a partially written file.
+        """
+        if self.PREFERENCES in snapshot:
+            self._save_user_preferences(snapshot[self.PREFERENCES])
+        if self.ROUTERS in snapshot:
+            self._save_router_data(snapshot[self.ROUTERS])
+        if self.PLATES in snapshot:
+            self._save_plate_data(snapshot[self.PLATES])
+
+    def _atexit(self):
+        """
+        Attempts to save imported parts, compact journal into snapshot files and clear temporary directories.
+        """
+        self.save_imported_parts()
         try:
-            FileProcessor.write_file(self._plate_data_path, self.plate_data)
+            if self._store is not None:
+                self._store.close()
+                self._clear_temporary_data()
+                return
+
+            self._autosave.stop()
+            self._compact()
+            self._journal.close()
+            self._clear_temporary_data()
         except Exception as e:
-            self._logger.error(f"Error saving plate data: {e}")
+            self._logger.error(f"Error saving data or clearing temporary data: {e}")
+
+    def _save_user_preferences(self, user_preferences: dict):
+        """
+        Saves user preferences to json file specified at initialization.
+        """
+        FileProcessor.write_file(self._user_preference_file_path, user_preferences, 'json', fsync=True)
+
+    def _save_router_data(self, router_data: List[RouterRecord]):
+        """
+        Saves router data to csv file specified at initialization.
+        """
+        FileProcessor.write_file(self._router_data_path, [router.to_dict() for router in router_data], fsync=True)
+
+    def _save_plate_data(self, plate_data: List[PlateRecord]):
+        """
+        Saves plate data to csv file specified at initialization.
+        With a geometry folder, contours are moved to sidecar files first and the csv file only references them.
+        Once saved, plates still current in data reference their sidecar too, so geometry is only serialized and
+        hashed again after it changes.
+        """
+        records, plate_data = plate_data, [plate.to_dict() for plate in plate_data]
+        if self._geometry_folder is None:
+            FileProcessor.write_file(self._plate_data_path, plate_data, fsync=True)
+            return
+
+        moved = []
+        for record, plate in zip(records, plate_data):
+            contours = plate.get('contours')
+            if contours is not None and contours != '' and not ContourUtil.is_sidecar(contours):
+                plate['contours'] = ContourUtil.save_sidecar(self._geometry_folder, str(plate['id']), contours)
+                moved.append((record, plate['contours']))
+
+        FileProcessor.write_file(self._plate_data_path, plate_data, fsync=True)
+        with self._lock:
+            for record, reference in moved:
+                if self.plate_data.get(record['id']) is record: # replaced records are saved with their own geometry
+                    record['contours'] = reference
+        self._remove_unreferenced_geometry(plate_data)
+
+    def _remove_unreferenced_geometry(self, plate_data: List[dict]):
+        """
+        Removes sidecar files no longer referenced by saved plate data.
+        """
+        referenced = {os.path.normpath(path) for plate in plate_data if ContourUtil.is_sidecar(plate.get('contours'))
+                      for path in ContourUtil.get_sidecar_paths(plate['contours'])}
+
+        for filename in os.listdir(self._geometry_folder):
+            path = os.path.normpath(os.path.join(self._geometry_folder, filename))
+            if path in referenced:
+                continue
+            try:
+                os.remove(path)
+            except OSError as e: # still memory-mapped on some platforms, retried on next save
+                self._logger.debug(f"Could not remove geometry file {path}: {e}")
 
     def _clear_temporary_data(self):
         """
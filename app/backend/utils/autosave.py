@@ -0,0 +1,88 @@
+import time
+import logging
+import threading
+from typing import Callable
+
+class Autosave:
+    """
+    Saves data on a background thread, coalescing change notifications into at most one save per interval.
+    The interval starts with the first change after a save, so all edits made within it are written together.
+    Urgent notifications save right away. Thread is started on first notification.
+
+    ### Parameters:
+    - save: Function saving changed data, called on the autosave thread.
+    - interval: Time in seconds a change waits before being saved.
+
+    ### Raises:
+    - ValueError for negative interval.
+    """
+    logger = logging.getLogger(__name__)
+    if not logger.hasHandlers():
+        logger.setLevel(logging.DEBUG)
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+
+    def __init__(self, save: Callable[[], None], interval: float):
+
+        if interval < 0:
+            raise ValueError("Autosave interval must not be negative")
+
+        self.interval = interval
+
+        self._save = save
+        self._condition = threading.Condition()
+        self._thread: threading.Thread = None
+        self._pending = False
+        self._urgent = False
+        self._stopped = False
+
+    def notify(self, urgent: bool = False):
+        """
+        Schedules a save of changed data.
+
+        Arguments:
+        - urgent: Whether to save without waiting for the interval, e.g. once the journal grew large.
+        """
+        with self._condition:
+            if self._stopped:
+                return
+            self._pending = True
+            self._urgent = self._urgent or urgent
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='autosave', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def stop(self):
+        """
+        Stops autosave thread, waiting for a save in progress to finish. Pending changes are left to the caller to save.
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopped:
+                    self._condition.wait()
+
+                deadline = time.monotonic() + self.interval
+                while not self._urgent and not self._stopped:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                if self._stopped:
+                    return
+                self._pending = self._urgent = False
+
+            try:
+                self._save()
+            except Exception as e:
+                self.logger.error(f"Error autosaving data: {e}")
@@ -0,0 +1,225 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import cv2
+from typing import Any, List, Tuple, Union
+
+class ContourUtil:
+
+    """
+    Functional class for finalizing and serializing plate contours.
+    Finalized contours are float32 arrays of shape (N, 2) in millimeters, paired with a list of parent indices
+    taken from the OpenCV contour hierarchy (-1 for outlines). Contours at odd depth are holes.
+    Contours can also be stored in sidecar files, as a flat float32 coordinate array and an offsets array,
+    in which case plate data only holds a reference to them.
+    """
+
+    MIN_CONTOUR_POINTS = 3
+    SERIALIZATION_DECIMALS = 2
+
+    SIDECAR_PREFIX = 'sidecar:'
+    COORDS_SUFFIX = '.coords.npy'
+    OFFSETS_SUFFIX = '.offsets.npy'
+
+    SIDECAR_CACHE_SIZE = 32 # sidecars kept resident, each holds an open memory map
+    _sidecar_cache: 'OrderedDict[str, List[np.ndarray]]' = OrderedDict()
+    _sidecar_lock = threading.Lock() # cache is shared by gui and autosave threads
+
+    @staticmethod
+    def finalize(contours: List[np.ndarray], hierarchy: Union[np.ndarray, None], px_per_mm: float, tolerance: float) -> Tuple[List[np.ndarray], List[int]]:
+        """
+        Simplifies pixel contours and converts them to millimeters.
+
+        Arguments:
+        - contours: Contours as returned by cv2.findContours.
+        - hierarchy: Hierarchy as returned by cv2.findContours.
+        - px_per_mm: Resolution of the image contours were found in.
+        - tolerance: Maximum deviation of simplified contour from original in millimeters.
+
+        Returns:
+        - Tuple of simplified contours and parent index for each contour.
+            Contours reduced to less than MIN_CONTOUR_POINTS points are dropped, their children are attached to the nearest kept ancestor.
+        """
+        if not contours:
+            return [], []
+
+        parents = hierarchy.reshape(-1, 4)[:, 3].tolist() if hierarchy is not None else [-1] * len(contours)
+        epsilon = tolerance * px_per_mm
+
+        simplified = [cv2.approxPolyDP(contour, epsilon, True) for contour in contours]
+        kept = [len(contour) >= ContourUtil.MIN_CONTOUR_POINTS for contour in simplified]
+
+        new_indices = np.cumsum(kept) - 1
+
+        finalized_contours: List[np.ndarray] = []
+        finalized_parents: List[int] = []
+
+        for i, contour in enumerate(simplified):
+            if not kept[i]:
+                continue
+
+            parent = parents[i]
+            while parent != -1 and not kept[parent]:
+                parent = parents[parent]
+
+            finalized_contours.append((contour.reshape(-1, 2) / px_per_mm).astype(np.float32))
+            finalized_parents.append(int(new_indices[parent]) if parent != -1 else -1)
+
+        return finalized_contours, finalized_parents
+
+    @staticmethod
+    def get_depths(parents: List[int]) -> List[int]:
+        """
+        Gets nesting depth of each contour, outlines have depth 0.
+
+        Arguments:
+        - parents: Parent index for each contour.
+
+        Returns:
+        - List of depths.
+        """
+        depths = [None] * len(parents)
+
+        for i in range(len(parents)):
+            chain = []
+            current = i
+            while current != -1 and depths[current] is None:
+                chain.append(current)
+                current = parents[current]
+
+            depth = -1 if current == -1 else depths[current]
+            for idx in reversed(chain):
+                depth += 1
+                depths[idx] = depth
+
+        return depths
+
+    @staticmethod
+    def serialize(contours: List[np.ndarray]) -> List[list]:
+        """
+        Converts contours to nested lists of coordinates rounded to SERIALIZATION_DECIMALS.
+        """
+        return [np.round(np.asarray(contour, dtype=np.float64).reshape(-1, 2), ContourUtil.SERIALIZATION_DECIMALS).tolist() for contour in contours]
+
+    @staticmethod
+    def deserialize(data: Union[List[list], str, None]) -> List[np.ndarray]:
+        """
+        Converts nested lists of coordinates back to float32 contours.
+        Also accepts the string form stored in CSV files and sidecar references, missing data gives an empty list.
+        """
+        if ContourUtil.is_sidecar(data):
+            return ContourUtil.load_sidecar(data)
+        data = ContourUtil._parse(data)
+        return [np.asarray(contour, dtype=np.float32).reshape(-1, 2) for contour in data]
+
+    @staticmethod
+    def deserialize_parents(data: Union[List[int], str, None]) -> List[int]:
+        """
+        Converts parent list, possibly in string form, back to list of ints.
+        """
+        return [int(parent) for parent in ContourUtil._parse(data)]
+
+    @staticmethod
+    def pack(contours: List[np.ndarray]) -> bytes:
+        """
+        Packs contours into bytes for binary storage: contour count and point offsets of contours as int32,
+        followed by float32 coordinates of all contours.
+        """
+        coords, offsets = ContourUtil._flatten(contours)
+        return np.array([len(offsets) - 1], dtype='<i4').tobytes() + offsets.tobytes() + coords.tobytes()
+
+    @staticmethod
+    def unpack(data: bytes) -> List[np.ndarray]:
+        """
+        Unpacks contours packed with pack(). Contours are read-only views of given bytes.
+        """
+        count = int(np.frombuffer(data, dtype='<i4', count=1)[0])
+        offsets = np.frombuffer(data, dtype='<i4', count=count + 1, offset=4)
+        coords = np.frombuffer(data, dtype='<f4', offset=4 * (count + 2)).reshape(-1, 2)
+        return [coords[offsets[i]:offsets[i + 1]] for i in range(count)]
+
+    @staticmethod
+    def is_sidecar(data: Any) -> bool:
+        return isinstance(data, str) and data.startswith(ContourUtil.SIDECAR_PREFIX)
+
+    @staticmethod
+    def save_sidecar(folder: str, name: str, contours: Union[List[np.ndarray], List[list], str]) -> str:
+        """
+        Saves contours to sidecar files named after given name and a hash of the geometry, so unchanged geometry
+        is not rewritten and files referenced by previously saved data are never overwritten.
+
+        Arguments:
+        - folder: Folder to save sidecar files in.
+        - name: Prefix of file names, e.g. plate id.
+        - contours: Contours in any form accepted by deserialize().
+
+        Returns:
+        - Reference to store in place of contours.
+        """
+        coords, offsets = ContourUtil._flatten(ContourUtil.deserialize(contours))
+        digest = hashlib.sha1(coords.tobytes() + offsets.tobytes()).hexdigest()[:12]
+        base_path = os.path.join(folder, f"{name}_{digest}")
+
+        for path, array in ((base_path + ContourUtil.COORDS_SUFFIX, coords), (base_path + ContourUtil.OFFSETS_SUFFIX, offsets)):
+            if os.path.exists(path):
+                continue
+            temp_path = path + '.tmp'
+            with open(temp_path, 'wb') as file:
+                np.save(file, array)
+            os.replace(temp_path, path)
+
+        return ContourUtil.SIDECAR_PREFIX + base_path
+
+    @staticmethod
+    def load_sidecar(reference: str) -> List[np.ndarray]:
+        """
+        Loads contours from sidecar files. Coordinates are memory-mapped, so they are only read from disk when used.
+        Recently used sidecars stay loaded, sidecar files are never modified so cached contours cannot go stale.
+
+        Raises:
+        - FileNotFoundError if sidecar files do not exist.
+        """
+        cache = ContourUtil._sidecar_cache
+        with ContourUtil._sidecar_lock:
+            if reference in cache:
+                cache.move_to_end(reference)
+                return list(cache[reference])
+
+        base_path = reference[len(ContourUtil.SIDECAR_PREFIX):]
+        coords = np.load(base_path + ContourUtil.COORDS_SUFFIX, mmap_mode='r')
+        offsets = np.load(base_path + ContourUtil.OFFSETS_SUFFIX)
+        contours = [coords[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+        with ContourUtil._sidecar_lock: # loaded without lock, another thread may have cached the same sidecar meanwhile
+            cache[reference] = contours
+            cache.move_to_end(reference)
+            while len(cache) > ContourUtil.SIDECAR_CACHE_SIZE:
+                cache.popitem(last=False)
+        return list(contours)
+
+    @staticmethod
+    def get_sidecar_paths(reference: str) -> List[str]:
+        base_path = reference[len(ContourUtil.SIDECAR_PREFIX):]
+        return [base_path + ContourUtil.COORDS_SUFFIX, base_path + ContourUtil.OFFSETS_SUFFIX]
+
+    @staticmethod
+    def _flatten(contours: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Concatenates contours into float32 coordinates of shape (N, 2) and int32 offsets of each contour's first point,
+        followed by total point count.
+        """
+        contours = [np.asarray(contour, dtype='<f4').reshape(-1, 2) for contour in contours]
+        offsets = np.concatenate(([0], np.cumsum([len(contour) for contour in contours]))).astype('<i4')
+        coords = np.concatenate(contours) if contours else np.empty((0, 2), dtype='<f4')
+        return coords, offsets
+
+    @staticmethod
+    def _parse(data: Union[list, str, None]) -> list:
+        if data is None:
+            return []
+        if isinstance(data, str):
+            return json.loads(data) if data not in ('', 'None') else []
+        return data
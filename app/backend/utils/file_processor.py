@@ -3,13 +3,31 @@ import sys
 import shutil
 import json
 import csv
-from typing import List, Dict, Union, Any
+import hashlib
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Dict, Union, Any, TextIO
 import logging
 import numpy as np
 
+class _HashingWriter:
+    """
+    Text file wrapper hashing everything written through it.
+    """
+    def __init__(self, file: TextIO):
+        self.file = file
+        self.hash = hashlib.sha1()
+
+    def write(self, text: str) -> int:
+        self.hash.update(text.encode('utf-8'))
+        return self.file.write(text)
+
 class FileProcessor:
     """
     Functional class to read from and write to files in various formats.
+    Files are written to a temporary file which then replaces the target, so an interrupted write never leaves a partial file.
+    Data is streamed to the temporary file while being hashed, so bulk writes never hold the serialized file in memory.
+    Content hashes of files read and written are tracked, and content identical to the file on disk does not replace it.
     """
     logger = logging.getLogger(__name__)
     if not logger.hasHandlers():
@@ -19,6 +37,12 @@ class FileProcessor:
         handler.setFormatter(formatter)
         logger.addHandler(handler)
 
+    TEMP_SUFFIX = '.tmp'
+    MANIFEST_FILE = '.manifest.json' # content hashes of files written by write_multiple_json_to_folder
+    READ_WORKERS = 8
+
+    _digests: Dict[str, tuple] = {} # absolute path -> (hash of content last read or written, file stat)
+
     @staticmethod
     def read_file(filepath: str) -> Union[dict, List[dict], None]:
         """
@@ -62,9 +86,11 @@ class FileProcessor:
         Returns:
         - The data read from the CSV file as a list of dictionaries.
         """
+        hash = hashlib.sha1()
         with open(filepath, mode='r', newline='') as file:
-            reader = csv.DictReader(file)
-            data = list(reader)    
+            lines = (hash.update(line.encode('utf-8')) or line for line in file)
+            data = list(csv.DictReader(lines))
+        FileProcessor._track(filepath, hash.hexdigest())
         return data
 
     @staticmethod
@@ -86,68 +112,167 @@ class FileProcessor:
         - The data read from the JSON file as a dictionary.
         """
         with open(filepath, 'r') as file:
-            data = json.load(file)
-        return data
+            text = file.read()
+        FileProcessor._track(filepath, hashlib.sha1(text.encode('utf-8')).hexdigest())
+        return json.loads(text)
 
     @staticmethod
-    def write_file(filepath: str, data: Union[dict, List[dict]], format: str = 'csv') -> None:
+    def write_file(filepath: str, data: Union[dict, Iterable[dict]], format: str = 'csv', fsync: bool = False) -> None:
         """
-        Write data to a file.
+        Write data to a file atomically, skipping the write if the file already holds identical content.
 
         Arguments:
         - filepath: The path to the file to write the data to.
-        - data: The data to be written to the file.
+        - data: The data to be written to the file. CSV rows can be any iterable of dictionaries and are streamed to disk.
         - format: The format of the file ('csv' or 'json'). Defaults to 'csv'.
+        - fsync: Whether to sync file to disk before it replaces the target, for durability across power loss.
         """
         _, extension = os.path.splitext(filepath)
 
         FileProcessor.logger.debug(f"Writing to file: {filepath}")
 
         if extension.lower() == '.csv' and format == 'csv':
-            FileProcessor._write_csv(filepath, data)
+            FileProcessor._write_atomic(filepath, FileProcessor._write_csv, data, fsync)
             return
         if extension.lower() == '.json' and format == 'json':
-            FileProcessor._write_json(filepath, data)
+            FileProcessor._write_atomic(filepath, FileProcessor._write_json, data, fsync)
             return
     
         FileProcessor.logger.error(f"Cannot write to file of unsupported filetype {extension}.")
 
     @staticmethod
-    def _write_csv(filepath: str, data: List[dict]) -> None:
+    def _write_atomic(filepath: str, write: Callable[[TextIO, Any], None], data: Any, fsync: bool) -> bool:
         """
-        Write data to a CSV file.
+        Stream data to a temporary file next to target, hashing each written chunk, and move it into place.
+        If the digest matches the tracked content of target, the temporary file is deleted instead.
 
         Arguments:
-        - filepath: The path to the CSV file to write the data to.
-        - data: The data to be written to the CSV file as a list of dictionaries.
-        """               
-        with open(filepath, mode='w', newline='') as file:
-            writer = csv.DictWriter(file, fieldnames=data[0].keys())
-            writer.writeheader()
-            writer.writerows(data)
+        - filepath: The path to the file to write the data to.
+        - write: Function writing data to a text file.
+        - data: The data to be written.
+        - fsync: Whether to sync file and its folder to disk.
+
+        Returns:
+        - False if target already held identical content and was left untouched.
+        """
+        temp_path = filepath + FileProcessor.TEMP_SUFFIX
+
+        try:
+            with open(temp_path, mode='w', newline='') as file:
+                writer = _HashingWriter(file)
+                write(writer, data)
+                digest = writer.hash.hexdigest()
+
+                unchanged = FileProcessor._is_unchanged(filepath, digest)
+                if not unchanged and fsync:
+                    file.flush()
+                    os.fsync(file.fileno())
+
+            if unchanged:
+                os.remove(temp_path)
+                FileProcessor.logger.debug(f"File unchanged, skipped writing: {filepath}")
+                return False
+
+            os.replace(temp_path, filepath)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        FileProcessor._track(filepath, digest)
+        if fsync:
+            FileProcessor._fsync_folder(os.path.dirname(os.path.abspath(filepath)))
+        return True
 
     @staticmethod
-    def _write_json(filepath: str, data: dict) -> None:
+    def _get_json_digest(data: dict) -> str:
+        """
+        Hash data as written by _write_json, chunk by chunk without building the serialized text.
+        """
+        digest = hashlib.sha1()
+        for chunk in json.JSONEncoder(indent=4).iterencode(data):
+            digest.update(chunk.encode('utf-8'))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _track(filepath: str, digest: str) -> None:
+        stat = os.stat(filepath)
+        FileProcessor._digests[os.path.abspath(filepath)] = (digest, stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _is_unchanged(filepath: str, digest: str) -> bool:
+        """
+        Check if file holds content with given hash, i.e. it was last read or written with that content and not modified since.
+        """
+        if not os.path.exists(filepath):
+            return False
+        stat = os.stat(filepath)
+        return FileProcessor._digests.get(os.path.abspath(filepath)) == (digest, stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _fsync_folder(folder_path: str) -> None:
+        """
+        Sync folder entry so a replaced file survives power loss. Not supported on all platforms.
+        """
+        try:
+            fd = os.open(folder_path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _write_csv(file: TextIO, data: Iterable[dict]) -> None:
+        """
+        Write data to a CSV file, row by row.
+
+        Arguments:
+        - file: The text file to write the data to.
+        - data: The data to be written as an iterable of dictionaries.
+            Columns of a list are all keys in order of appearance, columns of other iterables are keys of first row.
+        """
+        rows = iter(data)
+        if isinstance(data, list):
+            fieldnames = list(dict.fromkeys(key for row in data for key in row))
+        else:
+            first_row = next(rows, None)
+            if first_row is None:
+                return
+            fieldnames = list(first_row.keys())
+            rows = itertools.chain([first_row], rows)
+
+        if not fieldnames:
+            return
+
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    @staticmethod
+    def _write_json(file: TextIO, data: dict) -> None:
         """
         Write data to a JSON file.
 
         Arguments:
-        - filepath: The path to the JSON file to write the data to.
-        - data: The data to be written to the JSON file as a dictionary.
+        - file: The text file to write the data to.
+        - data: The data to be written as a dictionary.
         """
-        with open(filepath, 'w') as file:
-            json.dump(data, file, indent=4)
+        json.dump(data, file, indent=4)
 
     @staticmethod
     def read_all_json_in_folder(folder_path: str) -> List[dict]:
         """
-        Read data from all JSON files in a folder.
+        Read data from all JSON files in a folder, in parallel.
 
         Arguments:
         - folder_path: The path to the folder containing JSON files.
 
         Returns:
-        - The data read from all JSON files in the folder as a list of dictionaries.
+        - The data read from all JSON files in the folder as a list of dictionaries, ordered by filename.
             Returns None if the folder does not exist.
         """
         FileProcessor.logger.debug(f"Reading all JSON files in directory {folder_path}")
@@ -156,25 +281,23 @@ class FileProcessor:
             FileProcessor.logger.error(f"Directory does not exist: {folder_path}")
             return
 
-        data = []
-        files = FileProcessor.get_all_filenames_in_folder(folder_path)
-
-        for filename in files:
-            _, extension = os.path.splitext(filename)
-            if extension.lower() != '.json':
-                continue
-            filepath = os.path.join(folder_path, filename)
-            data.append(FileProcessor._read_json(filepath))
+        filepaths = [os.path.join(folder_path, filename) for filename in sorted(FileProcessor.get_all_filenames_in_folder(folder_path))
+                     if os.path.splitext(filename)[1].lower() == '.json' and filename != FileProcessor.MANIFEST_FILE]
+        if not filepaths:
+            return []
 
-        return data
+        with ThreadPoolExecutor(max_workers=min(FileProcessor.READ_WORKERS, len(filepaths))) as executor:
+            return list(executor.map(FileProcessor._read_json, filepaths))
 
     @staticmethod
     def write_multiple_json_to_folder(data: List[dict], folder_path: str) -> None:
         """
-        Write multiple dictionaries to separate JSON files in a folder.
+        Synchronize a folder with multiple dictionaries, each stored in a separate JSON file.
+        Content hashes of written files are kept in a manifest in the folder, so only new or changed items are written,
+        each atomically, and only files of items no longer in data are removed.
 
         Arguments:
-        - data: A list of dictionaries, where each dictionary represents data to be written to a JSON file.
+        - data: A list of dictionaries, where each dictionary represents data to be written to a JSON file named by its 'filename' key.
         - folder_path: The path to the folder where JSON files will be written.
         """
         FileProcessor.logger.debug(f"Writing multiple JSON files to directory {folder_path}")
@@ -182,22 +305,60 @@ class FileProcessor:
         if not os.path.exists(folder_path):
             FileProcessor.logger.error(f"Directory does not exist: {folder_path}")
             return
-        
-        for item in data:
-            if not isinstance(item, dict):
-                return
-            try:
-                temp = item['id']
-            except KeyError:
-                FileProcessor.logger.error(f"Data is in invalid format") # edit this thing to be more understandable - add structs or smth
-                return
-        
-        FileProcessor.clear_folder_contents(folder_path)
+
+        if not all(isinstance(item, dict) and 'filename' in item for item in data):
+            FileProcessor.logger.error(f"Data is in invalid format, every item must be a dictionary with a filename.")
+            return
+
+        manifest_path = os.path.join(folder_path, FileProcessor.MANIFEST_FILE)
+        manifest = FileProcessor._read_manifest(manifest_path)
+        new_manifest = {}
+        written = 0
 
         for item in data:
             filename = item['filename']
             filepath = os.path.join(folder_path, filename)
-            FileProcessor._write_json(filepath, item)
+            digest = FileProcessor._get_json_digest(item)
+
+            if not FileProcessor._matches_manifest(filepath, manifest.get(filename), digest):
+                FileProcessor._write_atomic(filepath, FileProcessor._write_json, item, False)
+                written += 1
+            stat = os.stat(filepath)
+            new_manifest[filename] = [digest, stat.st_mtime_ns, stat.st_size]
+
+        removed = [filename for filename in os.listdir(folder_path)
+                   if filename not in new_manifest and filename != FileProcessor.MANIFEST_FILE and os.path.isfile(os.path.join(folder_path, filename))]
+        for filename in removed:
+            os.remove(os.path.join(folder_path, filename))
+
+        if new_manifest != manifest:
+            FileProcessor._write_atomic(manifest_path, FileProcessor._write_json, new_manifest, False)
+        FileProcessor.logger.debug(f"Wrote {written} and removed {len(removed)} of {len(data)} JSON files in directory {folder_path}")
+
+    @staticmethod
+    def _read_manifest(manifest_path: str) -> Dict[str, list]:
+        """
+        Read folder manifest, an unreadable manifest is treated as empty so every file gets rewritten.
+        """
+        if not os.path.exists(manifest_path):
+            return {}
+        try:
+            with open(manifest_path, 'r') as file:
+                manifest = json.load(file)
+            return manifest if isinstance(manifest, dict) else {}
+        except (OSError, ValueError):
+            FileProcessor.logger.error(f"Ignoring unreadable manifest {manifest_path}")
+            return {}
+
+    @staticmethod
+    def _matches_manifest(filepath: str, entry: Union[list, None], digest: str) -> bool:
+        """
+        Check if file holds content with given hash according to its manifest entry, and was not modified since.
+        """
+        if entry is None or not os.path.exists(filepath):
+            return False
+        stat = os.stat(filepath)
+        return entry == [digest, stat.st_mtime_ns, stat.st_size]
 
     @staticmethod
     def get_all_filenames_in_folder(folder_path: str):
@@ -0,0 +1,198 @@
+import os
+import logging
+import cv2
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Union
+
+from .image_converter import ImageConverter
+from ..contour_util import ContourUtil
+from ..file_processor import FileProcessor
+
+class BatchResult:
+    """
+    Class for storing outcome of digitizing a single photo.
+
+    ### Parameters:
+    - filename: Name of photo in source folder.
+    - status: One of BatchDigitizer.ACCEPTED, BatchDigitizer.REVIEW or BatchDigitizer.FAILED.
+    - data_folder: Folder holding intermediate images of the photo.
+    - plate: Manifest row of the photo.
+    - threshold: Automatically picked binary threshold.
+    - corners: Detected plate corners.
+    - contours: Serialized contours in millimeters, only set for accepted photos.
+    - contour_parents: Parent index of each contour, only set for accepted photos.
+    - error: Error message for failed photos and photos queued for review without a plate.
+    """
+    def __init__(self, filename: str, status: str, data_folder: str, plate: Dict[str, Any], threshold: int=None, corners: List[tuple]=None, contours: List[list]=None, contour_parents: List[int]=None, error: str=None):
+        self.filename: str = filename
+        self.status: str = status
+        self.data_folder: str = data_folder
+        self.plate: Dict[str, Any] = plate
+        self.threshold: int = threshold
+        self.corners: List[tuple] = corners
+        self.contours: List[list] = contours
+        self.contour_parents: List[int] = contour_parents
+        self.error: str = error
+
+    def to_row(self) -> Dict[str, Any]:
+        return {
+            "filename": self.filename,
+            "status": self.status,
+            "data_folder": self.data_folder,
+            "threshold": self.threshold,
+            "corners": len(self.corners) if self.corners is not None else 0,
+            "contours": len(self.contours) if self.contours is not None else 0,
+            "error": self.error if self.error is not None else ""
+        }
+
+class BatchDigitizer:
+    """
+    Headless digitization of a folder of plate photos using a process pool.
+    Each photo is thresholded automatically and accepted when exactly four corners are detected,
+    in which case it is flattened and its contours are extracted. Other photos are queued for manual review.
+
+    ### Parameters:
+    - photo_folder: Folder containing plate photos.
+    - manifest_path: CSV file with 'filename', 'width_(x)' and 'height_(y)' columns, other columns are passed through.
+    - output_folder: Folder to store intermediate images, contours and reports in.
+    - max_workers: Number of worker processes, defaults to number of CPUs.
+    - station_profile_path: Optional station profile, photos are then flattened with the cached transform and always accepted.
+    - lens_calibration_path: Optional lens calibration used to undistort photos.
+
+    ### Raises:
+    - FileNotFoundError if photo folder or manifest do not exist.
+    - ValueError if manifest is empty or invalid.
+    """
+    logger = logging.getLogger(__name__)
+    if not logger.hasHandlers():
+        logger.setLevel(logging.DEBUG)
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+
+    ACCEPTED = 'accepted'
+    REVIEW = 'review'
+    FAILED = 'failed'
+
+    REQUIRED_COLUMNS = ('filename', 'width_(x)', 'height_(y)')
+
+    CONTOURS_NAME = 'contours.json'
+    RESULTS_NAME = 'batch_results.csv'
+    REVIEW_QUEUE_NAME = 'review_queue.csv'
+
+    PIXMAP_HEIGHT = 600
+
+    def __init__(self, photo_folder: str, manifest_path: str, output_folder: str, max_workers: int=None, station_profile_path: str=None, lens_calibration_path: str=None):
+
+        if not os.path.isdir(photo_folder):
+            raise FileNotFoundError(f"Photo folder '{photo_folder}' not found.")
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"Manifest '{manifest_path}' not found.")
+
+        self.photo_folder = photo_folder
+        self.output_folder = output_folder
+        self.max_workers = max_workers
+        self.station_profile_path = station_profile_path
+
+        self.lens_calibration_path = lens_calibration_path
+
+        if station_profile_path is not None and not os.path.exists(station_profile_path):
+            raise FileNotFoundError(f"Station profile '{station_profile_path}' not found.")
+        if lens_calibration_path is not None and not os.path.exists(lens_calibration_path):
+            raise FileNotFoundError(f"Lens calibration '{lens_calibration_path}' not found.")
+
+        self.manifest = self._read_manifest(manifest_path)
+        os.makedirs(self.output_folder, exist_ok=True)
+
+    def _read_manifest(self, manifest_path: str) -> List[Dict[str, Any]]:
+        """
+        Reads manifest rows, validating required columns.
+        """
+        manifest = FileProcessor.read_file(manifest_path)
+        if not manifest:
+            raise ValueError(f"Manifest '{manifest_path}' is empty or unreadable.")
+
+        missing = [column for column in self.REQUIRED_COLUMNS if column not in manifest[0]]
+        if missing:
+            raise ValueError(f"Manifest is missing columns: {', '.join(missing)}")
+
+        return manifest
+
+    def run(self) -> List[BatchResult]:
+        """
+        Digitizes all photos in manifest and writes result and review queue reports to output folder.
+
+        Returns:
+        - List of results in manifest order.
+        """
+        tasks = [(os.path.join(self.photo_folder, plate['filename']), self._get_data_folder(plate['filename']), plate, self.station_profile_path, self.lens_calibration_path) for plate in self.manifest]
+        self.logger.info(f"Digitizing {len(tasks)} photos...")
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(BatchDigitizer._process_photo, *zip(*tasks)))
+
+        self._save_reports(results)
+
+        accepted = sum(result.status == self.ACCEPTED for result in results)
+        self.logger.info(f"Batch finished: {accepted} accepted, {len(results) - accepted} queued for review or failed.")
+        return results
+
+    def _get_data_folder(self, filename: str) -> str:
+        return os.path.join(self.output_folder, os.path.splitext(filename)[0])
+
+    def _save_reports(self, results: List[BatchResult]):
+        """
+        Writes summary of all results and queue of photos needing manual attention.
+        """
+        if not results:
+            return
+
+        FileProcessor.write_file(os.path.join(self.output_folder, self.RESULTS_NAME), [result.to_row() for result in results])
+
+        review_rows = [result.to_row() for result in results if result.status != self.ACCEPTED]
+        review_path = os.path.join(self.output_folder, self.REVIEW_QUEUE_NAME)
+        if review_rows:
+            FileProcessor.write_file(review_path, review_rows)
+        elif os.path.exists(review_path):
+            FileProcessor.remove_file(review_path)
+
+    @staticmethod
+    def _process_photo(photo_path: str, data_folder: str, plate: Dict[str, Any], station_profile_path: str=None, lens_calibration_path: str=None) -> BatchResult:
+        """
+        Runs full conversion pipeline for one photo. Executed in worker process.
+        """
+        cv2.setNumThreads(1) # parallelism comes from process pool
+        filename = os.path.basename(photo_path)
+
+        try:
+            os.makedirs(data_folder, exist_ok=True)
+            converter = ImageConverter(data_folder, float(plate['width_(x)']), float(plate['height_(y)']), BatchDigitizer.PIXMAP_HEIGHT)
+            if lens_calibration_path is not None: # calibration and its maps stay cached in the worker process
+                converter.load_lens_calibration(lens_calibration_path)
+            converter.load_source_image(photo_path)
+
+            threshold = converter.get_auto_threshold()
+            converter.save_binary(threshold)
+
+            if station_profile_path is not None:
+                converter.load_station_profile(station_profile_path)
+                corners = converter.station_profile.get_corners(converter.img_size)
+                if not converter.save_flattened_station():
+                    return BatchResult(filename, BatchDigitizer.REVIEW, data_folder, plate, threshold, corners, error="no plate found")
+            else:
+                converter.initialize_features()
+                corners = converter.features.corners
+
+                if not converter.save_flattened():
+                    converter.save_features() # feature image is used during review
+                    return BatchResult(filename, BatchDigitizer.REVIEW, data_folder, plate, threshold, corners)
+
+            contours, parents = converter.get_finalized_contours()
+            serialized = ContourUtil.serialize(contours)
+            FileProcessor.write_file(os.path.join(data_folder, BatchDigitizer.CONTOURS_NAME), {"contours": serialized, "contour_parents": parents}, 'json')
+
+            return BatchResult(filename, BatchDigitizer.ACCEPTED, data_folder, plate, threshold, corners, serialized, parents)
+
+        except Exception as e:
+            return BatchResult(filename, BatchDigitizer.FAILED, data_folder, plate, error=str(e))
@@ -1,8 +1,8 @@
-import math
 import os
+import operator
 import numpy as np
 import cv2
-from typing import List, Tuple, Union
+from typing import Dict, List, Tuple, Union
 
 from .utils import Size, Colors
 
@@ -31,6 +31,8 @@ class FeatDetector:
     ### Parameters:
     - src_path: Source image filepath.
     - size: Size of image.    
+    - scale: Scale of image relative to the resolution detection constants are tuned for.
+    - detect_corners: Whether to search plate corners, skipped when corners are known, e.g. from a station profile.
 
     ### Attributes:
     - features: Found features.
@@ -45,168 +47,518 @@ class FeatDetector:
     MIN_CORNER_ANGLE = 60
     MIN_CORNER_SEPARATION = 1000
 
-    def __init__(self, src_path: str, size: Size):
+    def __init__(self, src_path: str, size: Size, scale: float = 1.0, detect_corners: bool = True):
         if not os.path.exists(src_path):
             raise FileNotFoundError(f"File '{src_path}' not found.")
         if size.w <= 0 or size.h <= 0:
             raise ValueError("Size dimensions must be positive numbers.")
 
+        self._scale_constants(scale)
+
         image = cv2.imread(src_path, cv2.IMREAD_GRAYSCALE)
         if image is None:
             raise ValueError(f"Unable to read image file '{src_path}'.")
 
         max_contour, other_contours = self._get_contours(image, size)
-        corners = self._get_corners(max_contour) if max_contour is not None else None
+        corners = self._get_corners(max_contour) if max_contour is not None and detect_corners else None
 
         self.features = Features(plate_contour=max_contour, other_contours=other_contours, corners=corners)
     
+    def _scale_constants(self, scale: float):
+        """
+        Adapts pixel based constants to image resolution, shadowing class values on the instance.
+        """
+        if scale == 1.0:
+            return
+        self.MIN_CTR_AREA = self.MIN_CTR_AREA * scale**2
+        self.MIN_CTR_DIST_FROM_EDGE = self.MIN_CTR_DIST_FROM_EDGE * scale
+        self.CORNER_DIST_DELTA = max(1, round(self.CORNER_DIST_DELTA * scale))
+        self.MIN_CORNER_SEPARATION = self.MIN_CORNER_SEPARATION * scale
+
     def _get_contours(self, image, size: Size) -> Tuple[np.array, List[np.array]]:
         """
         Finds contours that exceed area threshold and are a certain threshold away from the edge of the image. 
         """
         contours, _ = cv2.findContours(image, cv2.RETR_TREE, cv2.CHAIN_APPROX_NONE)
-        filtered_contours: List[np.array] = []
 
-        for contour in contours:
-            area: float = cv2.contourArea(contour)
+        if not contours:
+            return (None, None)
 
-            if area < self.MIN_CTR_AREA:
-                continue
+        areas = np.array([cv2.contourArea(contour) for contour in contours])
+        candidate_idxs = np.flatnonzero(areas >= self.MIN_CTR_AREA)
 
-            edge_flag = False
+        if candidate_idxs.size == 0:
+            return (None, None)
 
-            for point in contour:
-                x, y = point[0] # points stored as [[x, y]]
+        # bounding rects stored as [x, y, w, h], a contour touches the margin iff its bounding rect does
+        rects = np.array([cv2.boundingRect(contours[i]) for i in candidate_idxs])
+        x_min, y_min = rects[:, 0], rects[:, 1]
+        x_max, y_max = x_min + rects[:, 2] - 1, y_min + rects[:, 3] - 1
 
-                epsilon: float = self.MIN_CTR_DIST_FROM_EDGE
+        epsilon: float = self.MIN_CTR_DIST_FROM_EDGE
+        edge_flags = (x_min < epsilon) | (x_max > size.w - epsilon) | (y_min < epsilon) | (y_max > size.h - epsilon)
 
-                if x < epsilon or x > size.w - epsilon or y < epsilon or y > size.h - epsilon:
-                    edge_flag = True
-                    break
-        
-            if edge_flag and area < size.w * size.h // 4: # checks size in case plate is close to edge
-                continue
+        candidate_areas = areas[candidate_idxs]
+        keep = ~edge_flags | (candidate_areas >= size.w * size.h // 4) # checks size in case plate is close to edge
 
-            filtered_contours.append(contour)
+        filtered_idxs = candidate_idxs[keep]
 
-        if not filtered_contours:
+        if filtered_idxs.size == 0:
             return (None, None)
-        
-        areas = [cv2.contourArea(contour) for contour in filtered_contours]
-        max_area_idx = areas.index(max(areas))
-        max_contour = filtered_contours.pop(max_area_idx)
-        other_contours = filtered_contours
+
+        max_area_pos = int(np.argmax(areas[filtered_idxs]))
+        max_contour = contours[filtered_idxs[max_area_pos]]
+        other_contours = [contours[i] for i in np.delete(filtered_idxs, max_area_pos)]
 
         if len(other_contours) == 0:
             other_contours = None
 
         return max_contour, other_contours
 
-    def _get_corners(self, max_contour: np.ndarray) -> List[Tuple[float, float]]:
+    def _get_corners(self, max_contour: np.ndarray, min_separation: float = None) -> List[Tuple[float, float]]:
         """
         Finds plate corners using derivatives and norm product.
+        Turning angles are computed for the whole contour at once, corners are picked as local angle maxima
+        (non-maximum suppression over CORNER_DIST_DELTA points) and kept in contour order if separated by MIN_CORNER_SEPARATION.
 
         Arguments:
         - max_contour: Plate contour.
-        
+        - min_separation: Minimum distance between corners in px, defaults to MIN_CORNER_SEPARATION.
+
         Returns:
-        - List of found corners stored as tuples of floats.
+        - List of found corners stored as tuples of ints, in contour order.
         """
-        corners: List[Tuple[float, float]] = []
-        length = len(max_contour)
+        if min_separation is None:
+            min_separation = self.MIN_CORNER_SEPARATION
 
-        for i, point in enumerate(max_contour):
+        points = max_contour.reshape(-1, 2).astype(np.float64)
+        delta: int = self.CORNER_DIST_DELTA
 
-            delta: int = self.CORNER_DIST_DELTA
+        d1 = points - np.roll(points, delta, axis=0)
+        d2 = np.roll(points, -delta, axis=0) - points
 
-            prev_idx: int = (i - delta) % length 
-            next_idx: int = (i + delta) % length
+        dot_product = np.einsum('ij,ij->i', d1, d2)
+        norm_product = np.sqrt(np.einsum('ij,ij->i', d1, d1) * np.einsum('ij,ij->i', d2, d2))
 
-            x_prev, y_prev = max_contour[prev_idx][0]
-            x, y = point[0]
-            x_next, y_next = max_contour[next_idx][0]
-            
-            dx1, dy1 = x - x_prev, y - y_prev
-            dx2, dy2 = x_next - x, y_next - y
+        cos_theta = np.divide(dot_product, norm_product, out=np.ones_like(dot_product), where=norm_product != 0)
+        angles = np.degrees(np.arccos(np.clip(cos_theta, -1.0, 1.0))) # ensures valid range
+
+        window = min(2 * delta + 1, len(angles))
+        padded = np.concatenate((angles[-(window // 2):], angles, angles[:window // 2])) if window > 1 else angles
+        local_max = np.lib.stride_tricks.sliding_window_view(padded, window).max(axis=1)[:len(angles)]
+
+        peak_idxs = np.flatnonzero((angles > self.MIN_CORNER_ANGLE) & (angles >= local_max))
+
+        if peak_idxs.size == 0:
+            return []
+
+        peaks = points[peak_idxs]
+        keep = np.zeros(len(peak_idxs), dtype=bool)
+        keep[0] = True
+        last = peaks[0]
+
+        for i in range(1, len(peak_idxs)): # peaks are few after suppression
+            if np.hypot(*(peaks[i] - last)) > min_separation:
+                keep[i] = True
+                last = peaks[i]
+
+        corner_idxs = peak_idxs[keep]
+        return [tuple(point) for point in max_contour.reshape(-1, 2)[corner_idxs].tolist()]
+
+class MultiPlateDetector(FeatDetector):
+    """
+    Class for retrieving features of every plate in an image containing several plates.
+    Plates are outer contours exceeding MIN_PLATE_AREA_RATIO of the image that do not touch its edge margin,
+    contours nested inside a plate are assigned to it as other contours.
+
+    ### Parameters:
+    - src_path: Source image filepath.
+    - size: Size of image.
+    - scale: Scale of image relative to the resolution detection constants are tuned for.
+
+    ### Attributes:
+    - plates: Found features for each plate, ordered left to right and top to bottom.
+
+    ### Raises:
+    - FileNotFoundError, ValueError for invalid input parameters.
+    """
+    MIN_PLATE_AREA_RATIO = 0.01
+    CORNER_SEPARATION_RATIO = 0.5 # relative to shorter side of plate bounding rect
+
+    def __init__(self, src_path: str, size: Size, scale: float = 1.0):
+        if not os.path.exists(src_path):
+            raise FileNotFoundError(f"File '{src_path}' not found.")
+        if size.w <= 0 or size.h <= 0:
+            raise ValueError("Size dimensions must be positive numbers.")
+
+        self._scale_constants(scale)
+
+        image = cv2.imread(src_path, cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            raise ValueError(f"Unable to read image file '{src_path}'.")
+
+        self.plates: List[Features] = self._get_plates(image, size)
+
+    def _get_plates(self, image: np.ndarray, size: Size) -> List[Features]:
+        """
+        Groups contours by plate and finds corners of each plate.
+        """
+        contours, hierarchy = cv2.findContours(image, cv2.RETR_TREE, cv2.CHAIN_APPROX_NONE)
+
+        if not contours:
+            return []
 
-            dot_product = dx1 * dx2 + dy1 * dy2
-            norm_product = np.sqrt((dx1 ** 2 + dy1 ** 2) * (dx2 ** 2 + dy2 ** 2))
+        parents = hierarchy.reshape(-1, 4)[:, 3]
+        areas = np.array([cv2.contourArea(contour) for contour in contours])
+        rects = np.array([cv2.boundingRect(contour) for contour in contours])
 
-            if norm_product == 0:
-                angle = 0
-            else:
-                cos_theta = max(min(dot_product / norm_product, 1.0), -1.0) # ensures valid range
-                angle = np.arccos(cos_theta) * (180.0 / np.pi)
+        epsilon: float = self.MIN_CTR_DIST_FROM_EDGE
+        edge_flags = (rects[:, 0] < epsilon) | (rects[:, 0] + rects[:, 2] - 1 > size.w - epsilon) | \
+                     (rects[:, 1] < epsilon) | (rects[:, 1] + rects[:, 3] - 1 > size.h - epsilon)
 
-            if angle > self.MIN_CORNER_ANGLE:
-                corners.append((x, y))
+        plate_idxs = np.flatnonzero((parents == -1) & (areas >= size.w * size.h * self.MIN_PLATE_AREA_RATIO) & ~edge_flags)
+        plate_idxs = sorted(plate_idxs, key=lambda i: (rects[i, 1] // (size.h // 10 + 1), rects[i, 0])) # reading order in rows
 
-        filtered_corners = [corners[0]]  
+        plate_positions = {int(idx): position for position, idx in enumerate(plate_idxs)}
+        plate_contours: List[List[np.ndarray]] = [[] for _ in plate_idxs]
 
-        for i in range(1, len(corners)):
-            distance = ((corners[i][0] - filtered_corners[-1][0]) ** 2 + (corners[i][1] - filtered_corners[-1][1]) ** 2) ** 0.5 
-            if distance > self.MIN_CORNER_SEPARATION:
-                filtered_corners.append(corners[i])
+        for i in np.flatnonzero((parents != -1) & (areas >= self.MIN_CTR_AREA)):
+            root = i
+            while parents[root] != -1:
+                root = parents[root]
+            if int(root) in plate_positions:
+                plate_contours[plate_positions[int(root)]].append(contours[i])
 
-        return filtered_corners
+        plates = []
+        for position, idx in enumerate(plate_idxs):
+            min_separation = min(rects[idx, 2], rects[idx, 3]) * self.CORNER_SEPARATION_RATIO
+            corners = self._get_corners(contours[idx], min_separation)
+            plates.append(Features(plate_contour=contours[idx], other_contours=plate_contours[position] or None, corners=corners))
+
+        return plates
 
 class FeatDisplay: 
     """
-    Saves features as an image.
+    Renders features as an image and saves it.
+    Plate outline and unselected contours are cached in a base layer, selection highlights and corners are drawn on top as an overlay.
+    After the first render only regions where the overlay changed or a contour was removed are repainted,
+    redrawing only contours whose bounding rects intersect the region.
 
     ### Parameters:
     - dst_path: Image save path.
     - size: Output image resolution.
     - features: Features to be mapped.
     - colors: Color palette to be used when saving.
+
+    ### Attributes:
+    - canvas: Rendered image (BGR), valid after render() is called.
     """
+    CONTOUR_THICKNESS = 8
+    SELECTED_THICKNESS = 12
+    CORNER_RADIUS = 32
+
     def __init__(self, dst_path: str, size: Size, features: Features, colors: Colors):
 
         self.dst_path = dst_path
         self.size = size
         self.features = features
         self.colors = colors
-    
+
+        self.canvas: np.ndarray = None
+        self._base: np.ndarray = None
+        self._drawn_contours: Dict[int, np.ndarray] = {}
+        self._drawn_overlay: set = set()
+        self._bounding_rects: Dict[int, Tuple[np.ndarray, Tuple[int, int, int, int]]] = {} # id -> (contour, rect), contour kept to detect reused ids
+
+    def render(self) -> List[Tuple[int, int, int, int]]:
+        """
+        Brings canvas up to date with features.
+
+        Returns:
+        - List of repainted regions as (x, y, w, h) rects, empty if nothing changed.
+        """
+        contours = self.features.other_contours or []
+        overlay = self._get_overlay()
+
+        if self.canvas is None:
+            self._base = self._get_blank((int(self.size.h), int(self.size.w)))
+            self._draw_base(self._base, (0, 0))
+            self.canvas = self._base.copy()
+            self._draw_overlay(self.canvas, (0, 0), overlay)
+            self._drawn_contours = {id(contour): contour for contour in contours}
+            self._drawn_overlay = overlay
+            return [(0, 0, int(self.size.w), int(self.size.h))]
+
+        current_ids = {id(contour) for contour in contours}
+        removed = [contour for contour_id, contour in self._drawn_contours.items() if contour_id not in current_ids]
+        changed_overlay = overlay ^ self._drawn_overlay
+
+        rects = [self._get_contour_rect(contour, self.CONTOUR_THICKNESS) for contour in removed]
+        rects += [self._get_overlay_rect(element) for element in changed_overlay]
+        rects = [rect for rect in rects if rect is not None]
+
+        for rect in rects:
+            x, y, w, h = rect
+            if removed:
+                self._base[y:y+h, x:x+w] = self.colors.background_color
+                self._draw_base(self._base[y:y+h, x:x+w], (x, y))
+            self.canvas[y:y+h, x:x+w] = self._base[y:y+h, x:x+w]
+            self._draw_overlay(self.canvas[y:y+h, x:x+w], (x, y), overlay)
+
+        for contour in removed:
+            self._drawn_contours.pop(id(contour))
+            self._bounding_rects.pop(id(contour), None)
+        self._drawn_overlay = overlay
+
+        return rects
+
     def save_features(self):
         """
         Saves images with properties specified at initialization.
         """
-        canvas = np.zeros((self.size.h, self.size.w, 3), dtype=np.uint8)
+        self.render()
+        cv2.imwrite(self.dst_path, self.canvas)
+
+    def _get_blank(self, shape: Tuple[int, int]) -> np.ndarray:
+        canvas = np.zeros((*shape, 3), dtype=np.uint8)
         canvas[:, :] = list(self.colors.background_color)
+        return canvas
+
+    def _draw_base(self, canvas: np.ndarray, origin: Tuple[int, int]):
+        """
+        Draws plate outline and all contours onto canvas, which may be a region of the full image starting at origin.
+        """
+        offset = (-origin[0], -origin[1])
 
         if self.features.plate_contour is not None:
-            cv2.drawContours(canvas, self.features.plate_contour, -1, self.colors.plate_color, thickness=8)
+            cv2.drawContours(canvas, self.features.plate_contour, -1, self.colors.plate_color, thickness=self.CONTOUR_THICKNESS, offset=offset)
+
+        contours = self._get_contours_in_region(origin, canvas.shape[:2])
+        if contours:
+            cv2.drawContours(canvas, contours, -1, self.colors.contour_color, thickness=self.CONTOUR_THICKNESS, offset=offset)
+
+    def _get_contours_in_region(self, origin: Tuple[int, int], shape: Tuple[int, int]) -> List[np.ndarray]:
+        """
+        Returns contours whose strokes reach into region of given shape starting at origin, using cached bounding rects.
+        """
+        contours = self.features.other_contours or []
+        if not contours:
+            return []
+
+        x, y = origin
+        h, w = shape
+        rects = np.array([self._get_bounding_rect(contour) for contour in contours])
+        reach = self.CONTOUR_THICKNESS // 2 + 1
+
+        hits = (rects[:, 0] - reach < x + w) & (rects[:, 0] + rects[:, 2] + reach > x) & (rects[:, 1] - reach < y + h) & (rects[:, 1] + rects[:, 3] + reach > y)
+        return [contours[i] for i in np.flatnonzero(hits)]
+
+    def _get_bounding_rect(self, contour: np.ndarray) -> Tuple[int, int, int, int]:
+        cached = self._bounding_rects.get(id(contour))
+        if cached is not None and cached[0] is contour:
+            return cached[1]
+        rect = cv2.boundingRect(np.asarray(contour, dtype=np.int32).reshape(-1, 1, 2))
+        self._bounding_rects[id(contour)] = (contour, rect)
+        return rect
+
+    def _get_overlay(self) -> set:
+        """
+        Returns overlay elements for current selection as hashable tuples.
+        """
+        overlay = set()
+
+        selected_contour_idx = self.features.selected_contour_idx
+        if selected_contour_idx is not None and self.features.other_contours:
+            overlay.add(('contour', id(self.features.other_contours[selected_contour_idx]), selected_contour_idx))
+
+        for i, corner in enumerate(self.features.corners or []):
+            overlay.add(('corner', tuple(int(coordinate) for coordinate in corner), i == self.features.selected_corner_idx))
+
+        return overlay
+
+    def _draw_overlay(self, canvas: np.ndarray, origin: Tuple[int, int], overlay: set):
+        """
+        Draws overlay elements onto canvas, which may be a region of the full image starting at origin.
+        Selected contour is drawn below corners.
+        """
+        x0, y0 = origin
+
+        for element in sorted(overlay, key=lambda element: element[0] != 'contour'):
+            if element[0] == 'contour':
+                cv2.drawContours(canvas, self.features.other_contours, element[2], self.colors.selected_element_color, thickness=self.SELECTED_THICKNESS, offset=(-x0, -y0))
+                continue
 
-        if self.features.other_contours is not None:
-            cv2.drawContours(canvas, self.features.other_contours, -1, self.colors.contour_color, thickness=8)
+            _, (x, y), selected = element
+            color = self.colors.selected_element_color if selected else self.colors.corner_color
+            thickness = self.SELECTED_THICKNESS if selected else self.CONTOUR_THICKNESS
+            cv2.circle(canvas, (x - x0, y - y0), radius=self.CORNER_RADIUS, color=color, thickness=thickness)
+
+    def _get_overlay_rect(self, element: tuple) -> Union[Tuple[int, int, int, int], None]:
+        if element[0] == 'contour':
+            contour = self._drawn_contours.get(element[1])
+            return self._get_contour_rect(contour, self.SELECTED_THICKNESS) if contour is not None else None
+
+        x, y = element[1]
+        reach = self.CORNER_RADIUS + self.SELECTED_THICKNESS
+        return self._clip_rect(x - reach, y - reach, 2 * reach + 1, 2 * reach + 1)
+
+    def _get_contour_rect(self, contour: np.ndarray, thickness: int) -> Union[Tuple[int, int, int, int], None]:
+        x, y, w, h = self._get_bounding_rect(contour)
+        reach = thickness // 2 + 1
+        return self._clip_rect(x - reach, y - reach, w + 2 * reach, h + 2 * reach)
+
+    def _clip_rect(self, x: int, y: int, w: int, h: int) -> Union[Tuple[int, int, int, int], None]:
+        x1, y1 = max(x, 0), max(y, 0)
+        x2, y2 = min(x + w, int(self.size.w)), min(y + h, int(self.size.h))
+        if x2 <= x1 or y2 <= y1:
+            return None
+        return (x1, y1, x2 - x1, y2 - y1)
+
+class FeatIndex:
+    """
+    Uniform grid over feature points used for click hit-testing.
+    Points are bucketed per cell under a (kind, key) entry, so entries can be inserted and removed without rebuilding the grid.
+
+    ### Parameters:
+    - cell_size: Side length of a grid cell, should match the typical query radius.
+    """
+    CONTOUR = 'contour'
+    CORNER = 'corner'
 
-        if self.features.selected_contour_idx is not None:
-            cv2.drawContours(canvas, self.features.other_contours, self.features.selected_contour_idx, self.colors.selected_element_color, thickness=12)
+    def __init__(self, cell_size: float):
+        if cell_size <= 0:
+            raise ValueError("Cell size must be a positive number.")
 
-        for i, corner in enumerate(self.features.corners):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Dict[Tuple[str, int], np.ndarray]] = {}
+        self._entry_cells: Dict[Tuple[str, int], List[Tuple[int, int]]] = {}
 
-            if i == self.features.selected_corner_idx:
-                color = self.colors.selected_element_color
-                thickness = 12
-            else:
-                color = self.colors.corner_color
-                thickness = 8
+    def insert(self, kind: str, key: int, points: np.ndarray):
+        """
+        Adds points belonging to a single feature to the grid.
 
-            cv2.circle(canvas, corner, radius=32, color=color, thickness=thickness)
-        
-        cv2.imwrite(self.dst_path, canvas)
+        Arguments:
+        - kind: Feature kind, either FeatIndex.CONTOUR or FeatIndex.CORNER.
+        - key: Key identifying the feature within its kind.
+        - points: Array of points reshapable to (N, 2).
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if len(points) == 0:
+            return
 
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+        unique_cells, inverse = np.unique(cells, axis=0, return_inverse=True)
+        order = np.argsort(inverse.ravel(), kind='stable')
+        groups = np.split(points[order], np.cumsum(np.bincount(inverse.ravel()))[:-1])
 
+        entry = (kind, key)
+        entry_cells = [tuple(cell) for cell in unique_cells.tolist()]
+        for cell, group in zip(entry_cells, groups):
+            self._cells.setdefault(cell, {})[entry] = group
+        self._entry_cells[entry] = entry_cells
+
+    def remove(self, kind: str, key: int):
+        """
+        Removes all points of a feature from the grid, touching only the cells the feature occupies.
+        """
+        for cell in self._entry_cells.pop((kind, key), []):
+            bucket = self._cells[cell]
+            del bucket[(kind, key)]
+            if not bucket:
+                del self._cells[cell]
+
+    def nearest(self, point: Tuple[float, float], radius: float, kind: str) -> Union[int, None]:
+        """
+        Finds the feature of a given kind closest to a point.
+
+        Arguments:
+        - point: Query point.
+        - radius: Maximum distance to the feature.
+        - kind: Feature kind to search for.
+
+        Returns:
+        - Key of the closest feature, None if no feature lies within radius.
+        """
+        x, y = point
+        cell_x, cell_y = int(np.floor(x / self.cell_size)), int(np.floor(y / self.cell_size))
+        reach = int(np.ceil(radius / self.cell_size))
+
+        best_key, best_distance = None, radius
+
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                bucket = self._cells.get((cell_x + dx, cell_y + dy))
+                if bucket is None:
+                    continue
+                for (entry_kind, key), points in bucket.items():
+                    if entry_kind != kind:
+                        continue
+                    distance = np.sqrt(np.min((points[:, 0] - x) ** 2 + (points[:, 1] - y) ** 2))
+                    if distance <= best_distance:
+                        best_key, best_distance = key, distance
+
+        return best_key
 
 class FeatEditor:
     """
     Class for manually editing features.
+    Contour points and corners are kept in a FeatIndex in pixmap coordinates so clicks are resolved without scanning every feature.
     """
+    MIN_DISTANCE = 20
+
     def __init__(self, size: Size, features: Features, pixmap_height: int):
         self.size = size
         self.pixmap_height = pixmap_height
         self.pixmap_scale_factor = pixmap_height/self.size.h
         self.features = features
+        self._init_index()
+
+    def _init_index(self):
+        """
+        Builds spatial index over contours and corners. Index keys stay fixed while list positions shift on removal,
+        positions of keys are kept in dicts updated on every edit.
+        """
+        self.index = FeatIndex(self.MIN_DISTANCE)
+        self._next_key = 0
+        self._indexed_contours: list = list(self.features.other_contours or []) # indexed elements, compared by identity on sync
+        self._indexed_corners: list = list(self.features.corners or [])
+        self._contour_keys: List[int] = [self._index_feature(FeatIndex.CONTOUR, contour) for contour in self._indexed_contours]
+        self._corner_keys: List[int] = [self._index_feature(FeatIndex.CORNER, corner) for corner in self._indexed_corners]
+        self._contour_positions: Dict[int, int] = {key: i for i, key in enumerate(self._contour_keys)}
+        self._corner_positions: Dict[int, int] = {key: i for i, key in enumerate(self._corner_keys)}
+
+    def _index_feature(self, kind: str, points) -> int:
+        key = self._next_key
+        self._next_key += 1
+        self.index.insert(kind, key, np.asarray(points, dtype=np.float64).reshape(-1, 2) * self.pixmap_scale_factor)
+        return key
+
+    def _sync_index(self):
+        """
+        Rebuilds index if features were replaced, reordered or edited outside of the editor.
+        """
+        if not self._is_indexed(self._indexed_contours, self.features.other_contours) or not self._is_indexed(self._indexed_corners, self.features.corners):
+            self._init_index()
+
+    @staticmethod
+    def _is_indexed(indexed: list, current: Union[list, None]) -> bool:
+        current = current or []
+        return len(indexed) == len(current) and all(map(operator.is_, indexed, current))
+
+    @staticmethod
+    def _remove_position(n: int, keys: List[int], positions: Dict[int, int], indexed: list) -> int:
+        """
+        Removes feature at list position n from editor bookkeeping, shifting positions of the following features.
+
+        Returns:
+        - Index key of removed feature.
+        """
+        key = keys.pop(n)
+        indexed.pop(n)
+        del positions[key]
+        for i in range(n, len(keys)):
+            positions[keys[i]] = i
+        return key
 
     def select_corner(self, n: int):
         self.features.selected_corner_idx = n
@@ -223,12 +575,18 @@ class FeatEditor:
     def remove_corner(self):
         if self.features.selected_corner_idx is None:
             return
+        self._sync_index()
+        key = self._remove_position(self.features.selected_corner_idx, self._corner_keys, self._corner_positions, self._indexed_corners)
+        self.index.remove(FeatIndex.CORNER, key)
         self.features.corners.pop(self.features.selected_corner_idx)
         self.unselect_corner()
 
     def remove_contour(self):
         if self.features.selected_contour_idx is None:
             return
+        self._sync_index()
+        key = self._remove_position(self.features.selected_contour_idx, self._contour_keys, self._contour_positions, self._indexed_contours)
+        self.index.remove(FeatIndex.CONTOUR, key)
         self.features.other_contours.pop(self.features.selected_contour_idx)
         self.unselect_contour()
 
@@ -241,36 +599,31 @@ class FeatEditor:
             return
             
         new_corner = (x_scaled, y_scaled)
+        self._sync_index()
         self.features.corners.append(new_corner)
+        self._indexed_corners.append(new_corner)
+        self._corner_keys.append(self._index_feature(FeatIndex.CORNER, new_corner))
+        self._corner_positions[self._corner_keys[-1]] = len(self._corner_keys) - 1
 
     def feature_selected(self, coordinates: tuple) -> bool:
+        """
+        Selects contour or corner (in that order of priority) closest to pixmap coordinates.
 
-        MIN_DISTANCE = 20
-        
-        for i, contour in enumerate(self.features.other_contours):
+        Returns:
+        - True if a feature was found within MIN_DISTANCE.
+        """
+        self._sync_index()
+
+        key = self.index.nearest(coordinates, self.MIN_DISTANCE, FeatIndex.CONTOUR)
+        if key is not None:
+            self.unselect_corner()
+            self.select_contour(self._contour_positions[key])
+            return True
+
+        key = self.index.nearest(coordinates, self.MIN_DISTANCE, FeatIndex.CORNER)
+        if key is not None:
+            self.unselect_contour()
+            self.select_corner(self._corner_positions[key])
+            return True
 
-            for point in contour[::int(MIN_DISTANCE*2)]:
-    
-                point_scaled = (point[0][0]*self.pixmap_scale_factor, point[0][1]*self.pixmap_scale_factor)
-
-                if self._is_close(coordinates, point_scaled, MIN_DISTANCE):
-                    self.unselect_corner()
-                    self.select_contour(i)
-                    return True
-                
-        for i, corner in enumerate(self.features.corners):
-
-            corner_scaled = (coordinate * self.pixmap_scale_factor for coordinate in corner)
-
-            if self._is_close(coordinates, corner_scaled, MIN_DISTANCE):
-                self.unselect_contour()
-                self.select_corner(i)
-                return True
-        
         return False
-    
-    def _is_close(self, point_1: tuple, point_2: tuple, threshold: int):
-        x1, y1 = point_1
-        x2, y2 = point_2
-        distance = math.sqrt(abs(x2 - x1)**2 + abs(y2 - y1)**2)
-        return distance <= threshold
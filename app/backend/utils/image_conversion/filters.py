@@ -1,5 +1,6 @@
 import numpy as np
 import cv2
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, List
 
 from .utils import Size, Colors
@@ -12,12 +13,15 @@ class BinaryFilter:
     - src_path: source path.
     - dst_path: destination path.
     - threshold: threshold value that separates white from black, must be in range [0, 255].
+    - kernel_size: size of morphological opening kernel used to remove noise.
 
     ### Raises
     - ValueError or TypeError if threshold value is invalid.
     """
 
-    def __init__(self, src_path: str, dst_path: str, threshold: int):
+    MORPH_KERNEL_SIZE = 10
+
+    def __init__(self, src_path: str, dst_path: str, threshold: int, kernel_size: int = MORPH_KERNEL_SIZE):
 
         if threshold < 0 or threshold > 255:
             raise ValueError("Threshold value must be in range 0-255")
@@ -26,6 +30,7 @@ class BinaryFilter:
             raise TypeError("Threshold must be integer value")
         
         self.threshold = threshold
+        self.kernel_size = kernel_size
 
         self.src_path = src_path
         self.dst_path = dst_path
@@ -39,14 +44,39 @@ class BinaryFilter:
         self._apply_binary_filter()
         cv2.imwrite(self.dst_path, self.image)
 
+    @staticmethod
+    def get_auto_threshold(src_path: str) -> int:
+        """
+        Picks threshold separating plate from background using Otsu's method on the blurred grayscale image.
+
+        Arguments:
+        - src_path: source path.
+
+        Returns:
+        - Threshold value in range [0, 255].
+        """
+        image = cv2.imread(src_path, cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError(f"Unable to read image file '{src_path}'.")
+        image = BinaryFilter._preprocess(image)
+        threshold, _ = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        return int(threshold)
+
+    @staticmethod
+    def _preprocess(image: np.ndarray) -> np.ndarray:
+        """
+        Converts color image to grayscale and applies Gaussian blur.
+        """
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) 
+        return cv2.GaussianBlur(image, (7, 7), 0)
+
     def _apply_binary_filter(self):
         """
         Applies CV binary filter after preprocessing using Gaussian blur.
         """
-        image = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY) 
-        image = cv2.GaussianBlur(image, (7, 7), 0)
+        image = self._preprocess(self.image)
         _, image = cv2.threshold(image, self.threshold, 255, cv2.THRESH_BINARY) 
-        image = cv2.morphologyEx(image, cv2.MORPH_OPEN, np.ones((10, 10), np.uint8))
+        image = cv2.morphologyEx(image, cv2.MORPH_OPEN, np.ones((self.kernel_size, self.kernel_size), np.uint8))
         self.image = image
 
 
@@ -54,12 +84,14 @@ class BinaryFilter:
 class FlatFilter:
     """
     Filter for flattening 3D images to 2D based on plate corners. Assumes valid src and dst paths.
+    Large outputs can be flattened tile by tile with save_tiled, which keeps peak memory bounded by tile size.
 
     ### Parameters:
     - src_path: source path.
     - dst_path: destination path.
     - size: size of output image.  
     - corners: List of corners containing four elements.
+    - transformation_matrix: Optional precomputed transformation matrix, used instead of one derived from corners.
 
     ### Raises:
     - TypeError for invalid input types.
@@ -68,7 +100,11 @@ class FlatFilter:
 
     COLOR_DELETION_THRESHOLD = 30
 
-    def __init__(self, src_path: str, dst_path: str, size: Size, corners: List[Tuple[float, float]]):
+    TILE_SIZE = 2048
+    TILED_MIN_PIXELS = 64_000_000
+    PREVIEW_MAX_DIM = 2000
+
+    def __init__(self, src_path: str, dst_path: str, size: Size, corners: List[Tuple[float, float]], transformation_matrix: np.ndarray = None):
 
         if not isinstance(size, Size):
             raise TypeError("size must be a Size object")
@@ -84,7 +120,10 @@ class FlatFilter:
         self.EDGE_THRESHOLD = int(min(size.w, size.h)//25)
 
         self.src_corners = self._sort_corners(corners)
+        if None in self.src_corners: # two corners share a quadrant around their center
+            raise ValueError("Corners do not form a quadrilateral")
         self.dst_corners = self._get_rect_corners(self.size)
+        self.transformation_matrix = transformation_matrix
 
     def _sort_corners(self, corners: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
         """
@@ -132,9 +171,14 @@ class FlatFilter:
         dst_pts = np.array(dst_pts, dtype=np.float32)
         return cv2.getPerspectiveTransform(src_pts, dst_pts)
 
+    def _get_matrix(self) -> np.ndarray:
+        if self.transformation_matrix is not None:
+            return self.transformation_matrix
+        return self._get_transformation_matrix(self.src_corners, self.dst_corners)
+
     def _remove_edge_ctr(self, image, colors: Colors):
         """
-        Removes edge contour from image by setting edge pixels to white. 
+        Removes edge contour from image by setting edge pixels to white. Modifies image in place.
 
         Arguments: 
         - image: source image.
@@ -145,26 +189,94 @@ class FlatFilter:
         """
         edge_width = self.EDGE_THRESHOLD
 
-        height, width = image.shape[:2]
-
-        mask = np.zeros((height, width), dtype=np.uint8)
-        mask[:edge_width, :] = 255  
-        mask[-edge_width:, :] = 255  
-        mask[:, :edge_width] = 255  
-        mask[:, -edge_width:] = 255  
+        image[:edge_width, :] = colors.background_color
+        image[-edge_width:, :] = colors.background_color
+        image[:, :edge_width] = colors.background_color
+        image[:, -edge_width:] = colors.background_color
 
-        result_image = image.copy() 
-        result_image[mask != 0] = colors.background_color
-
-        return result_image
+        return image
 
     def save_image(self):
         """
         Saves filtered image to dst path specified at initialization.
         """
-        transformation_matrix = self._get_transformation_matrix(self.src_corners, self.dst_corners)
+        transformation_matrix = self._get_matrix()
         image: np.ndarray = cv2.imread(self.src_path, cv2.IMREAD_COLOR)
         image = cv2.warpPerspective(image, transformation_matrix, (int(self.size.w), int(self.size.h)))
         image = self._remove_edge_ctr(image, Colors())
         cv2.imwrite(self.dst_path, image)
-     
\ No newline at end of file
+
+    def save_tiled(self, preview_path: str = None, max_workers: int = None):
+        """
+        Saves flattened single-channel mask to dst path (.npy) specified at initialization, warping one tile at a time.
+        Nonzero source pixels map to 255, matching how the untiled output is read for contour extraction.
+        The output is written through a memory map, so only the source mask and in-flight tiles are held in memory.
+
+        Arguments:
+        - preview_path: Optional path for a downscaled preview image of the output.
+        - max_workers: Maximum amount of tiles processed in parallel, defaults to ThreadPoolExecutor's default.
+        """
+        transformation_matrix = self._get_matrix()
+        source = cv2.imread(self.src_path, cv2.IMREAD_GRAYSCALE)
+        _, mask = cv2.threshold(source, 0, 255, cv2.THRESH_BINARY)
+        del source
+
+        width, height = int(self.size.w), int(self.size.h)
+        output = np.lib.format.open_memmap(self.dst_path, mode='w+', dtype=np.uint8, shape=(height, width))
+
+        preview_scale = min(1.0, self.PREVIEW_MAX_DIM / max(width, height))
+        preview = np.empty((round(height * preview_scale), round(width * preview_scale)), dtype=np.uint8) if preview_path else None
+
+        tiles = [
+            (x, y, min(self.TILE_SIZE, width - x), min(self.TILE_SIZE, height - y))
+            for y in range(0, height, self.TILE_SIZE)
+            for x in range(0, width, self.TILE_SIZE)
+        ]
+
+        def process_tile(tile: Tuple[int, int, int, int]):
+            x, y, tile_w, tile_h = tile
+            tile_image = self._warp_tile(mask, transformation_matrix, tile)
+            output[y:y+tile_h, x:x+tile_w] = tile_image
+
+            if preview is not None:
+                x1, y1 = round(x * preview_scale), round(y * preview_scale)
+                x2, y2 = round((x + tile_w) * preview_scale), round((y + tile_h) * preview_scale)
+                if x2 > x1 and y2 > y1:
+                    preview[y1:y2, x1:x2] = cv2.resize(tile_image, (x2 - x1, y2 - y1), interpolation=cv2.INTER_AREA)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(process_tile, tiles))
+
+        output.flush()
+        del output
+
+        if preview is not None:
+            cv2.imwrite(preview_path, preview)
+
+    def _warp_tile(self, mask: np.ndarray, transformation_matrix: np.ndarray, tile: Tuple[int, int, int, int]) -> np.ndarray:
+        """
+        Warps a single output tile using the transformation matrix offset by the tile origin, blanking the edge band in place.
+
+        Arguments:
+        - mask: Binary source mask.
+        - transformation_matrix: Full-image transformation matrix.
+        - tile: Tile rect as (x, y, w, h) in output coordinates.
+
+        Returns:
+        - Binary tile image.
+        """
+        x, y, tile_w, tile_h = tile
+        offset = np.array([[1, 0, -x], [0, 1, -y], [0, 0, 1]], dtype=np.float64)
+
+        tile_image = cv2.warpPerspective(mask, offset @ transformation_matrix, (tile_w, tile_h))
+        cv2.threshold(tile_image, 0, 255, cv2.THRESH_BINARY, dst=tile_image)
+
+        edge_width = self.EDGE_THRESHOLD
+        width, height = int(self.size.w), int(self.size.h)
+
+        tile_image[:max(0, edge_width - y), :] = 255
+        tile_image[max(0, height - edge_width - y):, :] = 255
+        tile_image[:, :max(0, edge_width - x)] = 255
+        tile_image[:, max(0, width - edge_width - x):] = 255
+
+        return tile_image
@@ -2,24 +2,26 @@ import os
 import numpy as np
 import cv2
 import traceback
+from typing import List, Tuple
 
-from .utils import Size, Colors
+from .utils import Size, Colors, ImageLoader, ProcessingProfile
 from .filters import BinaryFilter, FlatFilter
-from .features import FeatDetector, FeatDisplay, FeatEditor
-
-from ....config import PROCESSING_SCALE_FACTOR
+from .features import Features, FeatDetector, FeatDisplay, FeatEditor
+from .station import StationProfile
+from .lens import LensCalibration
+from ..contour_util import ContourUtil
+from ..memory_diagnostics import MemoryDiagnostics
 
 class ImageConverter:
 
-    MAX_IMG_W = 2000
-    MAX_IMG_H = 2000
-
     RAW_NAME = 'raw.png'
     BIN_NAME = 'bin.png'
     FEAT_NAME = 'feat.png'
+    MASK_NAME = 'mask.png'
     FLAT_NAME = 'flat.png'
+    FLAT_MASK_NAME = 'flat.npy'
 
-    def __init__(self, data_folder_path: str, plate_w: float, plate_h: float, pixmap_height: int):
+    def __init__(self, data_folder_path: str, plate_w: float, plate_h: float, pixmap_height: int, processing_profile: ProcessingProfile = None):
         
         if not os.path.exists(data_folder_path):
             raise FileNotFoundError("Indicated preview folder path does not exist")
@@ -32,8 +34,13 @@ class ImageConverter:
 
         self.plate_size = Size(plate_w, plate_h)
         self.pixmap_height = pixmap_height
+        self.processing_profile = processing_profile if processing_profile is not None else ProcessingProfile.get()
     
-    def __init_src_path__(self, path: str):
+    @MemoryDiagnostics.track('load')
+    def load_source_image(self, path: str):
+        """
+        Loads photo to be converted, saving it as raw image resized to profile's maximum dimension and undistorted with loaded lens calibration.
+        """
         self.src_img_path = path
         self._save_raw()
 
@@ -41,45 +48,66 @@ class ImageConverter:
         self.raw_path = os.path.join(self.data_folder, self.RAW_NAME)
         self.bin_path = os.path.join(self.data_folder, self.BIN_NAME)
         self.feat_path = os.path.join(self.data_folder, self.FEAT_NAME)
+        self.mask_path = os.path.join(self.data_folder, self.MASK_NAME)
         self.flat_path = os.path.join(self.data_folder, self.FLAT_NAME)
+        self.flat_mask_path = os.path.join(self.data_folder, self.FLAT_MASK_NAME)
+        self.flat_tiled = False
+        self.station_profile = None
+        self.lens_calibration = None
 
     def __init_resolution__(self, resolution: tuple):
         self.img_size = Size(resolution[1], resolution[0])
 
     def __init_features__(self):
-        feat_detector = FeatDetector(self.bin_path, self.img_size)
+        feat_detector = FeatDetector(self.bin_path, self.img_size, self.processing_profile.detection_scale)
         self.features = feat_detector.features
 
-    def __resize_image(self, image, max_width: int, max_height: int): 
-        initial_height, initial_width = image.shape[:2]
-        scale_factor = min(max_width / initial_width, max_height / initial_height)
-
-        new_width = round(initial_width * scale_factor)
-        new_height = round(initial_height * scale_factor)
-        
-        new_dim = (new_width, new_height)
-        resized_image = cv2.resize(image, new_dim, interpolation=cv2.INTER_LANCZOS4)
-
-        return resized_image
-
     def _save_raw(self):
-        image: np.ndarray = cv2.imread(self.src_img_path, cv2.IMREAD_COLOR)
-        image = self.__resize_image(image, self.MAX_IMG_W, self.MAX_IMG_H)
+        image = ImageLoader.load(self.src_img_path, self.processing_profile.max_image_dim, self.processing_profile.max_image_dim)
+        if self.lens_calibration is not None:
+            image = self.lens_calibration.undistort(image)
         resolution = image.shape[:2]
         self.__init_resolution__(resolution)
         cv2.imwrite(self.raw_path, image)
 
+    def load_lens_calibration(self, path: str):
+        """
+        Loads lens calibration applied to photos loaded afterwards.
+        """
+        self.lens_calibration = LensCalibration.load(path)
+
+    def get_auto_threshold(self) -> int:
+        return BinaryFilter.get_auto_threshold(self.raw_path)
+
+    @MemoryDiagnostics.track('binary')
     def save_binary(self, threshold: int):
-        bin_filter = BinaryFilter(self.raw_path, self.bin_path, threshold)
+        bin_filter = BinaryFilter(self.raw_path, self.bin_path, threshold, self.processing_profile.morph_kernel)
         bin_filter.save_image()
 
+    @MemoryDiagnostics.track('features')
     def initialize_features(self):
         self.__init_features__()
         self.feature_editor = FeatEditor(self.img_size, self.features, self.pixmap_height)
+        self.feature_display = FeatDisplay(self.feat_path, self.img_size, self.features, Colors())
+
+    def use_features(self, features: Features, img_size: Size):
+        """
+        Uses externally detected features instead of running detection on own binary image.
+        """
+        self.img_size = img_size
+        self.features = features
+        self.feature_editor = FeatEditor(self.img_size, self.features, self.pixmap_height)
+        self.feature_display = FeatDisplay(self.feat_path, self.img_size, self.features, Colors())
+
+    @MemoryDiagnostics.track('render')
+    def update_features(self) -> list:
+        """
+        Re-renders changed regions of the feature image, returning them as (x, y, w, h) rects.
+        """
+        return self.feature_display.render()
 
     def save_features(self):
-        feature_display = FeatDisplay(self.feat_path, self.img_size, self.features, Colors())
-        feature_display.save_features()
+        self.feature_display.save_features()
     
     def corner_added(self, coordinates: tuple):
         self.feature_editor.add_corner(coordinates)    
@@ -88,25 +116,113 @@ class ImageConverter:
         return self.feature_editor.feature_selected(coordinates)
 
     def _valid_features(self) -> bool:
-        if len(self.features.corners) != 4:
+        if self.features.plate_contour is None or self.features.corners is None:
             return False
-        
-        if self.features.plate_contour is None:
+
+        if len(self.features.corners) != 4:
             return False
     
         return True
 
+    @MemoryDiagnostics.track('flatten')
     def save_flattened(self) -> bool:
         if not self._valid_features():
             return False
 
-        new_size = self.plate_size.get_scaled(PROCESSING_SCALE_FACTOR)
-        flat_filter = FlatFilter(self.feat_path, self.flat_path, new_size, self.features.corners)
-        flat_filter.save_image()
+        self.save_features()
+        self._save_mask(self.features)
+        self._flatten(self.mask_path, self.features.corners)
+        return True
+
+    def _save_mask(self, features: Features):
+        """
+        Saves plate mask flattened for contour extraction by both manual and station paths: plate area filled white, holes filled black.
+        Feature image only holds contour strokes, flattening it would turn every stroke into a contour of its own.
+        """
+        mask = np.zeros((int(self.img_size.h), int(self.img_size.w)), dtype=np.uint8)
+        cv2.drawContours(mask, [features.plate_contour], -1, 255, thickness=cv2.FILLED)
+        if features.other_contours:
+            cv2.drawContours(mask, features.other_contours, -1, 0, thickness=cv2.FILLED)
+        cv2.imwrite(self.mask_path, mask)
+
+    def _flatten(self, src_path: str, corners: List[tuple], transformation_matrix: np.ndarray = None):
+        new_size = self.plate_size.get_scaled(self.processing_profile.px_per_mm)
+        self.flat_tiled = new_size.w * new_size.h >= FlatFilter.TILED_MIN_PIXELS
+
+        if self.flat_tiled: # flat_path only holds a preview, full resolution mask is memory mapped
+            flat_filter = FlatFilter(src_path, self.flat_mask_path, new_size, corners, transformation_matrix)
+            flat_filter.save_tiled(preview_path=self.flat_path)
+        else:
+            flat_filter = FlatFilter(src_path, self.flat_path, new_size, corners, transformation_matrix)
+            flat_filter.save_image()
+
+    def save_station_profile(self, path: str) -> bool:
+        """
+        Stores current plate corners as station profile, to be reused for photos taken with the same fixed camera setup.
+        Plate dimensions are stored as jig size, giving the image scale of later photos.
+        """
+        if not self._valid_features():
+            return False
+
+        self.station_profile = StationProfile(self.features.corners, self.img_size, self.plate_size)
+        self.station_profile.save(path)
+        return True
+
+    def load_station_profile(self, path: str):
+        self.station_profile = StationProfile.load(path)
+
+    @MemoryDiagnostics.track('flatten')
+    def save_flattened_station(self, refine: bool = True) -> bool:
+        """
+        Flattens plate mask with loaded station profile, skipping corner detection.
+        Requires raw and binary images to be saved.
+
+        Arguments:
+        - refine: Whether to refine jig corners by local corner search before flattening.
 
+        Returns:
+        - False if no station profile is loaded or no plate is found in binary image.
+        """
+        if self.station_profile is None:
+            return False
+
+        features = FeatDetector(self.bin_path, self.img_size, self.processing_profile.detection_scale, detect_corners=False).features
+        if features.plate_contour is None:
+            return False
+
+        new_size = self.plate_size.get_scaled(self.processing_profile.px_per_mm)
+        corners = self.station_profile.get_corners(self.img_size)
+
+        if refine:
+            raw_image = cv2.imread(self.raw_path, cv2.IMREAD_GRAYSCALE)
+            corners = StationProfile.refine_corners(raw_image, corners)
+            transformation_matrix = StationProfile.get_homography(corners, new_size)
+        else:
+            transformation_matrix = self.station_profile.get_transformation_matrix(self.img_size, new_size)
+
+        self._save_mask(features)
+        self._flatten(self.mask_path, corners, transformation_matrix)
         return True
+
+    def _load_flat_image(self) -> np.ndarray:
+        if self.flat_tiled:
+            return np.load(self.flat_mask_path, mmap_mode='r')
+        if not os.path.exists(self.flat_path):
+            return None
+        return cv2.imread(self.flat_path, cv2.IMREAD_GRAYSCALE)
     
-    def get_finalized_contours(self) -> list:
-        flat_image = cv2.imread(self.flat_path, cv2.IMREAD_GRAYSCALE)
-        contours, _ = cv2.findContours(flat_image, cv2.RETR_TREE, cv2.CHAIN_APPROX_NONE)
-        return contours
\ No newline at end of file
+    @MemoryDiagnostics.track('contours')
+    def get_finalized_contours(self) -> Tuple[List[np.ndarray], List[int]]:
+        """
+        Extracts contours from flattened image, simplified to profile's contour tolerance and converted to millimeters.
+
+        Returns:
+        - Tuple of float32 contours of shape (N, 2) and parent index for each contour (-1 for outlines).
+            Both lists are empty if no flattened image was saved.
+        """
+        flat_image = self._load_flat_image()
+        if flat_image is None:
+            return [], []
+
+        contours, hierarchy = cv2.findContours(flat_image, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+        return ContourUtil.finalize(contours, hierarchy, self.processing_profile.px_per_mm, self.processing_profile.contour_tolerance)
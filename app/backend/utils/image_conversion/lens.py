@@ -0,0 +1,191 @@
+import os
+import numpy as np
+import cv2
+from typing import Dict, List, Tuple, Union
+
+from .utils import Size
+from ..file_processor import FileProcessor
+
+class LensCalibration:
+    """
+    Lens distortion model of a camera with cached undistortion maps.
+    Maps are built once per image resolution with initUndistortRectifyMap in fixed-point (CV_16SC2) form,
+    so undistorting a photo costs a single remap. Calibrations saved to or loaded from a file persist their maps
+    next to it, so later sessions and batch worker processes load them instead of building them again.
+
+    ### Parameters:
+    - camera_matrix: 3x3 intrinsic camera matrix.
+    - dist_coeffs: Distortion coefficients in OpenCV order (k1, k2, p1, p2[, k3...]).
+    - resolution: Size of images the camera was calibrated with.
+
+    ### Raises:
+    - ValueError for invalid camera matrix or resolution.
+    """
+
+    _loaded: Dict[str, Tuple[float, 'LensCalibration']] = {} # path -> (modification time, calibration)
+
+    MAPS_EXTENSION = '.npz'
+    ASPECT_RATIO_TOLERANCE = 0.01
+
+    def __init__(self, camera_matrix: np.ndarray, dist_coeffs: np.ndarray, resolution: Size):
+
+        camera_matrix = np.asarray(camera_matrix, dtype=np.float64)
+        if camera_matrix.shape != (3, 3):
+            raise ValueError("Camera matrix must be 3x3")
+        if resolution.w <= 0 or resolution.h <= 0:
+            raise ValueError("Resolution dimensions must be positive numbers.")
+
+        self.camera_matrix = camera_matrix
+        self.dist_coeffs = np.asarray(dist_coeffs, dtype=np.float64).ravel()
+        self.resolution = resolution
+        self.path: str = None # calibration file, set on save and load
+
+        self._maps: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = {}
+
+    @staticmethod
+    def calibrate(image_paths: List[str], pattern_size: Tuple[int, int], square_size: float = 1.0) -> 'LensCalibration':
+        """
+        Calibrates camera from photos of a chessboard pattern.
+
+        Arguments:
+        - image_paths: Photos of chessboard taken with the same camera and resolution.
+        - pattern_size: Number of inner corners per chessboard row and column.
+        - square_size: Size of chessboard square, only affects extrinsics.
+
+        Returns:
+        - Lens calibration.
+
+        Raises:
+        - ValueError if pattern is not found in enough photos.
+        """
+        object_points = np.zeros((pattern_size[0] * pattern_size[1], 3), dtype=np.float32)
+        object_points[:, :2] = np.mgrid[0:pattern_size[0], 0:pattern_size[1]].T.reshape(-1, 2) * square_size
+
+        criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
+        all_object_points, all_image_points = [], []
+        resolution = None
+
+        for path in image_paths:
+            image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if image is None:
+                continue
+            if resolution is not None and image.shape[::-1] != resolution:
+                raise ValueError("All calibration photos must have the same resolution")
+            resolution = image.shape[::-1]
+
+            found, corners = cv2.findChessboardCorners(image, pattern_size)
+            if not found:
+                continue
+            corners = cv2.cornerSubPix(image, corners, (11, 11), (-1, -1), criteria)
+            all_object_points.append(object_points)
+            all_image_points.append(corners)
+
+        if len(all_image_points) < 3:
+            raise ValueError("Chessboard pattern must be found in at least three photos")
+
+        _, camera_matrix, dist_coeffs, _, _ = cv2.calibrateCamera(all_object_points, all_image_points, resolution, None, None)
+        return LensCalibration(camera_matrix, dist_coeffs, Size(*resolution))
+
+    def get_maps(self, size: Size) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gets fixed-point undistortion maps for images of given size, loading persisted maps or building them on first use.
+        Camera matrix is scaled from calibration resolution, so size must keep the calibration aspect ratio.
+
+        Raises:
+        - ValueError if image aspect ratio differs from calibration.
+        """
+        key = (int(size.w), int(size.h))
+        if key in self._maps:
+            return self._maps[key]
+
+        scale_x, scale_y = size.w / self.resolution.w, size.h / self.resolution.h
+        if abs(scale_x - scale_y) > self.ASPECT_RATIO_TOLERANCE * max(scale_x, scale_y):
+            raise ValueError("Image aspect ratio does not match lens calibration")
+
+        maps = self._load_maps(key)
+        if maps is None:
+            camera_matrix = np.diag([scale_x, scale_y, 1.0]) @ self.camera_matrix
+            maps = cv2.initUndistortRectifyMap(camera_matrix, self.dist_coeffs, None, camera_matrix, key, cv2.CV_16SC2)
+            self._save_maps(key, maps)
+
+        self._maps[key] = maps
+        return maps
+
+    def _get_maps_path(self, key: Tuple[int, int]) -> str:
+        return f"{os.path.splitext(self.path)[0]}_maps_{key[0]}x{key[1]}{self.MAPS_EXTENSION}"
+
+    def _load_maps(self, key: Tuple[int, int]) -> Union[Tuple[np.ndarray, np.ndarray], None]:
+        """
+        Loads persisted maps, None if there are none or they were built from a different calibration.
+        """
+        if self.path is None or not os.path.exists(self._get_maps_path(key)):
+            return None
+        try:
+            with np.load(self._get_maps_path(key)) as data:
+                if not np.array_equal(data['camera_matrix'], self.camera_matrix) or not np.array_equal(data['dist_coeffs'], self.dist_coeffs):
+                    return None
+                return data['map1'], data['map2']
+        except Exception:
+            return None
+
+    def _save_maps(self, key: Tuple[int, int], maps: Tuple[np.ndarray, np.ndarray]):
+        """
+        Persists maps with the calibration they were built from. Written to a temporary file first, as batch workers may build the same maps concurrently.
+        """
+        if self.path is None:
+            return
+        maps_path = self._get_maps_path(key)
+        temp_path = f"{maps_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'wb') as file:
+                np.savez(file, map1=maps[0], map2=maps[1], camera_matrix=self.camera_matrix, dist_coeffs=self.dist_coeffs)
+            os.replace(temp_path, maps_path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def undistort(self, image: np.ndarray) -> np.ndarray:
+        """
+        Removes lens distortion from image.
+        """
+        height, width = image.shape[:2]
+        map1, map2 = self.get_maps(Size(width, height))
+        return cv2.remap(image, map1, map2, cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+    def save(self, path: str):
+        """
+        Saves calibration to JSON file.
+        """
+        data = {
+            "camera_matrix": self.camera_matrix.tolist(),
+            "dist_coeffs": self.dist_coeffs.tolist(),
+            "resolution": [self.resolution.w, self.resolution.h]
+        }
+        FileProcessor.write_file(path, data, 'json')
+        self.path = path
+
+    @staticmethod
+    def load(path: str) -> 'LensCalibration':
+        """
+        Loads calibration from JSON file. Calibrations are cached per path until the file changes,
+        so maps built for one photo are reused by later ones.
+
+        Raises:
+        - FileNotFoundError if file cannot be read.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Lens calibration '{path}' not found.")
+
+        mtime = os.path.getmtime(path)
+        cached = LensCalibration._loaded.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        data = FileProcessor.read_file(path)
+        if data is None:
+            raise FileNotFoundError(f"Lens calibration '{path}' could not be read.")
+
+        calibration = LensCalibration(np.array(data["camera_matrix"]), np.array(data["dist_coeffs"]), Size(*data["resolution"]))
+        calibration.path = path
+        LensCalibration._loaded[path] = (mtime, calibration)
+        return calibration
@@ -0,0 +1,154 @@
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from .utils import Size
+from .features import Features, MultiPlateDetector
+from .image_converter import ImageConverter
+from ..plate_util import PlateUtil
+
+class PlateResult:
+    """
+    Class for storing outcome of digitizing a single plate of a multi-plate photo.
+
+    ### Parameters:
+    - index: Position of plate in photo, in reading order.
+    - features: Detected plate features.
+    - measured_size: Plate dimensions measured from corners in millimeters, None without four corners.
+    - plate_id: Id of matched inventory plate, None if no plate matched.
+    - data_folder: Folder holding intermediate images of the plate.
+    - contours: Finalized contours in millimeters, in orientation of matched inventory plate.
+    - contour_parents: Parent index of each contour.
+    - error: Reason plate could not be digitized.
+    """
+    def __init__(self, index: int, features: Features, measured_size: Size=None, plate_id: int=None, data_folder: str=None, contours: List[np.ndarray]=None, contour_parents: List[int]=None, error: str=None):
+        self.index: int = index
+        self.features: Features = features
+        self.measured_size: Size = measured_size
+        self.plate_id: int = plate_id
+        self.data_folder: str = data_folder
+        self.contours: List[np.ndarray] = contours
+        self.contour_parents: List[int] = contour_parents
+        self.error: str = error
+
+class MultiPlateConverter:
+    """
+    Digitizes every plate in a single photo of several plates. Plates are detected on the binary image of an
+    ImageConverter, measured from their corners, matched to inventory plates by dimensions and flattened in parallel.
+
+    ### Parameters:
+    - image_converter: Converter with raw and binary images already saved.
+    - px_per_mm: Scale of the raw (resized) image, e.g. from a reference object. Derived from the jig of the
+        converter's station profile if not given.
+
+    ### Attributes:
+    - plates: Detected features of each plate.
+
+    ### Raises:
+    - ValueError for invalid scale, or if no scale is given and no station profile with jig size is loaded.
+    """
+
+    MATCH_TOLERANCE = 10 # mm
+    PLATE_FOLDER_PREFIX = 'plate_'
+
+    def __init__(self, image_converter: ImageConverter, px_per_mm: float = None):
+
+        if px_per_mm is None:
+            if image_converter.station_profile is None:
+                raise ValueError("Scale must be given if no station profile is loaded")
+            px_per_mm = image_converter.station_profile.get_px_per_mm(image_converter.img_size)
+
+        if px_per_mm <= 0:
+            raise ValueError("Scale must be a positive number")
+
+        self.image_converter = image_converter
+        self.px_per_mm = px_per_mm
+
+        self.plates: List[Features] = MultiPlateDetector(image_converter.bin_path, image_converter.img_size, image_converter.processing_profile.detection_scale).plates
+
+    def measure(self, features: Features) -> Size:
+        """
+        Measures plate from its corners, averaging opposite edges. Width is taken along the more horizontal pair of edges.
+
+        Returns:
+        - Size in millimeters, None if plate does not have four corners.
+        """
+        if features.corners is None or len(features.corners) != 4:
+            return None
+
+        corners = np.array(features.corners, dtype=np.float64) # contour order, consecutive corners share an edge
+        edges = np.roll(corners, -1, axis=0) - corners
+        lengths = np.hypot(edges[:, 0], edges[:, 1]) / self.px_per_mm
+
+        first_pair, second_pair = (lengths[0] + lengths[2]) / 2, (lengths[1] + lengths[3]) / 2
+        if abs(edges[0, 0]) >= abs(edges[0, 1]):
+            return Size(first_pair, second_pair)
+        return Size(second_pair, first_pair)
+
+    def process(self, plate_data: List[Dict[str, Any]], max_workers: int=None) -> List[PlateResult]:
+        """
+        Matches detected plates to inventory and flattens them in parallel.
+        Matched plates are flattened to inventory dimensions, unmatched ones to measured dimensions.
+
+        Arguments:
+        - plate_data: Inventory plates.
+        - max_workers: Maximum amount of plates processed in parallel.
+
+        Returns:
+        - One result per detected plate.
+        """
+        sizes = [self.measure(features) for features in self.plates]
+
+        measured = [(size.w, size.h) for size in sizes if size is not None]
+        matches = iter(PlateUtil.match_plates(measured, plate_data, self.MATCH_TOLERANCE))
+        plate_ids = [next(matches) if size is not None else None for size in sizes]
+
+        plates_by_id = {plate['id']: plate for plate in plate_data}
+        tasks = [(i, self.plates[i], sizes[i], plates_by_id.get(plate_ids[i])) for i in range(len(self.plates))]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor: # OpenCV releases the GIL while warping
+            return list(executor.map(lambda task: self._process_plate(*task), tasks))
+
+    def _process_plate(self, index: int, features: Features, size: Size, plate: Dict[str, Any]) -> PlateResult:
+        """
+        Flattens single plate and extracts its contours.
+        """
+        if size is None:
+            corner_count = len(features.corners) if features.corners is not None else 0
+            return PlateResult(index, features, error=f"{corner_count} corners found, plate needs review")
+
+        plate_id = plate['id'] if plate is not None else None
+        flat_size = self._orient(size, plate) if plate is not None else size
+
+        data_folder = os.path.join(self.image_converter.data_folder, f"{self.PLATE_FOLDER_PREFIX}{index}")
+        os.makedirs(data_folder, exist_ok=True)
+
+        try:
+            converter = ImageConverter(data_folder, flat_size.w, flat_size.h, self.image_converter.pixmap_height, self.image_converter.processing_profile)
+            converter.use_features(features, self.image_converter.img_size)
+            converter.save_flattened()
+            contours, parents = converter.get_finalized_contours()
+            if plate is not None and (flat_size.w, flat_size.h) != (float(plate['width_(x)']), float(plate['height_(y)'])):
+                contours = [self._rotate(contour, flat_size) for contour in contours]
+        except Exception as e:
+            return PlateResult(index, features, size, plate_id, data_folder, error=str(e))
+
+        return PlateResult(index, features, size, plate_id, data_folder, contours, parents)
+
+    @staticmethod
+    def _rotate(contour: np.ndarray, size: Size) -> np.ndarray:
+        """
+        Rotates contour of plate flattened to given size by 90 degrees, into orientation of its inventory plate.
+        """
+        return np.column_stack((contour[:, 1], size.w - contour[:, 0])).astype(contour.dtype)
+
+    @staticmethod
+    def _orient(size: Size, plate: Dict[str, Any]) -> Size:
+        """
+        Gets inventory plate dimensions in orientation closest to measured size.
+        """
+        plate_w, plate_h = float(plate['width_(x)']), float(plate['height_(y)'])
+        if abs(size.w - plate_w) + abs(size.h - plate_h) <= abs(size.w - plate_h) + abs(size.h - plate_w):
+            return Size(plate_w, plate_h)
+        return Size(plate_h, plate_w)
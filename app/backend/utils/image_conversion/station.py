@@ -0,0 +1,161 @@
+import numpy as np
+import cv2
+from typing import List, Tuple
+
+from .utils import Size
+from ..file_processor import FileProcessor
+
+class StationProfile:
+    """
+    Calibration of a fixed camera station, storing jig corners and the homography mapping them onto the unit square.
+    Photos taken at the station can be flattened with the cached transform, skipping feature detection.
+
+    ### Parameters:
+    - corners: Four jig corners in raw image coordinates.
+    - resolution: Size of raw image the corners were picked in.
+    - jig_size: Optional size of jig in millimeters, giving the image scale of photos taken at the station.
+
+    ### Attributes:
+    - corners: Jig corners sorted in top left, top right, bottom left, bottom right order.
+    - homography: Transformation matrix mapping corners onto the unit square.
+
+    ### Raises:
+    - ValueError for invalid corners or resolution.
+    """
+
+    REFINE_WINDOW = 15 # half size of corner search window in px
+    REFINE_CRITERIA = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 40, 0.01)
+
+    def __init__(self, corners: List[Tuple[float, float]], resolution: Size, jig_size: Size = None):
+
+        if len(corners) != 4:
+            raise ValueError("Station profile requires exactly four corners")
+        if resolution.w <= 0 or resolution.h <= 0:
+            raise ValueError("Resolution dimensions must be positive numbers.")
+
+        self.corners = self._sort_corners(corners)
+        self.resolution = resolution
+        self.jig_size = jig_size
+        self.homography = self.get_homography(self.corners, Size(1, 1))
+
+    @staticmethod
+    def _sort_corners(corners: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+        """
+        Sorts corners in top left, top right, bottom left, and bottom right order, holds for any convex quadrilateral close to axis alignment.
+        """
+        points = np.array(corners, dtype=np.float64)
+        sums = points.sum(axis=1)
+        diffs = points[:, 0] - points[:, 1]
+        order = [np.argmin(sums), np.argmax(diffs), np.argmin(diffs), np.argmax(sums)]
+
+        if len(set(order)) != 4:
+            raise ValueError("Corners do not form a quadrilateral")
+
+        return [(float(points[i, 0]), float(points[i, 1])) for i in order]
+
+    @staticmethod
+    def get_homography(corners: List[Tuple[float, float]], size: Size) -> np.ndarray:
+        """
+        Gets transformation matrix mapping sorted corners onto rectangle of given size.
+
+        Arguments:
+        - corners: Corners in top left, top right, bottom left, bottom right order.
+        - size: Size of output rectangle.
+
+        Returns:
+        - 3x3 transformation matrix.
+        """
+        src_pts = np.array(corners, dtype=np.float32)
+        dst_pts = np.array([[0, 0], [size.w, 0], [0, size.h], [size.w, size.h]], dtype=np.float32)
+        return cv2.getPerspectiveTransform(src_pts, dst_pts)
+
+    def get_corners(self, img_size: Size) -> List[Tuple[float, float]]:
+        """
+        Gets jig corners in coordinates of raw image of given size.
+
+        Raises:
+        - ValueError if image aspect ratio differs from calibration.
+        """
+        scale_x, scale_y = self._get_scale(img_size)
+        return [(x * scale_x, y * scale_y) for x, y in self.corners]
+
+    def get_transformation_matrix(self, img_size: Size, size: Size) -> np.ndarray:
+        """
+        Gets cached transformation matrix from raw image of given size to flattened image of given size.
+
+        Raises:
+        - ValueError if image aspect ratio differs from calibration.
+        """
+        scale_x, scale_y = self._get_scale(img_size)
+        to_profile = np.diag([1 / scale_x, 1 / scale_y, 1.0])
+        to_output = np.diag([size.w, size.h, 1.0])
+        return to_output @ self.homography @ to_profile
+
+    def get_px_per_mm(self, img_size: Size) -> float:
+        """
+        Gets scale of raw image of given size from jig edge lengths, valid for objects lying in the jig plane.
+
+        Raises:
+        - ValueError if jig size is unknown or image aspect ratio differs from calibration.
+        """
+        if self.jig_size is None:
+            raise ValueError("Station profile has no jig size")
+
+        top_left, top_right, bottom_left, bottom_right = np.array(self.get_corners(img_size))
+        width = (np.linalg.norm(top_right - top_left) + np.linalg.norm(bottom_right - bottom_left)) / 2
+        height = (np.linalg.norm(bottom_left - top_left) + np.linalg.norm(bottom_right - top_right)) / 2
+        return float((width / self.jig_size.w + height / self.jig_size.h) / 2)
+
+    def _get_scale(self, img_size: Size) -> Tuple[float, float]:
+        scale_x, scale_y = img_size.w / self.resolution.w, img_size.h / self.resolution.h
+        if abs(scale_x - scale_y) > 0.01 * max(scale_x, scale_y):
+            raise ValueError("Image aspect ratio does not match station profile")
+        return scale_x, scale_y
+
+    @staticmethod
+    def refine_corners(image: np.ndarray, corners: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+        """
+        Refines corners by sub-pixel corner search in small windows around their expected position.
+
+        Arguments:
+        - image: Grayscale image.
+        - corners: Expected corner positions.
+
+        Returns:
+        - Refined corners in same order.
+        """
+        image = cv2.GaussianBlur(image, (7, 7), 0)
+        points = np.array(corners, dtype=np.float32).reshape(-1, 1, 2)
+        window = (StationProfile.REFINE_WINDOW, StationProfile.REFINE_WINDOW)
+        points = cv2.cornerSubPix(image, points, window, (-1, -1), StationProfile.REFINE_CRITERIA)
+        return [(float(x), float(y)) for x, y in points.reshape(-1, 2)]
+
+    def save(self, path: str):
+        """
+        Saves profile to JSON file.
+        """
+        data = {
+            "corners": [list(corner) for corner in self.corners],
+            "resolution": [self.resolution.w, self.resolution.h],
+            "homography": self.homography.tolist()
+        }
+        if self.jig_size is not None:
+            data["jig_size"] = [self.jig_size.w, self.jig_size.h]
+        FileProcessor.write_file(path, data, 'json')
+
+    @staticmethod
+    def load(path: str) -> 'StationProfile':
+        """
+        Loads profile from JSON file.
+
+        Raises:
+        - FileNotFoundError if file cannot be read.
+        """
+        data = FileProcessor.read_file(path)
+        if data is None:
+            raise FileNotFoundError(f"Station profile '{path}' could not be read.")
+
+        jig_size = Size(*data["jig_size"]) if data.get("jig_size") else None
+        profile = StationProfile([tuple(corner) for corner in data["corners"]], Size(*data["resolution"]), jig_size)
+        profile.homography = np.array(data["homography"], dtype=np.float64)
+        return profile
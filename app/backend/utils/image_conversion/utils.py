@@ -1,3 +1,10 @@
+import struct
+import numpy as np
+import cv2
+from typing import Tuple, Union
+
+from ....config import PROCESSING_PROFILES, DEFAULT_PROCESSING_PROFILE
+
 class Size:
     """
     Class to represent dimensions with width and height.
@@ -48,4 +55,197 @@ class Colors:
         self.selected_element_color = kwargs.get('select_elem_col', self.DEFAULT_COLORS['selected_element_color'])
         self.plate_color = kwargs.get('plate_col', self.DEFAULT_COLORS['plate_edge_color'])
         self.corner_color = kwargs.get('corner_col', self.DEFAULT_COLORS['corner_color'])
-        
\ No newline at end of file
+        
+
+class ProcessingProfile:
+    """
+    Class to represent image processing quality/speed settings.
+
+    ### Parameters:
+    - name: Profile name.
+    - max_image_dim: Maximum width and height of raw image in px.
+    - px_per_mm: Resolution of flattened image.
+    - morph_kernel: Size of morphological opening kernel used by binary filter in px.
+    - contour_tolerance: Maximum deviation of simplified contours in mm.
+    """
+
+    REFERENCE_IMAGE_DIM = 2000 # raw image size feature detection constants are tuned for
+
+    def __init__(self, name: str, max_image_dim: int, px_per_mm: float, morph_kernel: int, contour_tolerance: float):
+        self.name = name
+        self.max_image_dim = max_image_dim
+        self.px_per_mm = px_per_mm
+        self.morph_kernel = morph_kernel
+        self.contour_tolerance = contour_tolerance
+
+    @property
+    def detection_scale(self) -> float:
+        """
+        Scale of raw image relative to REFERENCE_IMAGE_DIM.
+        """
+        return self.max_image_dim / self.REFERENCE_IMAGE_DIM
+
+    @staticmethod
+    def get(name: str = None) -> 'ProcessingProfile':
+        """
+        Gets profile by name as defined in config, falling back to default profile for unknown names.
+        """
+        if name not in PROCESSING_PROFILES:
+            name = DEFAULT_PROCESSING_PROFILE
+        return ProcessingProfile(name, **PROCESSING_PROFILES[name])
+
+class ImageLoader:
+    """
+    Functional class for loading photos downscaled to fit within given bounds.
+    JPEG files are decoded at reduced resolution (1/2, 1/4 or 1/8) chosen from the header dimensions,
+    so only the final resize runs on a full-quality image that is at most twice the target size.
+    """
+
+    PNG = 'png'
+    JPEG = 'jpeg'
+
+    PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+    JPEG_SIGNATURE = b'\xff\xd8'
+
+    # start of frame markers carrying image dimensions (excludes DHT 0xC4, JPG 0xC8 and DAC 0xCC)
+    JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+    JPEG_STANDALONE_MARKERS = {0x01, 0xD8, 0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7}
+    JPEG_SOS_MARKER = 0xDA
+
+    REDUCED_FLAGS = {
+        8: cv2.IMREAD_REDUCED_COLOR_8,
+        4: cv2.IMREAD_REDUCED_COLOR_4,
+        2: cv2.IMREAD_REDUCED_COLOR_2
+    }
+
+    @staticmethod
+    def load(path: str, max_w: int, max_h: int) -> np.ndarray:
+        """
+        Loads color image scaled to fit within max_w x max_h.
+
+        Arguments:
+        - path: Image filepath.
+        - max_w: Maximum width of loaded image.
+        - max_h: Maximum height of loaded image.
+
+        Returns:
+        - BGR image.
+
+        Raises:
+        - ValueError if image cannot be read.
+        """
+        flag = cv2.IMREAD_COLOR
+        image_format, size = ImageLoader._read_header(path)
+
+        if image_format == ImageLoader.JPEG and size is not None: # reduced decoding only saves work for DCT based formats
+            flag = ImageLoader.get_reduced_flag(size, max_w, max_h)
+
+        image = cv2.imread(path, flag)
+        if image is None:
+            raise ValueError(f"Unable to read image file '{path}'.")
+
+        return ImageLoader._resize(image, max_w, max_h)
+
+    @staticmethod
+    def get_reduced_flag(size: Size, max_w: int, max_h: int) -> int:
+        """
+        Gets largest reduced decode flag for which decoded image still covers the target size.
+        Image may be rotated by EXIF orientation during decoding, so both orientations are checked.
+
+        Arguments:
+        - size: Full image size.
+        - max_w: Maximum width of loaded image.
+        - max_h: Maximum height of loaded image.
+
+        Returns:
+        - cv2 imread flag.
+        """
+        scale = max(min(max_w / size.w, max_h / size.h), min(max_w / size.h, max_h / size.w))
+
+        for factor, flag in ImageLoader.REDUCED_FLAGS.items():
+            if factor * scale <= 1:
+                return flag
+
+        return cv2.IMREAD_COLOR
+
+    @staticmethod
+    def get_header_size(path: str) -> Union[Size, None]:
+        """
+        Reads image dimensions from PNG or JPEG header without decoding image data.
+
+        Arguments:
+        - path: Image filepath.
+
+        Returns:
+        - Image size, or None if format is not supported or header is malformed.
+        """
+        return ImageLoader._read_header(path)[1]
+
+    @staticmethod
+    def _read_header(path: str) -> Tuple[Union[str, None], Union[Size, None]]:
+        """
+        Gets image format and size from file header.
+        """
+        try:
+            with open(path, 'rb') as file:
+                signature = file.read(8)
+                if signature.startswith(ImageLoader.PNG_SIGNATURE):
+                    return ImageLoader.PNG, ImageLoader._get_png_size(file)
+                if signature.startswith(ImageLoader.JPEG_SIGNATURE):
+                    file.seek(2)
+                    return ImageLoader.JPEG, ImageLoader._get_jpeg_size(file)
+        except (OSError, struct.error):
+            pass
+        return None, None
+
+    @staticmethod
+    def _get_png_size(file) -> Union[Size, None]:
+        """
+        Reads size from IHDR chunk, which directly follows PNG signature.
+        """
+        length, chunk_type, width, height = struct.unpack('>I4sII', file.read(16))
+        if chunk_type != b'IHDR':
+            return None
+        return Size(width, height)
+
+    @staticmethod
+    def _get_jpeg_size(file) -> Union[Size, None]:
+        """
+        Walks JPEG markers up to first start of frame segment.
+        """
+        while True:
+            byte = file.read(1)
+            if not byte:
+                return None
+            if byte != b'\xff':
+                continue
+
+            marker = file.read(1)
+            while marker == b'\xff': # fill bytes
+                marker = file.read(1)
+            if not marker:
+                return None
+            marker = marker[0]
+
+            if marker in ImageLoader.JPEG_STANDALONE_MARKERS:
+                continue
+            if marker == ImageLoader.JPEG_SOS_MARKER:
+                return None
+
+            length, = struct.unpack('>H', file.read(2))
+            if marker in ImageLoader.JPEG_SOF_MARKERS:
+                _, height, width = struct.unpack('>BHH', file.read(5))
+                return Size(width, height) if width > 0 and height > 0 else None
+            file.seek(length - 2, 1)
+
+    @staticmethod
+    def _resize(image: np.ndarray, max_w: int, max_h: int) -> np.ndarray:
+        """
+        Resizes image to fit within max_w x max_h, using area interpolation when shrinking.
+        """
+        initial_h, initial_w = image.shape[:2]
+        scale_factor = min(max_w / initial_w, max_h / initial_h)
+
+        new_dim = (round(initial_w * scale_factor), round(initial_h * scale_factor))
+        interpolation = cv2.INTER_AREA if scale_factor < 1 else cv2.INTER_LANCZOS4
+        return cv2.resize(image, new_dim, interpolation=interpolation)
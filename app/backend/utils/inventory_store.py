@@ -0,0 +1,201 @@
+import json
+import sqlite3
+import logging
+import numpy as np
+from typing import Any, Dict, Iterable, List, Union
+
+from .contour_util import ContourUtil
+
+class InventoryStore:
+    """
+    Embedded SQLite storage of plates, routers and user preferences.
+    Database runs in WAL mode, so each change is a small append-only commit. Plate material, thickness and
+    dimensions are kept in indexed columns for queries, contour geometry is stored as packed float32 BLOBs,
+    and the remaining fields are kept as JSON in original key order.
+
+    ### Parameters:
+    - db_path: Path of database file, created if it does not exist.
+    """
+    logger = logging.getLogger(__name__)
+    if not logger.hasHandlers():
+        logger.setLevel(logging.DEBUG)
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+
+    PLATE_COLUMNS = {'material': 'material', 'thickness_(z)': 'thickness', 'width_(x)': 'width', 'height_(y)': 'height'}
+    GEOMETRY_KEYS = ('contours', 'contour_parents')
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS plates (
+            id INTEGER PRIMARY KEY,
+            material TEXT,
+            thickness REAL,
+            width REAL,
+            height REAL,
+            attributes TEXT NOT NULL,
+            contours BLOB,
+            contour_parents BLOB
+        );
+        CREATE INDEX IF NOT EXISTS plates_material_thickness ON plates (material, thickness);
+        CREATE INDEX IF NOT EXISTS plates_thickness ON plates (thickness);
+        CREATE INDEX IF NOT EXISTS plates_dimensions ON plates (width, height);
+        CREATE TABLE IF NOT EXISTS routers (
+            id INTEGER PRIMARY KEY,
+            attributes TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS preferences (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._connection = sqlite3.connect(db_path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL") # WAL stays consistent, only last commits may be lost on power loss
+        self._connection.executescript(self.SCHEMA)
+        self._connection.commit()
+
+    def is_empty(self) -> bool:
+        """
+        Checks if store holds no data at all, e.g. before migrating from CSV files.
+        """
+        return not any(self._connection.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() for table in ('plates', 'routers', 'preferences'))
+
+    def import_data(self, user_preferences: Dict[str, Any], router_data: Iterable[Dict[str, Any]], plate_data: Iterable[Dict[str, Any]]):
+        """
+        Writes all given data in a single transaction.
+        """
+        with self._connection:
+            for key, value in user_preferences.items():
+                self._connection.execute("INSERT OR REPLACE INTO preferences VALUES (?, ?)", (key, json.dumps(value)))
+            for router in router_data:
+                self._connection.execute("INSERT OR REPLACE INTO routers VALUES (?, ?)", self._get_router_row(router))
+            for plate in plate_data:
+                self._connection.execute("INSERT OR REPLACE INTO plates VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self._get_plate_row(plate))
+
+    # plate functions
+
+    def get_plate_ids(self) -> List[int]:
+        return [row[0] for row in self._connection.execute("SELECT id FROM plates ORDER BY id")]
+
+    def get_plate(self, id: int) -> Union[Dict[str, Any], None]:
+        """
+        Loads plate with given id, None if it does not exist. Contours are returned as float32 (N, 2) arrays.
+        """
+        row = self._connection.execute("SELECT attributes, contours, contour_parents FROM plates WHERE id = ?", (int(id),)).fetchone()
+        if row is None:
+            return None
+
+        attributes, contours, parents = row
+        plate = json.loads(attributes)
+        plate['contours'] = ContourUtil.unpack(contours) if contours is not None else None
+        plate['contour_parents'] = np.frombuffer(parents, dtype='<i4').tolist() if parents is not None else None
+        return plate
+
+    def upsert_plate(self, plate: Dict[str, Any]):
+        with self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO plates VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self._get_plate_row(plate))
+
+    def remove_plate(self, id: int):
+        with self._connection:
+            self._connection.execute("DELETE FROM plates WHERE id = ?", (int(id),))
+
+    def query_plates(self, material: str=None, thickness: float=None, min_width: float=None, min_height: float=None, allow_rotation: bool=True) -> List[int]:
+        """
+        Finds plates matching all given criteria using indexed columns.
+
+        Arguments:
+        - material: Exact plate material.
+        - thickness: Exact plate thickness.
+        - min_width: Minimum plate width.
+        - min_height: Minimum plate height.
+        - allow_rotation: Whether plates fitting minimum dimensions when rotated by 90 degrees match.
+
+        Returns:
+        - Ids of matching plates in ascending order.
+        """
+        conditions, params = [], []
+        if material is not None:
+            conditions.append("material = ?")
+            params.append(material)
+        if thickness is not None:
+            conditions.append("thickness = ?")
+            params.append(float(thickness))
+        if min_width is not None or min_height is not None:
+            w, h = float(min_width or 0), float(min_height or 0)
+            if allow_rotation:
+                conditions.append("((width >= ? AND height >= ?) OR (width >= ? AND height >= ?))")
+                params.extend([w, h, h, w])
+            else:
+                conditions.append("width >= ? AND height >= ?")
+                params.extend([w, h])
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return [row[0] for row in self._connection.execute(f"SELECT id FROM plates{where} ORDER BY id", params)]
+
+    # router functions
+
+    def get_router_ids(self) -> List[int]:
+        return [row[0] for row in self._connection.execute("SELECT id FROM routers ORDER BY id")]
+
+    def get_router(self, id: int) -> Union[Dict[str, Any], None]:
+        row = self._connection.execute("SELECT attributes FROM routers WHERE id = ?", (int(id),)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def upsert_router(self, router: Dict[str, Any]):
+        with self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO routers VALUES (?, ?)", self._get_router_row(router))
+
+    def remove_router(self, id: int):
+        with self._connection:
+            self._connection.execute("DELETE FROM routers WHERE id = ?", (int(id),))
+
+    # preference functions
+
+    def get_preferences(self) -> Dict[str, Any]:
+        return {key: json.loads(value) for key, value in self._connection.execute("SELECT key, value FROM preferences")}
+
+    def set_preference(self, key: str, value: Any):
+        with self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO preferences VALUES (?, ?)", (key, json.dumps(value)))
+
+    def close(self):
+        self._connection.close()
+
+    # row conversion functions
+
+    def _get_plate_row(self, plate: Dict[str, Any]) -> tuple:
+        """
+        Converts plate to row, geometry keys keep their position in attributes but hold no data.
+        """
+        plate = {**plate, 'id': int(plate['id'])} # csv ids are strings
+        attributes = {key: (None if key in self.GEOMETRY_KEYS else value) for key, value in plate.items()}
+        columns = [self._to_number(plate.get(key)) if column != 'material' else plate.get(key) for key, column in self.PLATE_COLUMNS.items()]
+
+        contours = plate.get('contours')
+        parents = plate.get('contour_parents')
+        contours_blob = ContourUtil.pack(ContourUtil.deserialize(contours)) if contours is not None else None
+        parents_blob = np.asarray(ContourUtil.deserialize_parents(parents), dtype='<i4').tobytes() if parents is not None else None
+
+        return (plate['id'], *columns, json.dumps(attributes, default=self._to_json), contours_blob, parents_blob)
+
+    def _get_router_row(self, router: Dict[str, Any]) -> tuple:
+        router = {**router, 'id': int(router['id'])}
+        return (router['id'], json.dumps(router, default=self._to_json))
+
+    @staticmethod
+    def _to_number(value: Any) -> Union[float, None]:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _to_json(value: Any) -> Any:
+        if isinstance(value, (np.ndarray, np.generic)):
+            return value.tolist()
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
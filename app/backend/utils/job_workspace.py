@@ -0,0 +1,121 @@
+import os
+import hashlib
+import logging
+import numpy as np
+from typing import Any, Dict, List
+
+from .file_processor import FileProcessor
+
+class JobWorkspace:
+    """
+    Persisted workspace of parts imported for current job, so they survive restarts without parsing their STL files again.
+    Each part keeps its outer contour, thickness, amount, preview image and size, mtime and hash of its source file.
+    On load, parts whose source file has the same size and mtime are restored as they are. Otherwise the source
+    file is hashed, and parts whose content changed or whose source file is gone are dropped with their previews.
+
+    ### Parameters:
+    - folder: Folder holding workspace file and part preview images, created if it does not exist.
+    """
+    logger = logging.getLogger(__name__)
+    if not logger.hasHandlers():
+        logger.setLevel(logging.DEBUG)
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+
+    WORKSPACE_FILE = 'workspace.json'
+    PREVIEW_EXTENSION = '.png'
+    HASH_CHUNK_SIZE = 2**20
+
+    def __init__(self, folder: str):
+        os.makedirs(folder, exist_ok=True)
+        self.folder = folder
+        self.path = os.path.join(folder, self.WORKSPACE_FILE)
+
+    def load(self) -> List[Dict[str, Any]]:
+        """
+        Restores parts whose source files are unchanged.
+
+        Returns:
+        - Imported parts, outer contours as numpy arrays.
+        """
+        if not os.path.exists(self.path):
+            return []
+
+        workspace = FileProcessor.read_file(self.path) or {}
+        parts = []
+        for part in workspace.get('parts', []):
+            try:
+                valid = self._is_source_unchanged(part)
+            except Exception as e:
+                self.logger.error(f"Error validating source of part {part.get('filename')}: {e}")
+                valid = False
+
+            if valid:
+                part['outer_contour'] = np.array(part['outer_contour'])
+                parts.append(part)
+                continue
+
+            self.logger.warning(f"Source file of part {part.get('filename')} changed or is missing, part has to be imported again.")
+            preview_path = part.get('preview_path')
+            if preview_path and os.path.exists(preview_path):
+                os.remove(preview_path)
+
+        self.logger.debug(f"Restored {len(parts)} imported parts.")
+        return parts
+
+    def save(self, parts: List[Dict[str, Any]]):
+        """
+        Saves parts to workspace file and removes previews no longer belonging to any part.
+        """
+        FileProcessor.write_file(self.path, {'parts': [self._to_json(part) for part in parts]}, 'json', fsync=True)
+
+        previews = {os.path.abspath(part['preview_path']) for part in parts if part.get('preview_path')}
+        for filename in os.listdir(self.folder):
+            path = os.path.abspath(os.path.join(self.folder, filename))
+            if filename.endswith(self.PREVIEW_EXTENSION) and path not in previews:
+                os.remove(path)
+
+    @staticmethod
+    def get_source_info(source_path: str) -> Dict[str, Any]:
+        """
+        Gets path, size, mtime and content hash of part source file, used to validate part on later loads.
+        """
+        stat = os.stat(source_path)
+        return {
+            'source_path': os.path.abspath(source_path),
+            'source_size': stat.st_size,
+            'source_mtime_ns': stat.st_mtime_ns,
+            'source_hash': JobWorkspace._hash_file(source_path)
+        }
+
+    def _is_source_unchanged(self, part: Dict[str, Any]) -> bool:
+        """
+        Checks part source file by size and mtime, falling back to its hash if those changed, e.g. after a copy.
+        Stored size and mtime are updated when the hash still matches.
+        """
+        source_path = part.get('source_path')
+        if not source_path or not os.path.exists(source_path):
+            return False
+
+        stat = os.stat(source_path)
+        if (stat.st_size, stat.st_mtime_ns) == (part.get('source_size'), part.get('source_mtime_ns')):
+            return True
+        if stat.st_size != part.get('source_size') or self._hash_file(source_path) != part.get('source_hash'):
+            return False
+
+        part['source_mtime_ns'] = stat.st_mtime_ns
+        return True
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        file_hash = hashlib.sha1()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(JobWorkspace.HASH_CHUNK_SIZE), b''):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
+    @staticmethod
+    def _to_json(part: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: (value.tolist() if isinstance(value, (np.ndarray, np.generic)) else value) for key, value in part.items()}
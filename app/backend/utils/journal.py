@@ -0,0 +1,193 @@
+import os
+import json
+import time
+import logging
+import threading
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .records import Record
+
+class Journal:
+    """
+    Append-only journal of data mutations stored as JSON lines.
+    Every entry is flushed to the operating system when appended, and fsynced at most once per sync interval,
+    so bursts of edits share a single disk sync. A partially written last line, left by a crash, is dropped on replay.
+
+    ### Parameters:
+    - path: Path of journal file, created if it does not exist.
+    - sync_interval: Maximum time in seconds an appended entry waits for fsync, 0 syncs every entry.
+
+    ### Attributes:
+    - entry_count: Number of entries in journal file.
+
+    ### Raises:
+    - ValueError for negative sync interval.
+    """
+    logger = logging.getLogger(__name__)
+    if not logger.hasHandlers():
+        logger.setLevel(logging.DEBUG)
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+
+    ROTATED_SUFFIX = '.old'
+
+    def __init__(self, path: str, sync_interval: float = 1.0):
+
+        if sync_interval < 0:
+            raise ValueError("Sync interval must not be negative")
+
+        self.path = path
+        self.rotated_path = path + self.ROTATED_SUFFIX
+        self.sync_interval = sync_interval
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._last_sync = time.monotonic()
+        self._sync_timer: threading.Timer = None
+        self._unsynced = False
+
+        self.entry_count = 0
+
+    def replay(self) -> List[Dict[str, Any]]:
+        """
+        Reads entries of rotated journal, if a compaction was interrupted, followed by entries of current journal,
+        then opens journal for appending.
+
+        Returns:
+        - Entries in order they were appended.
+        """
+        entries = []
+        if os.path.exists(self.rotated_path):
+            entries.extend(self._read(self.rotated_path))
+
+        current = self._read(self.path)
+        entries.extend(current)
+
+        with self._lock:
+            self._file = open(self.path, 'a', encoding='utf-8')
+            self.entry_count = len(current)
+
+        return entries
+
+    def append(self, entry: Dict[str, Any]):
+        """
+        Appends entry to journal, syncing to disk if sync interval has passed since last sync.
+        """
+        line = json.dumps(entry, default=self._to_json) + '\n'
+
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(line)
+            self._file.flush()
+            self.entry_count += 1
+            self._unsynced = True
+
+            remaining = self.sync_interval - (time.monotonic() - self._last_sync)
+            if remaining <= 0:
+                self._sync()
+            elif self._sync_timer is None:
+                self._sync_timer = threading.Timer(remaining, self.sync)
+                self._sync_timer.daemon = True
+                self._sync_timer.start()
+
+    def sync(self):
+        """
+        Forces pending entries to disk.
+        """
+        with self._lock:
+            self._sync()
+
+    def rotate(self) -> bool:
+        """
+        Moves current journal aside and starts an empty one. Entries of rotated journal are covered once
+        a snapshot taken right after rotating is saved, after which remove_rotated() discards them.
+
+        Returns:
+        - False if a previous rotated journal still exists, in which case nothing is done.
+        """
+        with self._lock:
+            if os.path.exists(self.rotated_path):
+                return False
+
+            self._sync()
+            if self._file is not None:
+                self._file.close()
+            if os.path.exists(self.path):
+                os.replace(self.path, self.rotated_path)
+
+            self._file = open(self.path, 'a', encoding='utf-8')
+            self.entry_count = 0
+            return True
+
+    def remove_rotated(self):
+        """
+        Removes rotated journal once its entries are saved in a snapshot.
+        """
+        if os.path.exists(self.rotated_path):
+            os.remove(self.rotated_path)
+
+    def close(self):
+        """
+        Syncs and closes journal file.
+        """
+        with self._lock:
+            self._sync()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _sync(self):
+        """
+        Syncs journal file, caller must hold lock.
+        """
+        if self._sync_timer is not None:
+            self._sync_timer.cancel()
+            self._sync_timer = None
+
+        if self._file is not None and self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = False
+        self._last_sync = time.monotonic()
+
+    def _read(self, path: str) -> List[Dict[str, Any]]:
+        """
+        Reads entries from journal file, truncating a partially written last line.
+        """
+        if not os.path.exists(path):
+            return []
+
+        with open(path, 'rb') as file:
+            content = file.read()
+
+        complete_length = content.rfind(b'\n') + 1
+        if complete_length < len(content):
+            self.logger.warning(f"Dropping incomplete last entry of journal {path}")
+            with open(path, 'r+b') as file:
+                file.truncate(complete_length)
+
+        entries = []
+        for line_number, line in enumerate(content[:complete_length].splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                self.logger.error(f"Skipping corrupted entry on line {line_number} of journal {path}")
+        return entries
+
+    @staticmethod
+    def _to_json(value: Any) -> Any:
+        """
+        Converts records and numpy values found in them to JSON types.
+        """
+        if isinstance(value, Record):
+            return value.to_dict()
+        if isinstance(value, (np.ndarray, np.generic)):
+            return value.tolist()
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,190 @@
+import os
+import gc
+import sys
+import functools
+import logging
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Union
+
+class MemoryDiagnostics:
+    """
+    Functional class for opt-in memory diagnostics. Disabled unless enable() is called, in which case
+    tracemalloc snapshots and OS-level RSS are recorded around tracked stages, and growth surviving
+    between marked checkpoints (e.g. opening and closing a window) is reported with its top allocation sites.
+    """
+    logger = logging.getLogger(__name__)
+    if not logger.hasHandlers():
+        logger.setLevel(logging.DEBUG)
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+
+    TRACEBACK_FRAMES = 10
+    TOP_SITES = 10
+
+    enabled = False
+    records: List[Dict[str, Any]] = []
+    _checkpoints: Dict[str, tuple] = {}
+
+    @staticmethod
+    def enable(frames: int = TRACEBACK_FRAMES):
+        """
+        Starts tracing allocations.
+
+        Arguments:
+        - frames: Number of frames stored per allocation traceback.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        MemoryDiagnostics.enabled = True
+        MemoryDiagnostics.logger.info("Memory diagnostics enabled.")
+
+    @staticmethod
+    def disable():
+        MemoryDiagnostics.enabled = False
+        MemoryDiagnostics._checkpoints.clear()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @staticmethod
+    @contextmanager
+    def stage(name: str):
+        """
+        Context manager recording RSS, traced memory growth, traced peak and top allocation sites of enclosed code.
+        Does nothing when diagnostics are disabled.
+        """
+        if not MemoryDiagnostics.enabled:
+            yield
+            return
+
+        rss_before = MemoryDiagnostics.get_rss()
+        snapshot_before = MemoryDiagnostics._take_snapshot()
+        tracemalloc.reset_peak()
+        traced_before, _ = tracemalloc.get_traced_memory()
+
+        try:
+            yield
+        finally:
+            traced_after, peak = tracemalloc.get_traced_memory()
+            snapshot_after = MemoryDiagnostics._take_snapshot()
+            record = {
+                "kind": "stage",
+                "name": name,
+                "rss_before": rss_before,
+                "rss_after": MemoryDiagnostics.get_rss(),
+                "traced_growth": traced_after - traced_before,
+                "traced_peak": peak - traced_before,
+                "top_sites": MemoryDiagnostics._top_sites(snapshot_after, snapshot_before)
+            }
+            MemoryDiagnostics.records.append(record)
+            MemoryDiagnostics.logger.debug(MemoryDiagnostics._format_record(record))
+
+    @staticmethod
+    def track(name: str) -> Callable:
+        """
+        Decorator recording function calls as stages under given name.
+        """
+        def decorator(function: Callable) -> Callable:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not MemoryDiagnostics.enabled:
+                    return function(*args, **kwargs)
+                with MemoryDiagnostics.stage(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def checkpoint_start(key: str):
+        """
+        Marks start of a span, e.g. a window being opened, whose surviving growth is reported by checkpoint_end.
+        """
+        if not MemoryDiagnostics.enabled:
+            return
+        gc.collect()
+        MemoryDiagnostics._checkpoints[key] = (MemoryDiagnostics._take_snapshot(), MemoryDiagnostics.get_rss())
+
+    @staticmethod
+    def checkpoint_end(key: str):
+        """
+        Records memory that survived since matching checkpoint_start, after garbage collection.
+        """
+        if not MemoryDiagnostics.enabled or key not in MemoryDiagnostics._checkpoints:
+            return
+        snapshot_before, rss_before = MemoryDiagnostics._checkpoints.pop(key)
+        gc.collect()
+        snapshot_after = MemoryDiagnostics._take_snapshot()
+
+        growth = sum(stat.size_diff for stat in snapshot_after.compare_to(snapshot_before, 'filename'))
+        record = {
+            "kind": "checkpoint",
+            "name": key,
+            "rss_before": rss_before,
+            "rss_after": MemoryDiagnostics.get_rss(),
+            "traced_growth": growth,
+            "traced_peak": None,
+            "top_sites": MemoryDiagnostics._top_sites(snapshot_after, snapshot_before)
+        }
+        MemoryDiagnostics.records.append(record)
+        MemoryDiagnostics.logger.info(MemoryDiagnostics._format_record(record))
+
+    @staticmethod
+    def get_report() -> str:
+        """
+        Returns all records formatted as text.
+        """
+        return '\n\n'.join(MemoryDiagnostics._format_record(record) for record in MemoryDiagnostics.records)
+
+    @staticmethod
+    def save_report(path: str):
+        """
+        Writes report to given path if diagnostics are enabled and something was recorded.
+        """
+        if not MemoryDiagnostics.enabled or not MemoryDiagnostics.records:
+            return
+        with open(path, 'w') as file:
+            file.write(MemoryDiagnostics.get_report())
+        MemoryDiagnostics.logger.info(f"Memory report saved to {path}")
+
+    @staticmethod
+    def get_rss() -> Union[int, None]:
+        """
+        Gets resident set size of current process in bytes. Falls back to peak RSS where current RSS is unavailable.
+        Returns None if neither can be determined.
+        """
+        try:
+            with open('/proc/self/statm', 'r') as file:
+                return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, AttributeError):
+            pass
+        try:
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak if sys.platform == 'darwin' else peak * 1024
+        except ImportError:
+            return None
+
+    @staticmethod
+    def _take_snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__)
+        ))
+
+    @staticmethod
+    def _top_sites(snapshot_after: tracemalloc.Snapshot, snapshot_before: tracemalloc.Snapshot) -> List[str]:
+        stats = snapshot_after.compare_to(snapshot_before, 'lineno')
+        stats = sorted((stat for stat in stats if stat.size_diff > 0), key=lambda stat: stat.size_diff, reverse=True)
+        return [str(stat) for stat in stats[:MemoryDiagnostics.TOP_SITES]]
+
+    @staticmethod
+    def _format_record(record: Dict[str, Any]) -> str:
+        def mb(value: Union[int, None]) -> str:
+            return f"{value / 2**20:.1f} MB" if value is not None else "n/a"
+
+        lines = [f"[{record['kind']}] {record['name']}: rss {mb(record['rss_before'])} -> {mb(record['rss_after'])}, "
+                 f"traced growth {mb(record['traced_growth'])}, traced peak {mb(record['traced_peak'])}"]
+        lines.extend(f"    {site}" for site in record['top_sites'])
+        return '\n'.join(lines)
@@ -0,0 +1,139 @@
+import bisect
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from .plate_util import PlateUtil
+
+class PlateIndex:
+    """
+    Index answering which plates of a material and thickness can host a part of given bounding box.
+    Plates are grouped by (material, thickness), each group is built on first query from plates given by the loader.
+    Every plate contributes the staircase of its maximal usable rectangles, kept sorted by width within the group,
+    so a query is a binary search on width followed by a descent of a max tree over rectangle heights, which skips
+    every run of rectangles too low for the part without visiting them.
+
+    ### Parameters:
+    - loader: Function returning plates of given material and thickness.
+    """
+    logger = logging.getLogger(__name__)
+    if not logger.hasHandlers():
+        logger.setLevel(logging.DEBUG)
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+
+    def __init__(self, loader: Callable[[str, float], Iterable[Dict[str, Any]]]):
+        self._loader = loader
+        self._groups: Dict[tuple, List[Tuple[float, float, int]]] = {} # key -> (width, height, id) sorted by width
+        self._widths: Dict[tuple, List[float]] = {} # key -> widths of group entries, for bisecting
+        self._heights: Dict[tuple, List[float]] = {} # key -> max tree of entry heights, leaves padded to a power of two
+        self._plates: Dict[int, tuple] = {} # id -> key of group holding its rectangles
+
+    def find(self, material: str, thickness: float, width: float, height: float, allow_rotation: bool = True) -> List[int]:
+        """
+        Finds plates with a usable rectangle fitting given part bounding box.
+
+        Arguments:
+        - material: Plate material.
+        - thickness: Plate thickness.
+        - width: Part width in millimeters.
+        - height: Part height in millimeters.
+        - allow_rotation: Whether part may be rotated by 90 degrees.
+
+        Returns:
+        - Ids of fitting plates in ascending order.
+        """
+        key = self._get_key(material, thickness)
+        if key not in self._groups:
+            self._build_group(key, material, thickness)
+
+        entries, widths = self._groups[key], self._widths[key]
+        orientations = {(float(width), float(height))}
+        if allow_rotation:
+            orientations.add((float(height), float(width)))
+
+        ids = set()
+        for part_w, part_h in orientations:
+            start = bisect.bisect_left(widths, part_w)
+            ids.update(entries[i][2] for i in self._get_taller(key, start, part_h))
+        return sorted(ids)
+
+    def _get_taller(self, key: tuple, start: int, height: float) -> Iterable[int]:
+        """
+        Yields indices of group entries from start on at least given height, descending only into subtrees whose
+        maximum height suffices, so entries too low are skipped a subtree at a time.
+        """
+        tree = self._heights[key]
+        size = len(tree) // 2
+        stack = [(1, 0, size)] # node, first and past last leaf covered
+        while stack:
+            node, low, high = stack.pop()
+            if high <= start or tree[node] < height:
+                continue
+            if node >= size:
+                yield node - size
+                continue
+            middle = (low + high) // 2
+            stack.append((2 * node + 1, middle, high))
+            stack.append((2 * node, low, middle))
+
+    def update(self, plate: Dict[str, Any]):
+        """
+        Recomputes usable rectangles of changed plate. Plates of groups not built yet are only removed from their old group.
+        """
+        self.remove(plate['id'])
+        try:
+            key = self._get_key(plate.get('material'), plate.get('thickness_(z)'))
+        except (TypeError, ValueError): # incomplete plate, cannot be in any group
+            return
+        if key in self._groups:
+            self._insert(key, plate)
+            self._build_heights(key)
+
+    def remove(self, id: int):
+        key = self._plates.pop(int(id), None)
+        if key is None:
+            return
+        kept = [entry for entry in self._groups[key] if entry[2] != int(id)]
+        self._groups[key] = kept
+        self._widths[key] = [entry[0] for entry in kept]
+        self._build_heights(key)
+
+    def _build_group(self, key: tuple, material: str, thickness: float):
+        self._groups[key], self._widths[key] = [], []
+        for plate in self._loader(material, thickness):
+            self._insert(key, plate)
+        self._build_heights(key)
+        self.logger.debug(f"Indexed {len(self._groups[key])} usable rectangles of {material} plates, {thickness} mm thick.")
+
+    def _insert(self, key: tuple, plate: Dict[str, Any]):
+        id = int(plate['id'])
+        try:
+            rectangles = PlateUtil.get_usable_rectangles(plate)
+        except Exception as e:
+            self.logger.error(f"Error finding usable rectangles of plate {id}: {e}")
+            return
+
+        entries, widths = self._groups[key], self._widths[key]
+        for width, height in rectangles:
+            i = bisect.bisect_right(widths, width)
+            entries.insert(i, (width, height, id))
+            widths.insert(i, width)
+        self._plates[id] = key
+
+    def _build_heights(self, key: tuple):
+        """
+        Rebuilds max tree of group entry heights, each node holding the maximum height of the entries below it.
+        """
+        entries = self._groups[key]
+        size = 1 << max(len(entries) - 1, 0).bit_length()
+        tree = [float('-inf')] * (2 * size)
+        tree[size:size + len(entries)] = [entry[1] for entry in entries]
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        self._heights[key] = tree
+
+    @staticmethod
+    def _get_key(material: str, thickness: Any) -> tuple:
+        return (material, float(thickness))
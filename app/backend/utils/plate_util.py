@@ -1,8 +1,12 @@
 import os
 import numpy as np
+import cv2
 import matplotlib.pyplot as plt
 from typing import List, Dict, Tuple, Any
 
+from .contour_util import ContourUtil
+from .records import PlateRecord, RecordCollection
+
 from ...config import PLATE_PREVIEW_DATA_PATH, PROCESSING_SCALE_FACTOR
 
 class PlateUtil:
@@ -17,6 +21,8 @@ class PlateUtil:
     DEFAULT_Z = 10
     DEFAULT_MATERIAL = "Aluminum"
 
+    USABLE_GRID_CELLS = 200 # maximum grid size along longer plate side when searching usable rectangles
+
     PLOT_BG_COLOR = '#ffffff' 
     PLOT_TEXT_COLOR = '#000000'
     PLOT_LINE_COLOR = '#000000'
@@ -46,7 +52,7 @@ class PlateUtil:
         }
     
     @staticmethod
-    def get_new_plate(plate_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def get_new_plate(plate_data: List[Dict[str, Any]]) -> PlateRecord:
         """
         Returns a new plate based on existing plates.
 
@@ -54,20 +60,22 @@ class PlateUtil:
         - plate_data: List of existing plates, necessary for getting next plate's index.
 
         Returns:
-        - New plate as a dictionary.
+        - New plate record.
         """
         id = PlateUtil._get_next_plate_id(plate_data)
         preview_path = PlateUtil.get_preview_path(id)
 
-        return {
+        return PlateRecord.from_dict({
             "id": id,
             "preview_path": preview_path,
             "width_(x)": PlateUtil.DEFAULT_X,
             "height_(y)": PlateUtil.DEFAULT_Y,
             "thickness_(z)": PlateUtil.DEFAULT_Z,
             "material": PlateUtil.DEFAULT_MATERIAL,
-            "contours": None
-        }
+            "contours": None,
+            "contour_parents": None,
+            "processing_profile": None
+        })
     
     @staticmethod
     def _get_next_plate_id(plate_data: List[Dict[str, Any]]) -> int: 
@@ -80,6 +88,8 @@ class PlateUtil:
         Returns:
         - Next available index.
         """
+        if isinstance(plate_data, RecordCollection):
+            return plate_data.next_id()
         plate_ids = [plate.get('id') for plate in plate_data]
         return max(plate_ids) + 1 if plate_ids else 0
  
@@ -97,11 +107,136 @@ class PlateUtil:
         preview_path = os.path.join(PLATE_PREVIEW_DATA_PATH, str(id)+'.png')
         return preview_path
 
-    # receives upscaled (processing resolution) contours, converts down
+    @staticmethod
+    def match_plates(measured_sizes: List[Tuple[float, float]], plate_data: List[Dict[str, Any]], tolerance: float = 10) -> List[Any]:
+        """
+        Matches measured plate dimensions to inventory plates, each inventory plate being matched at most once.
+        Pairs are assigned greedily starting from the smallest dimension error, plates may be rotated by 90 degrees.
+
+        Arguments:
+        - measured_sizes: Measured (width, height) of each plate in millimeters.
+        - plate_data: Inventory plates.
+        - tolerance: Maximum allowed difference per dimension in millimeters.
+
+        Returns:
+        - Id of matched inventory plate for each measured plate, None if no plate is within tolerance.
+        """
+        candidates = []
+        for i, (width, height) in enumerate(measured_sizes):
+            for j, plate in enumerate(plate_data):
+                plate_w, plate_h = float(plate['width_(x)']), float(plate['height_(y)'])
+                error = min(max(abs(width - plate_w), abs(height - plate_h)), max(abs(width - plate_h), abs(height - plate_w)))
+                if error <= tolerance:
+                    candidates.append((error, i, j))
+
+        matches = [None] * len(measured_sizes)
+        used = set()
+        for _, i, j in sorted(candidates):
+            if matches[i] is None and j not in used:
+                matches[i] = plate_data[j]['id']
+                used.add(j)
+
+        return matches
+
+    @staticmethod
+    def subtract_parts(plate_data: Dict[str, Any], parts: List[np.ndarray], tool_diameter: float, tolerance: float = 0.5):
+        """
+        Removes placed parts from plate's usable region, updating its contours and preview image.
+        Region is rasterized at PROCESSING_SCALE_FACTOR px/mm, parts are expanded by the tool diameter to account for the cut.
+        Plates without contours are treated as full rectangles.
+
+        Arguments:
+        - plate_data: Data for plate to be updated in dict format.
+        - parts: Part outlines in plate coordinates as (N, 2) arrays in millimeters.
+        - tool_diameter: Diameter of cutting tool in millimeters.
+        - tolerance: Maximum deviation of simplified remnant contours in millimeters.
+        """
+        mask = PlateUtil._get_usable_mask(plate_data)
+        scale = PROCESSING_SCALE_FACTOR
+
+        part_polygons = [np.round(np.asarray(part, dtype=np.float64).reshape(-1, 2) * scale).astype(np.int32) for part in parts]
+        cv2.fillPoly(mask, part_polygons, 0)
+
+        thickness = 2 * int(round(tool_diameter * scale)) + 1 # thick lines have round caps, giving an offset by tool diameter
+        if tool_diameter > 0:
+            cv2.polylines(mask, part_polygons, True, 0, thickness=thickness)
+
+        contours, hierarchy = cv2.findContours(mask, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+        contours, parents = ContourUtil.finalize(contours, hierarchy, scale, tolerance)
+
+        plate_data['contours'] = ContourUtil.serialize(contours)
+        plate_data['contour_parents'] = parents
+        PlateUtil.save_preview_image(plate_data)
+
+    @staticmethod
+    def get_usable_rectangles(plate_data: Dict[str, Any]) -> List[Tuple[float, float]]:
+        """
+        Finds sizes of maximal axis-aligned rectangles inscribed in plate's usable region, i.e. for each usable width
+        the tallest rectangle of that width. Region is rasterized on a grid of at most USABLE_GRID_CELLS cells per side
+        and eroded by one cell, so sizes are slightly conservative. Plates without contours are a single full rectangle.
+
+        Arguments:
+        - plate_data: Plate in dict format.
+
+        Returns:
+        - (width, height) staircase in millimeters, sorted by ascending width and descending height. Empty if nothing is usable.
+        """
+        width, height = float(plate_data['width_(x)']), float(plate_data['height_(y)'])
+        if not ContourUtil.deserialize(plate_data.get('contours')):
+            return [(width, height)] if width > 0 and height > 0 else []
+
+        scale = min(PROCESSING_SCALE_FACTOR, PlateUtil.USABLE_GRID_CELLS / max(width, height))
+        mask = cv2.erode(PlateUtil._get_usable_mask(plate_data, scale), np.ones((3, 3), np.uint8)) # image border is not eroded
+
+        tallest = {} # width in cells -> tallest height in cells
+        column_heights = np.zeros(mask.shape[1], dtype=np.int64)
+        for row in mask:
+            column_heights = np.where(row > 0, column_heights + 1, 0)
+            stack = [] # (start column, height) with increasing heights
+            for i, h in enumerate(column_heights.tolist() + [0]):
+                start = i
+                while stack and stack[-1][1] >= h:
+                    start, top = stack.pop()
+                    if top > tallest.get(i - start, 0):
+                        tallest[i - start] = top
+                if h > 0:
+                    stack.append((start, h))
+
+        staircase, best = [], 0
+        for w in sorted(tallest, reverse=True):
+            if tallest[w] > best:
+                best = tallest[w]
+                staircase.append((min(w / scale, width), min(best / scale, height)))
+        return staircase[::-1]
+
+    @staticmethod
+    def _get_usable_mask(plate_data: Dict[str, Any], scale: float = PROCESSING_SCALE_FACTOR) -> np.ndarray:
+        """
+        Rasterizes plate's usable region, filling contours at even depth and clearing holes at odd depth.
+        """
+        width, height = float(plate_data['width_(x)']), float(plate_data['height_(y)'])
+        mask = np.zeros((int(np.ceil(height * scale)), int(np.ceil(width * scale))), dtype=np.uint8)
+
+        contours = ContourUtil.deserialize(plate_data.get('contours'))
+        if not contours:
+            mask[:] = 255
+            return mask
+
+        parents = ContourUtil.deserialize_parents(plate_data.get('contour_parents'))
+        if len(parents) != len(contours):
+            parents = [-1] * len(contours)
+
+        depths = ContourUtil.get_depths(parents)
+        for i in sorted(range(len(contours)), key=lambda i: depths[i]):
+            polygon = np.round(contours[i] * scale).astype(np.int32)
+            cv2.fillPoly(mask, [polygon], 255 if depths[i] % 2 == 0 else 0)
+
+        return mask
+
     @staticmethod
     def save_preview_image(plate_data: Dict[str, Any], figsize: tuple = (4, 4), dpi: int = 80):
         """
-        Saves preview image for a plate using matplotlib.
+        Saves preview image for a plate using matplotlib. Contours are expected in millimeters.
 
         Arguments:
         - plate_data: Data for plate to be saved in dict format.
@@ -110,7 +245,7 @@ class PlateUtil:
         """
         try:
             image_path = plate_data.get('preview_path')
-            image_contours = plate_data.get("contours")
+            image_contours = ContourUtil.deserialize(plate_data.get("contours"))
             plate_xy = (plate_data.get("width_(x)"), plate_data.get("height_(y)"))
             plate_rect_x, plate_rect_y = PlateUtil._generate_rectangle_coordinates(*plate_xy)
 
@@ -121,12 +256,9 @@ class PlateUtil:
         
         plt.plot(plate_rect_x, plate_rect_y, color = PlateUtil.PLOT_LINE_COLOR)
 
-        if image_contours is not None:
-            for contour in image_contours:
-                contour_array = np.array(contour)
-                x_coords = contour_array[:, 0, 0] / PROCESSING_SCALE_FACTOR
-                y_coords = contour_array[:, 0, 1] / PROCESSING_SCALE_FACTOR
-                plt.plot(x_coords, y_coords, color=PlateUtil.PLOT_LINE_COLOR, linewidth=1)
+        for contour in image_contours:
+            contour_array = np.vstack((contour, contour[:1])) # close contour
+            plt.plot(contour_array[:, 0], contour_array[:, 1], color=PlateUtil.PLOT_LINE_COLOR, linewidth=1)
 
         plt.grid(True)
         plt.gca().set_facecolor(PlateUtil.PLOT_BG_COLOR)
@@ -141,6 +273,7 @@ class PlateUtil:
         plt.gca().spines['right'].set_color(PlateUtil.PLOT_TEXT_COLOR)
 
         plt.savefig(image_path, bbox_inches='tight', facecolor='#FFFFFF', dpi=dpi)
+        plt.close()
 
     @staticmethod
     def _generate_rectangle_coordinates(width: float, height: float, offset_x: float = 0, offset_y: float = 0) -> Tuple[List[float], List[float]]:
@@ -0,0 +1,296 @@
+import numpy as np
+from collections.abc import MutableSequence
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Union
+
+from .contour_util import ContourUtil
+
+class Record:
+    """
+    Base of slotted plate and router records. Fields are attributes, but records also support dict-style access by
+    their storage keys (e.g. record['width_(x)']), so they can be used wherever plate and router dicts were used.
+    Keys not known to the record class are kept in `extra`.
+    """
+    FIELDS: Dict[str, str] = {} # storage key -> attribute
+    NUMERIC_KEYS: tuple = ()
+
+    __slots__ = ('extra',)
+
+    def __init__(self, **values: Any):
+        for key, attribute in self.FIELDS.items():
+            setattr(self, attribute, self._convert(key, values.pop(key, None)))
+        self.extra: Dict[str, Any] = values or None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Record':
+        """
+        Creates record from dict, e.g. a csv row, converting id and numeric fields stored as strings.
+        """
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self[key] for key in self.keys()}
+
+    def copy(self) -> 'Record':
+        """
+        Creates shallow copy of record, values are shared but stored as is, so lazily converted fields stay unconverted.
+        """
+        record = type(self).__new__(type(self))
+        for cls in type(self).__mro__:
+            for attribute in getattr(cls, '__slots__', ()):
+                setattr(record, attribute, getattr(self, attribute))
+        record.extra = dict(self.extra) if self.extra is not None else None
+        return record
+
+    @classmethod
+    def _convert(cls, key: str, value: Any) -> Any:
+        if key == 'id' and value is not None:
+            return int(value)
+        if key in cls.NUMERIC_KEYS and isinstance(value, str):
+            try:
+                return int(value) if value.lstrip('-').isdigit() else float(value)
+            except ValueError:
+                return value
+        return value
+
+    # dict-style access
+
+    def __getitem__(self, key: str) -> Any:
+        attribute = self.FIELDS.get(key)
+        if attribute is not None:
+            return getattr(self, attribute)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        attribute = self.FIELDS.get(key)
+        if attribute is not None:
+            setattr(self, attribute, self._convert(key, value))
+            return
+        if self.extra is None:
+            self.extra = {}
+        self.extra[key] = value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def update(self, values: Dict[str, Any]):
+        for key, value in values.items():
+            self[key] = value
+
+    def keys(self) -> List[str]:
+        return list(self.FIELDS) + (list(self.extra) if self.extra else [])
+
+    def items(self) -> List[tuple]:
+        return [(key, self[key]) for key in self.keys()]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.FIELDS or (self.extra is not None and key in self.extra)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS) + (len(self.extra) if self.extra else 0)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (Record, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()})"
+
+class PlateRecord(Record):
+    """
+    Plate in inventory. Contours are float32 arrays in millimeters, converted from stored form on first access.
+    Contours stored in sidecar files are left there and loaded through ContourUtil's cache whenever accessed.
+    """
+    FIELDS = {
+        "id": "id",
+        "preview_path": "preview_path",
+        "width_(x)": "width",
+        "height_(y)": "height",
+        "thickness_(z)": "thickness",
+        "material": "material",
+        "contours": "contours",
+        "contour_parents": "contour_parents",
+        "processing_profile": "processing_profile"
+    }
+    NUMERIC_KEYS = ("width_(x)", "height_(y)", "thickness_(z)")
+
+    __slots__ = ('id', 'preview_path', 'width', 'height', 'thickness', 'material', '_contours', '_contour_parents', 'processing_profile')
+
+    @property
+    def contours(self) -> Union[List[np.ndarray], None]:
+        value = self._contours
+        if value is None or ContourUtil.is_sidecar(value):
+            return ContourUtil.deserialize(value) if value is not None else None
+        if isinstance(value, str) or not all(isinstance(contour, np.ndarray) for contour in value):
+            value = self._contours = ContourUtil.deserialize(value)
+        return value
+
+    @contours.setter
+    def contours(self, value: Union[List[np.ndarray], List[list], str, None]):
+        self._contours = value if value != '' else None
+
+    @property
+    def contour_parents(self) -> Union[List[int], None]:
+        if isinstance(self._contour_parents, str):
+            self._contour_parents = ContourUtil.deserialize_parents(self._contour_parents)
+        return self._contour_parents
+
+    @contour_parents.setter
+    def contour_parents(self, value: Union[List[int], str, None]):
+        self._contour_parents = value if value != '' else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts record to dict for storage, contours become nested lists unless they are stored in a sidecar.
+        """
+        data = super().to_dict()
+        if ContourUtil.is_sidecar(self._contours):
+            data['contours'] = self._contours
+        elif self._contours is not None:
+            data['contours'] = ContourUtil.serialize(self.contours)
+        return data
+
+class RouterRecord(Record):
+    """
+    CNC router configuration.
+    """
+    FIELDS = {
+        "id": "id",
+        "preview_path": "preview_path",
+        "name": "name",
+        "machineable_area_(x-axis)": "area_x",
+        "machineable_area_(y-axis)": "area_y",
+        "machineable_area_(z-axis)": "area_z",
+        "max_plate_size_(x-axis)": "max_plate_x",
+        "max_plate_size_(y-axis)": "max_plate_y",
+        "max_plate_size_(z-axis)": "max_plate_z",
+        "min_safe_distance_from_edge": "min_safe_distance",
+        "drill_bit_diameter": "drill_bit_diameter",
+        "mill_bit_diameter": "mill_bit_diameter"
+    }
+    NUMERIC_KEYS = tuple(list(FIELDS)[3:])
+
+    __slots__ = tuple(FIELDS.values())
+
+class RecordCollection(MutableSequence):
+    """
+    Ordered list of records with an id to index map and a running maximum id.
+    Lookup by id, appending and next id are O(1). Deleting or inserting shifts the indices of following records.
+
+    ### Parameters:
+    - records: Initial records.
+
+    ### Raises:
+    - ValueError when adding a record whose id is already in collection.
+    """
+    def __init__(self, records: Iterable[Record] = ()):
+        self._ids: List[int] = []
+        self._index: Dict[int, int] = {}
+        self._records: Dict[int, Record] = {}
+        self._max_id = -1
+
+        for record in records:
+            self.append(record)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Record, List[Record]]:
+        if isinstance(index, slice):
+            return [self._get(id) for id in self._ids[index]]
+        return self._get(self._ids[index])
+
+    def __setitem__(self, index: int, record: Record):
+        old_id, id = self._ids[index], int(record['id'])
+        if id != old_id and id in self._index:
+            raise ValueError(f"Record with id {id} already exists")
+
+        self._records.pop(old_id, None)
+        del self._index[old_id]
+        self._ids[index] = id
+        self._index[id] = index % len(self._ids)
+        self._records[id] = record
+        self._max_id = max(self._max_id, id)
+
+    def __delitem__(self, index: int):
+        index = index % len(self._ids) if index < 0 else index
+        id = self._ids.pop(index)
+        self._records.pop(id, None)
+        del self._index[id]
+        self._reindex(index)
+
+    def insert(self, index: int, record: Record):
+        id = int(record['id'])
+        if id in self._index:
+            raise ValueError(f"Record with id {id} already exists")
+
+        index = max(0, min(index if index >= 0 else len(self._ids) + index, len(self._ids)))
+        self._ids.insert(index, id)
+        self._records[id] = record
+        self._max_id = max(self._max_id, id)
+        self._reindex(index)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, RecordCollection)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def find(self, id: Union[int, str]) -> int:
+        """
+        Gets index of record with given id, -1 if not found.
+        """
+        try:
+            return self._index.get(int(id), -1)
+        except (TypeError, ValueError):
+            return -1
+
+    def get(self, id: Union[int, str]) -> Union[Record, None]:
+        index = self.find(id)
+        return self[index] if index != -1 else None
+
+    def ids(self) -> List[int]:
+        return list(self._ids)
+
+    def next_id(self) -> int:
+        """
+        Gets id for a new record. Ids of removed records are not reused.
+        """
+        return self._max_id + 1
+
+    def _get(self, id: int) -> Record:
+        return self._records[id]
+
+    def _reindex(self, start: int):
+        for i in range(start, len(self._ids)):
+            self._index[self._ids[i]] = i
+
+class LazyRecords(RecordCollection):
+    """
+    Record collection backed by a store, holding only ids until a record is accessed.
+    Accessed records are cached, so in-place changes persist until they are written back to the store.
+
+    ### Parameters:
+    - ids: Ids of records in list order.
+    - loader: Function loading record by id.
+    """
+    def __init__(self, ids: Iterable[int], loader: Callable[[int], Record]):
+        super().__init__()
+        self._loader = loader
+
+        for id in ids:
+            self._index[id] = len(self._ids)
+            self._ids.append(id)
+            self._max_id = max(self._max_id, id)
+
+    def _get(self, id: int) -> Record:
+        if id not in self._records:
+            self._records[id] = self._loader(id)
+        return self._records[id]
@@ -2,6 +2,8 @@ import os
 import matplotlib.pyplot as plt
 from typing import List, Dict, Any
 
+from .records import RouterRecord, RecordCollection
+
 from ...config import ROUTER_PREVIEW_DATA_PATH
 
 class RouterUtil: 
@@ -68,7 +70,7 @@ class RouterUtil:
         }
            
     @staticmethod
-    def get_new_router(router_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def get_new_router(router_data: List[Dict[str, Any]]) -> RouterRecord:
         """
         Returns a new router based on existing routers.
 
@@ -76,16 +78,16 @@ class RouterUtil:
         - router_data: List of existing routers, necessary for getting next router's index.
 
         Returns:
-        - New router as a dictionary
+        - New router record.
         """
         id = RouterUtil._get_next_router_id(router_data)
         preview_path = RouterUtil.get_preview_path(id)
-        return {
+        return RouterRecord.from_dict({
             "id": id,
             "preview_path": preview_path,
             "name": RouterUtil.ROUTER_DEFAULT_NAME,
             **RouterUtil._get_default_dimensions()
-        }
+        })
 
     @staticmethod
     def _get_default_dimensions() -> Dict[str, Any]:
@@ -115,6 +117,8 @@ class RouterUtil:
         Returns:
         - Next available index.
         """
+        if isinstance(router_data, RecordCollection):
+            return router_data.next_id()
         router_ids = [router.get('id') for router in router_data]
         return max(router_ids) + 1 if router_ids else 0
 
@@ -17,6 +17,27 @@ CURRENT_DIR = os.path.dirname(__file__)
 
 PROCESSING_SCALE_FACTOR = 5
 
+# data journal, mutations wait at most sync interval (s) for fsync and are compacted into data files past threshold
+JOURNAL_SYNC_INTERVAL = 1.0
+JOURNAL_COMPACTION_THRESHOLD = 500
+
+# changes are saved to data files in the background at most once per autosave interval (s)
+AUTOSAVE_INTERVAL = 30.0
+
+# storage of plates, routers and preferences, 'csv' for data files with journal or 'sqlite' for database
+STORAGE_BACKEND = 'csv'
+
+# opt-in memory diagnostics, enabled by setting environment variable to 1
+MEMORY_DIAGNOSTICS_ENABLED = os.environ.get('NEXACUT_MEMORY_DIAGNOSTICS', '0') == '1'
+
+# image processing profiles, selected by 'processing_profile' user preference
+DEFAULT_PROCESSING_PROFILE = 'standard'
+PROCESSING_PROFILES = {
+    'draft': {'max_image_dim': 1200, 'px_per_mm': 2, 'morph_kernel': 6, 'contour_tolerance': 1.0},
+    'standard': {'max_image_dim': 2000, 'px_per_mm': PROCESSING_SCALE_FACTOR, 'morph_kernel': 10, 'contour_tolerance': 0.5},
+    'high': {'max_image_dim': 3000, 'px_per_mm': 10, 'morph_kernel': 15, 'contour_tolerance': 0.2}
+}
+
 # frontend paths
 FRONTEND_FOLDER = 'frontend'
 RESOURCES_FOLDER = 'resources'
@@ -34,13 +55,17 @@ PREFERENCE_DATA_FOLDER = 'preference_data'
 PLATE_DATA_FILE = 'plate_data.csv'
 PLATE_PREVIEW_DATA_FOLDER = 'plate_preview_data'
 ROUTER_DATA_FILE = 'router_data.csv'
+JOURNAL_FILE = 'journal.jsonl'
+INVENTORY_DB_FILE = 'inventory.db'
+PLATE_GEOMETRY_DATA_FOLDER = 'plate_geometry_data'
+JOB_WORKSPACE_FOLDER = 'job_workspace'
 ROUTER_PREVIEW_DATA_FOLDER = 'router_preview_data'
 
 TEMPORARY_DATA_FOLDER = 'temporary'
-CAD_PREVIEW_DATA_FOLDER = 'cad_preview_data'
 IMAGE_PREVIEW_DATA_FOLDER = 'image_preview_data'
 
 USER_PREFERENCE_FILE = 'user_preferences.json'
+MEMORY_REPORT_FILE = 'memory_report.txt'
 
 # full paths
 MAIN_FONT_PATH = os.path.join(CURRENT_DIR, FRONTEND_FOLDER, RESOURCES_FOLDER, FONT_FOLDER, MAIN_FONT)
@@ -51,9 +76,14 @@ USER_PREFERENCE_FILE_PATH = os.path.join(CURRENT_DIR, DATA_FOLDER, PERMANENT_DAT
 PLATE_DATA_PATH = os.path.join(CURRENT_DIR, DATA_FOLDER, PERMANENT_DATA_FOLDER, PLATE_DATA_FILE)
 PLATE_PREVIEW_DATA_PATH = os.path.join(CURRENT_DIR, DATA_FOLDER, PERMANENT_DATA_FOLDER, PLATE_PREVIEW_DATA_FOLDER)
 ROUTER_DATA_PATH = os.path.join(CURRENT_DIR, DATA_FOLDER, PERMANENT_DATA_FOLDER, ROUTER_DATA_FILE)
+JOURNAL_PATH = os.path.join(CURRENT_DIR, DATA_FOLDER, PERMANENT_DATA_FOLDER, JOURNAL_FILE)
+PLATE_GEOMETRY_DATA_PATH = os.path.join(CURRENT_DIR, DATA_FOLDER, PERMANENT_DATA_FOLDER, PLATE_GEOMETRY_DATA_FOLDER)
+JOB_WORKSPACE_PATH = os.path.join(CURRENT_DIR, DATA_FOLDER, PERMANENT_DATA_FOLDER, JOB_WORKSPACE_FOLDER)
+INVENTORY_DB_PATH = os.path.join(CURRENT_DIR, DATA_FOLDER, PERMANENT_DATA_FOLDER, INVENTORY_DB_FILE)
 ROUTER_PREVIEW_DATA_PATH = os.path.join(CURRENT_DIR, DATA_FOLDER, PERMANENT_DATA_FOLDER, ROUTER_PREVIEW_DATA_FOLDER)
 
-CAD_PREVIEW_DATA_PATH = os.path.join(CURRENT_DIR, DATA_FOLDER, TEMPORARY_DATA_FOLDER, CAD_PREVIEW_DATA_FOLDER)
+MEMORY_REPORT_PATH = os.path.join(CURRENT_DIR, DATA_FOLDER, MEMORY_REPORT_FILE)
+
 IMAGE_PREVIEW_DATA_PATH = os.path.join(CURRENT_DIR, DATA_FOLDER, TEMPORARY_DATA_FOLDER, IMAGE_PREVIEW_DATA_FOLDER)
 
-TEMP_PATHS = [CAD_PREVIEW_DATA_PATH, IMAGE_PREVIEW_DATA_PATH]
\ No newline at end of file
+TEMP_PATHS = [IMAGE_PREVIEW_DATA_PATH]
\ No newline at end of file
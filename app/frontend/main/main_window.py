@@ -47,11 +47,23 @@ class MainWindow(QMainWindow):
 
         menu = Menu(self.MENU_BUTTONS)
 
+        router_widget = RouterWidget(data_manager.router_data, ROUTER_LIMIT)
+        router_widget.routerUpdated.connect(data_manager.update_router)
+        router_widget.routerRemoved.connect(data_manager.remove_router)
+
+        inventory_widget = InventoryWidget(data_manager.plate_data, PLATE_LIMIT, data_manager.user_preferences)
+        inventory_widget.plateUpdated.connect(data_manager.update_plate)
+        inventory_widget.plateRemoved.connect(data_manager.remove_plate)
+        inventory_widget.preferenceChanged.connect(data_manager.set_preference)
+
+        import_widget = ImportWidget(data_manager.imported_parts, PART_IMPORT_LIMIT)
+        import_widget.partsChanged.connect(data_manager.save_imported_parts)
+
         self.WIDGETS = [
             HomeWidget(),
-            ImportWidget(data_manager.imported_parts, PART_IMPORT_LIMIT),
-            RouterWidget(data_manager.router_data, ROUTER_LIMIT),
-            InventoryWidget(data_manager.plate_data, PLATE_LIMIT)
+            import_widget,
+            router_widget,
+            inventory_widget
         ]
 
         content_viewer = ContentViewer(self.WIDGETS)
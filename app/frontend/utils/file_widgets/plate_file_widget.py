@@ -12,15 +12,16 @@ class PlateFileWidget(QWidget):
     Widget for managing plate files.
 
     ### Parameters:
-    - data: Plate data in dict form.
+    - data: Plate data in dict form. Widget edits a copy, emitting a copy of it whenever edits are saved.
     """
     deleteRequested = pyqtSignal(int)
     importRequested = pyqtSignal(int)
+    dataUpdated = pyqtSignal(object)
 
     def __init__(self, data: dict):
         super().__init__()
 
-        self.data = data
+        self.data = data.copy()
 
         self._setup_ui()
 
@@ -75,6 +76,16 @@ class PlateFileWidget(QWidget):
         """
         self._update_preview()
 
+    def set_contours(self, contours: list, contour_parents: list, processing_profile: str):
+        """
+        Set contours of plate from image editor, updating preview and emitting changed data.
+        """
+        self.data['contours'] = contours
+        self.data['contour_parents'] = contour_parents
+        self.data['processing_profile'] = processing_profile
+        self._update_preview()
+        self.dataUpdated.emit(self.data.copy())
+
     def _update_preview(self):
         PlateUtil.save_preview_image(self.data)
         self._preview_widget.update()
@@ -85,6 +96,7 @@ class PlateFileWidget(QWidget):
     def __on_save_requested(self, data: dict):
         self.data = data
         self._update_preview()
+        self.dataUpdated.emit(self.data.copy())
 
     def __on_delete_requested(self):
         self.deleteRequested.emit(self.data['id'])
@@ -9,12 +9,13 @@ from ....backend.utils.router_util import RouterUtil
 class RouterFileWidget(QWidget): 
     
     deleteRequested = pyqtSignal(int) 
+    dataUpdated = pyqtSignal(object)
 
     def __init__(self, router_data: dict): 
 
         super().__init__()
 
-        self.data = router_data 
+        self.data = router_data.copy() # edited copy, emitted as a copy whenever edits are saved
 
         self._setup_ui()
 
@@ -42,6 +43,7 @@ class RouterFileWidget(QWidget):
     def __on_save_requested(self, data):
         self.data = data
         self._update_preview()
+        self.dataUpdated.emit(self.data.copy())
 
     def __on_delete_requested(self):
         self.deleteRequested.emit(self.data['id'])
\ No newline at end of file
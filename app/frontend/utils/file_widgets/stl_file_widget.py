@@ -9,12 +9,13 @@ class STLFileWidget(QWidget):
     deleteRequested = pyqtSignal(str)
     amountEdited = pyqtSignal(str, int)
 
-    def __init__(self, file_name: str, png_location: str):
+    def __init__(self, file_name: str, png_location: str, amount: int = 1):
 
         super().__init__()
 
         self.file_name = file_name
         self.png_location = png_location
+        self.amount = amount
 
         layout = QVBoxLayout()
 
@@ -37,7 +38,7 @@ class STLFileWidget(QWidget):
         amt_input.setPlaceholderText("Amount")
         Style.apply_stylesheet(amt_input, 'small-input-box.css')
         amt_input.textEdited.connect(self.__on_amount_edited__)
-        amt_input.setText("1")
+        amt_input.setText(str(self.amount))
 
         delete_button = QPushButton("Delete")
         Style.apply_stylesheet(delete_button, 'small-button.css')
@@ -52,7 +52,6 @@ class ImageEditorWidget(QStackedWidget):
     def on_binary_finalized(self):
         self.setCurrentIndex(2)
         self.image_converter.initialize_features()
-        self.image_converter.save_features()
         self.image_feature_widget.update()
 
     def on_features_finalized(self):
@@ -1,8 +1,11 @@
-from PyQt6.QtCore import pyqtSignal
+import functools
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout
 
 from .image_editor_widget import ImageEditorWidget
 from ....backend.utils.image_conversion.image_converter import ImageConverter
+from ....backend.utils.image_conversion.utils import ProcessingProfile
+from ....backend.utils.memory_diagnostics import MemoryDiagnostics
 
 from ....config import IMAGE_PREVIEW_DATA_PATH
 
@@ -14,14 +17,19 @@ class ImageEditorWindow(QMainWindow):
  
     PIXMAP_HEIGHT = 600
 
-    imageEditorClosed = pyqtSignal(int, list)
+    imageEditorClosed = pyqtSignal(int, list, list) # plate id, contours, contour parents
 
-    def __init__(self, plate_index: int, plate_w: float, plate_h: float):
+    def __init__(self, plate_index: int, plate_w: float, plate_h: float, processing_profile: ProcessingProfile = None):
         super().__init__()
 
+        diagnostics_key = f"image editor for plate #{plate_index}" # growth surviving after window is destroyed
+        MemoryDiagnostics.checkpoint_start(diagnostics_key)
+        self.destroyed.connect(functools.partial(MemoryDiagnostics.checkpoint_end, diagnostics_key))
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+
         self.plate_index = plate_index
         self.filename = str(plate_index)+'.png'
-        self.image_converter = ImageConverter(IMAGE_PREVIEW_DATA_PATH, plate_w, plate_h, self.PIXMAP_HEIGHT)
+        self.image_converter = ImageConverter(IMAGE_PREVIEW_DATA_PATH, plate_w, plate_h, self.PIXMAP_HEIGHT, processing_profile)
 
         self.setMinimumSize(self.MIN_WIDTH, self.MIN_HEIGHT)
         self.setWindowTitle(self.WINDOW_TITLE)
@@ -40,5 +48,5 @@ class ImageEditorWindow(QMainWindow):
         self.show()
 
     def closeEvent(self, event):
-        contours = self.image_converter.get_finalized_contours()
-        self.imageEditorClosed.emit(self.plate_index, contours)
\ No newline at end of file
+        contours, parents = self.image_converter.get_finalized_contours()
+        self.imageEditorClosed.emit(self.plate_index, contours, parents)
\ No newline at end of file
@@ -1,8 +1,10 @@
 from enum import Enum
 
-from PyQt6.QtCore import Qt, pyqtSignal
+import numpy as np
+
+from PyQt6.QtCore import Qt, QRectF, pyqtSignal
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel
-from PyQt6.QtGui import QPixmap
+from PyQt6.QtGui import QPixmap, QImage, QPainter
 
 from ..style import Style
 
@@ -25,6 +27,7 @@ class ImageFeatureWidget(QWidget):
         self.pixmap_height = pixmap_height
 
         self.mode = None
+        self.pixmap: QPixmap = None
 
         self.__init_gui__()
     
@@ -116,10 +119,32 @@ class ImageFeatureWidget(QWidget):
         stylesheet = "generic-text.css" if amt_corners == 4 else "generic-text-red.css"
         Style.apply_stylesheet(self.corner_counter, stylesheet)
 
-    def _update_preview_widget(self):
-        pixmap = QPixmap(self.image_converter.feat_path)
-        scaled_pixmap = pixmap.scaledToHeight(self.pixmap_height)
-        self.preview_widget.setPixmap(scaled_pixmap)
+    def _update_preview_widget(self, dirty_rects: list):
+        """
+        Repaints regions of the preview pixmap that changed in the feature image, reloading the whole pixmap on first render.
+        """
+        canvas = self.image_converter.feature_display.canvas
+        canvas_h, canvas_w = canvas.shape[:2]
+
+        if self.pixmap is None or dirty_rects == [(0, 0, canvas_w, canvas_h)]:
+            image = QImage(canvas.data, canvas_w, canvas_h, canvas.strides[0], QImage.Format.Format_BGR888)
+            self.pixmap = QPixmap.fromImage(image).scaledToHeight(self.pixmap_height)
+            self.preview_widget.setPixmap(self.pixmap)
+            return
+
+        if not dirty_rects:
+            return
+
+        scale = self.pixmap.height() / canvas_h
+        painter = QPainter(self.pixmap)
+
+        for x, y, w, h in dirty_rects:
+            region = np.ascontiguousarray(canvas[y:y+h, x:x+w])
+            image = QImage(region.data, w, h, region.strides[0], QImage.Format.Format_BGR888)
+            painter.drawImage(QRectF(x * scale, y * scale, w * scale, h * scale), image)
+
+        painter.end()
+        self.preview_widget.setPixmap(self.pixmap)
 
     def _update_delete_button_widget(self):
         if self.mode == Mode.REMOVE_EXCESS_FEATURES and self._selection_active():
@@ -132,10 +157,10 @@ class ImageFeatureWidget(QWidget):
         self.mode_label.setText(mode_text)
 
     def update(self):
-        self.image_converter.save_features()
         self._update_mode()
+        dirty_rects = self.image_converter.update_features()
         self._update_corner_counter()
-        self._update_preview_widget()
+        self._update_preview_widget(dirty_rects)
         self._update_delete_button_widget()
         self._update_mode_label()
 
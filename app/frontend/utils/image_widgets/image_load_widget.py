@@ -39,5 +39,5 @@ class ImageLoadWidget(QWidget):
     def import_image_file(self):
  
         file_path, _ = QFileDialog.getOpenFileName(self, "Select File", "", self.SUPPORTED_IMAGE_FORMATS)
-        self.image_converter.__init_src_path__(file_path)
+        self.image_converter.load_source_image(file_path)
         self.imageImported.emit()
\ No newline at end of file
@@ -7,7 +7,7 @@ from ....backend.utils.input_parser import InputParser
 class DataWidget(QWidget):
 
     deleteRequested = pyqtSignal() 
-    saveRequested = pyqtSignal(dict) # data
+    saveRequested = pyqtSignal(object) # data
 
     def __init__(self, data: dict, editable_keys: list, value_ranges: list, has_name_property: False, is_small: False):
 
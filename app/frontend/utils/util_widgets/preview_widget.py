@@ -5,7 +5,12 @@ from PyQt6.QtWidgets import QLabel
 from PyQt6.QtGui import QPixmap
 
 class PreviewWidget(QLabel):
+    """
+    Label displaying preview image, loaded when widget is first shown.
 
+    ### Parameters:
+    - png_path: Path of preview image.
+    """
     def __init__(self, png_path: str):
 
         if not os.path.exists(png_path): 
@@ -14,10 +19,14 @@ class PreviewWidget(QLabel):
         super().__init__()
         
         self.png_path = png_path
-        self.pixmap = QPixmap(self.png_path)
-        self.setPixmap(self.pixmap)
+        self.pixmap = None
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
+    def showEvent(self, event):
+        if self.pixmap is None:
+            self.update()
+        super().showEvent(event)
+
     def update(self):
         self.pixmap = QPixmap(self.png_path)
         self.setPixmap(self.pixmap)
\ No newline at end of file
@@ -1,4 +1,5 @@
 import math
+from typing import Callable
 from PyQt6.QtWidgets import QWidget, QStackedWidget, QHBoxLayout, QVBoxLayout
 
 from ..style import Style
@@ -7,11 +8,20 @@ from .arrow_button import ArrowButton
 from ....config import MIN_HEIGHT
 
 class WidgetViewer(QStackedWidget): # grid view
+    """
+    Paged grid of widgets, only the current page is built.
+
+    ### Parameters:
+    - widgets_x: Amount of widgets per row.
+    - widgets_y: Amount of rows.
+    - widgets: Widgets to display, entries can be None if factory is given.
+    - factory: Function creating widget for given index, called when a None entry is first displayed.
+    """
 
     MAX_WIDGETS_X = 4 
     MAX_WIDGETS_Y = 2
 
-    def __init__(self, widgets_x: int, widgets_y: int, widgets: list = []): 
+    def __init__(self, widgets_x: int, widgets_y: int, widgets: list = [], factory: Callable[[int], QWidget] = None): 
 
         if widgets_x > self.MAX_WIDGETS_X or widgets_x <= 0:
             raise ValueError(f"widgets_x must be in range 0-{self.MAX_WIDGETS_X}")
@@ -25,20 +35,33 @@ class WidgetViewer(QStackedWidget): # grid view
 
         self.curr_tab = 0
         self.widgets = widgets 
+        self.factory = factory
         
         self.update_view()
 
     def update_view(self):
 
-        for i in reversed(range(self.count())):
-            widget = self.widget(i)
-            self.removeWidget(widget)
+        old_pages = [self.widget(i) for i in range(self.count())]
+        for page in old_pages:
+            self.removeWidget(page)
+
+        self.curr_tab = min(self.curr_tab, self._get_max_tab_idx())
+        self.addWidget(self.get_tab(self.curr_tab))
+        self.setCurrentIndex(0)
 
-        for i in range(self._get_max_tab_idx()+1):
-            widget = self.get_tab(i)
-            self.addWidget(widget)
+        for page in old_pages: # keep widgets of other pages alive, they are reparented when their page is built
+            for widget in self.widgets:
+                if widget is not None and page.isAncestorOf(widget):
+                    widget.setParent(None)
+            page.deleteLater()
 
-        self.setCurrentIndex(self.curr_tab)
+    def _get_widget(self, widget_idx: int) -> QWidget:
+        """
+        Gets widget at given index, creating it with factory on first access.
+        """
+        if self.widgets[widget_idx] is None and self.factory is not None:
+            self.widgets[widget_idx] = self.factory(widget_idx)
+        return self.widgets[widget_idx]
 
     def append_widgets(self, widgets: list): 
         for widget in widgets:
@@ -120,7 +143,7 @@ class WidgetViewer(QStackedWidget): # grid view
                     row_widget_layout.addStretch(1)
 
                 else: 
-                    curr_widget = self.widgets[curr_widget_idx]
+                    curr_widget = self._get_widget(curr_widget_idx)
                     row_widget_layout.addWidget(curr_widget, 1)
             
             row_widget.setLayout(row_widget_layout)
@@ -1,4 +1,5 @@
 import os
+from PyQt6.QtCore import pyqtSignal, QTimer
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog
 from typing import List, Dict
 
@@ -11,8 +12,9 @@ from ..utils.file_widgets.stl_file_widget import STLFileWidget
 
 from ...backend.utils.stl_parser import STLParser
 from ...backend.utils.file_processor import FileProcessor
+from ...backend.utils.job_workspace import JobWorkspace
 
-from ...config import CAD_PREVIEW_DATA_PATH
+from ...config import JOB_WORKSPACE_PATH
 
 class ImportWidget(WidgetTemplate):
     """
@@ -22,6 +24,11 @@ class ImportWidget(WidgetTemplate):
     - imported_parts: List of imported CAD files.
     - part_import_limit: Limit on maximum number of parts able to be imported.
     """
+
+    partsChanged = pyqtSignal()
+
+    AMOUNT_EDIT_DELAY_MS = 1000 # amount edits are reported once typing pauses, not on every keystroke
+
     def __init__(self, imported_parts: List[dict], part_import_limit: int): # check format of imported parts
         self.logger = logging.getLogger(__name__)
         if not self.logger.hasHandlers():
@@ -36,6 +43,11 @@ class ImportWidget(WidgetTemplate):
         self.imported_parts = imported_parts
         self.part_import_limit = part_import_limit
 
+        self._amount_edit_timer = QTimer(self)
+        self._amount_edit_timer.setSingleShot(True)
+        self._amount_edit_timer.setInterval(self.AMOUNT_EDIT_DELAY_MS)
+        self._amount_edit_timer.timeout.connect(self.partsChanged.emit)
+
         self._setup_ui()
         self.logger.debug(f"Initialization complete.")
     
@@ -47,6 +59,7 @@ class ImportWidget(WidgetTemplate):
         main_layout = QVBoxLayout()
         
         self._file_preview_widget = WidgetViewer(4, 2) 
+        self._file_preview_widget.append_widgets([self._create_part_widget(part['filename'], part['preview_path'], part['amount']) for part in self.imported_parts])
 
         self._import_button = QPushButton()
         self._import_button.clicked.connect(self.import_files)
@@ -89,16 +102,25 @@ class ImportWidget(WidgetTemplate):
                 return idx
         return -1
     
-    def _save_file_to_data(self, filename: str, outer_contour: list, amount: int = 1):
+    def _save_file_to_data(self, path: str, parser: STLParser, amount: int = 1):
         """
-        Save widget info to list of imported parts.
+        Save widget info to list of imported parts, along with source file info used to restore part in later sessions.
         """
         new_entry = {
-            "filename": filename, 
+            "filename": os.path.basename(path), 
             "amount": amount, 
-            "outer_contour": outer_contour}
+            "outer_contour": parser.outer_contour,
+            "thickness": parser.thickness,
+            "preview_path": parser.dst_path,
+            **JobWorkspace.get_source_info(path)}
         self.imported_parts.append(new_entry)
 
+    def _create_part_widget(self, filename: str, png_location: str, amount: int = 1) -> STLFileWidget:
+        preview_widget = STLFileWidget(filename, png_location, amount)
+        preview_widget.deleteRequested.connect(self.__on_widget_delete_request__)
+        preview_widget.amountEdited.connect(self.__on_widget_amt_edited__)
+        return preview_widget
+
     def import_files(self): 
         """
         Add files from QFileDialog to import list, excluding duplicates and stopping when the import limit is reached.
@@ -136,21 +158,15 @@ class ImportWidget(WidgetTemplate):
 
             try:
                 self.logger.debug(f"Importing file {filename}...")
-                parser = STLParser(path, CAD_PREVIEW_DATA_PATH)
+                parser = STLParser(path, JOB_WORKSPACE_PATH)
                 parser.parse_stl()
                 parser.save_image()
-                
-                outer_contour = parser.outer_contour
-                png_location = parser.dst_path
 
                 self.logger.debug(f"Creating widget for file {filename}...")
-                preview_widget = STLFileWidget(filename, png_location)
-                preview_widget.deleteRequested.connect(self.__on_widget_delete_request__)
-                preview_widget.amountEdited.connect(self.__on_widget_amt_edited__)
-                widgets.append(preview_widget)
+                widgets.append(self._create_part_widget(filename, parser.dst_path))
 
                 self.logger.debug(f"Saving {filename} to data...")
-                self._save_file_to_data(filename, outer_contour, 1) 
+                self._save_file_to_data(path, parser, 1) 
 
                 self.logger.debug(f"File {filename} imported successfully.")
 
@@ -161,6 +177,8 @@ class ImportWidget(WidgetTemplate):
 
         self._file_preview_widget.append_widgets(widgets)
         self._update_import_button_text()
+        if imported:
+            self._emit_parts_changed()
 
     def _update_import_button_text(self):
         """
@@ -170,10 +188,18 @@ class ImportWidget(WidgetTemplate):
         Style.apply_stylesheet(self._import_button, stylesheet)
         self._import_button.setText(f"Import Parts ({self._get_total_part_amount()}/{self.part_import_limit})")
 
+    def _emit_parts_changed(self):
+        """
+        Reports changed parts right away, including any amount edit still waiting to be reported.
+        """
+        self._amount_edit_timer.stop()
+        self.partsChanged.emit()
+
     def __on_widget_amt_edited__(self, filename: str, value: int): 
         index = self._get_idx_of_filename(filename)
         self.imported_parts[index]['amount'] = value
         self._update_import_button_text()
+        self._amount_edit_timer.start() # restarts delay if already running
 
     def __on_widget_delete_request__(self, filename: str): 
         """
@@ -182,12 +208,12 @@ class ImportWidget(WidgetTemplate):
         self.logger.debug(f"Removing file {filename}...")
         index = self._get_idx_of_filename(filename)
 
-        filepath = os.path.join(CAD_PREVIEW_DATA_PATH, filename)
         file_processor = FileProcessor()
-        file_processor.remove_file(filepath)
+        file_processor.remove_file(self.imported_parts[index]['preview_path'])
 
         self.imported_parts.pop(index)
         self._file_preview_widget.pop_widget(index)
         self.logger.debug(f"File {filename} removed successfully.")
         self._update_import_button_text()
+        self._emit_parts_changed()
 
@@ -1,5 +1,6 @@
 import os
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QComboBox, QLabel
 
 import logging
 
@@ -10,19 +11,28 @@ from ..utils.file_widgets.plate_file_widget import PlateFileWidget
 from ..utils.image_widgets.image_editor_window import ImageEditorWindow
 
 from ...backend.utils.plate_util import PlateUtil
+from ...backend.utils.contour_util import ContourUtil
 from ...backend.utils.file_processor import FileProcessor
+from ...backend.utils.image_conversion.utils import ProcessingProfile
 
-from ...config import PLATE_PREVIEW_DATA_PATH
+from ...config import PLATE_PREVIEW_DATA_PATH, PROCESSING_PROFILES
 
 class InventoryWidget(WidgetTemplate):
     """
     Tab for handling CNC stock.
 
     ### Parameters:
-    - plate_data: List of plates currently in inventory.
+    - plate_data: List of plates currently in inventory. Widget only reads it, plates are added, changed and removed by
+      the data manager when handling plateUpdated and plateRemoved.
     - plate_limit: Maximum number of plates able to be stored in app.
+    - user_preferences: User preferences, used for selecting image processing profile.
     """
-    def __init__(self, plate_data: list, plate_limit: int):
+
+    plateUpdated = pyqtSignal(object) # plate data
+    plateRemoved = pyqtSignal(int) # id
+    preferenceChanged = pyqtSignal(str, object) # key, value
+
+    def __init__(self, plate_data: list, plate_limit: int, user_preferences: dict = None):
         self.logger = logging.getLogger(__name__)
         if not self.logger.hasHandlers():
             self.logger.setLevel(logging.DEBUG)
@@ -36,6 +46,7 @@ class InventoryWidget(WidgetTemplate):
 
         self.plate_data = plate_data
         self.plate_limit = plate_limit
+        self.user_preferences = user_preferences if user_preferences is not None else {}
         self.image_editor_active = False
 
         self._setup_ui()
@@ -48,13 +59,8 @@ class InventoryWidget(WidgetTemplate):
         main_widget = QWidget()
         main_layout = QVBoxLayout()
         
-        self.plate_widgets = [PlateFileWidget(plate) for plate in self.plate_data]
-
-        for widget in self.plate_widgets:
-            widget.deleteRequested.connect(self.__on_plate_delete_requested__)
-            widget.importRequested.connect(self.__on_plate_import_image_requested__)
-
-        self._file_preview_widget = WidgetViewer(3, 1, self.plate_widgets) 
+        self.plate_widgets = [None] * len(self.plate_data) # created when their page is first displayed
+        self._file_preview_widget = WidgetViewer(3, 1, self.plate_widgets, self._create_plate_widget) 
 
         add_new_button_wrapper = QWidget()
         add_new_button_wrapper_layout = QHBoxLayout()
@@ -63,9 +69,20 @@ class InventoryWidget(WidgetTemplate):
         Style.apply_stylesheet(self._add_new_button, "generic-button.css")
         self._add_new_button.clicked.connect(self.add_new_plate)
 
+        profile_label = QLabel("Image Processing:")
+        Style.apply_stylesheet(profile_label, "small-text.css")
+
+        self._profile_selector = QComboBox()
+        self._profile_selector.addItems(list(PROCESSING_PROFILES))
+        self._profile_selector.setCurrentText(ProcessingProfile.get(self.user_preferences.get('processing_profile')).name) # unknown or missing names fall back to default
+        self._profile_selector.currentTextChanged.connect(self.__on_processing_profile_selected__)
+        Style.apply_stylesheet(self._profile_selector, "small-combo-box.css")
+
         add_new_button_wrapper_layout.addStretch(2)
         add_new_button_wrapper_layout.addWidget(self._add_new_button, 1)
-        add_new_button_wrapper_layout.addStretch(2)
+        add_new_button_wrapper_layout.addStretch(1)
+        add_new_button_wrapper_layout.addWidget(profile_label)
+        add_new_button_wrapper_layout.addWidget(self._profile_selector)
         add_new_button_wrapper.setLayout(add_new_button_wrapper_layout)
 
         main_layout.addWidget(self._file_preview_widget, 7)
@@ -90,16 +107,23 @@ class InventoryWidget(WidgetTemplate):
 
         new_plate_data = PlateUtil.get_new_plate(self.plate_data)
         PlateUtil.save_preview_image(new_plate_data)
-        self.plate_data.append(new_plate_data)
+        self.plateUpdated.emit(new_plate_data)
 
         self.logger.debug(f"Creating widget for new plate...")
-        new_plate_widget = PlateFileWidget(new_plate_data)
-        new_plate_widget.deleteRequested.connect(self.__on_plate_delete_requested__)
-        new_plate_widget.importRequested.connect(self.__on_plate_import_image_requested__)
-        self._file_preview_widget.append_widgets([new_plate_widget])
+        self._file_preview_widget.append_widgets([self._create_plate_widget(self._get_idx_of_plate_in_list(new_plate_data['id']))])
         self._update_add_button_text()       
         self.logger.debug(f"New plate added successfully.")
     
+    def _create_plate_widget(self, plate_idx: int) -> PlateFileWidget:
+        """
+        Create widget for plate at given index of data list.
+        """
+        plate_widget = PlateFileWidget(self.plate_data[plate_idx])
+        plate_widget.deleteRequested.connect(self.__on_plate_delete_requested__)
+        plate_widget.importRequested.connect(self.__on_plate_import_image_requested__)
+        plate_widget.dataUpdated.connect(self.plateUpdated.emit)
+        return plate_widget
+
     def _get_plate_amount(self) -> int:
         """
         Get amount of plates in data list.
@@ -110,10 +134,7 @@ class InventoryWidget(WidgetTemplate):
         """
         Get index of plate in data list by id.
         """
-        for idx, dict in enumerate(self.plate_data):
-            if dict['id'] == id: 
-                return idx
-        return -1
+        return self.plate_data.find(id)
 
     def _update_add_button_text(self):
         """
@@ -140,24 +161,28 @@ class InventoryWidget(WidgetTemplate):
         plate_idx = self._get_idx_of_plate_in_list(id)
         plate_w = self.plate_data[plate_idx]['width_(x)'] 
         plate_h = self.plate_data[plate_idx]['height_(y)']
-        self.image_editor = ImageEditorWindow(id, plate_w, plate_h) 
+        processing_profile = ProcessingProfile.get(self.user_preferences.get('processing_profile'))
+        self.image_editor = ImageEditorWindow(id, plate_w, plate_h, processing_profile) 
         self.image_editor.imageEditorClosed.connect(self.__on_image_editor_closed__)
 
-    def __on_image_editor_closed__(self, id: int, contours: list): 
+    def __on_processing_profile_selected__(self, name: str):
+        self.preferenceChanged.emit('processing_profile', name)
+
+    def __on_image_editor_closed__(self, id: int, contours: list, parents: list): 
         self.logger.debug(f"Saving data for plate #{str(id)}...")
         plate_idx = self._get_idx_of_plate_in_list(id)
-        self.plate_data[plate_idx]['contours'] = self._serialize_contours(contours)
-        PlateUtil.save_preview_image(self.plate_data[plate_idx])
-        self.plate_widgets[plate_idx].update_image_preview()
+        processing_profile = self.image_editor.image_converter.processing_profile.name
+        self.image_editor = None # window deletes itself on close, dropping reference frees converter data
+        if self.plate_widgets[plate_idx] is not None: # widget holds the edited copy, emitting it through dataUpdated
+            self.plate_widgets[plate_idx].set_contours(contours, parents, processing_profile)
+        else:
+            plate = self.plate_data[plate_idx].copy()
+            plate.update({'contours': contours, 'contour_parents': parents, 'processing_profile': processing_profile})
+            PlateUtil.save_preview_image(plate)
+            self.plateUpdated.emit(plate)
         self.logger.debug(f"Plate contours saved successfully.")
         self.image_editor_active = False
 
-    def _serialize_contours(self, contours: list):
-        serialized = []
-        for contour in contours:
-            serialized.append(contour.tolist())
-        return serialized
-
     def __on_plate_delete_requested__(self, id: int):
         """
         Removes plate from data, deleting preview path.
@@ -171,7 +196,7 @@ class InventoryWidget(WidgetTemplate):
         png_path = self.plate_data[index]['preview_path']
         file_processor.remove_file(png_path)
 
-        self.plate_data.pop(index)
+        self.plateRemoved.emit(id)
         self._file_preview_widget.pop_widget(index)
         self._update_add_button_text()
 
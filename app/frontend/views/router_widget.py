@@ -1,4 +1,5 @@
 import os
+from PyQt6.QtCore import pyqtSignal
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton
 
 import logging
@@ -16,7 +17,16 @@ from ...config import ROUTER_PREVIEW_DATA_PATH
 class RouterWidget(WidgetTemplate):
     """
     Tab for managing CNC routers.
+
+    ### Parameters:
+    - router_data: List of routers. Widget only reads it, routers are added, changed and removed by the data manager
+      when handling routerUpdated and routerRemoved.
+    - router_limit: Maximum number of routers able to be stored in app.
     """
+
+    routerUpdated = pyqtSignal(object) # router data
+    routerRemoved = pyqtSignal(int) # id
+
     def __init__(self, router_data: list, router_limit: int):
         self.logger = logging.getLogger(__name__)
         if not self.logger.hasHandlers():
@@ -46,6 +56,7 @@ class RouterWidget(WidgetTemplate):
 
         for widget in router_widgets:
             widget.deleteRequested.connect(self.__on_router_delete_requested__)
+            widget.dataUpdated.connect(self.routerUpdated.emit)
 
         self._file_preview_widget = WidgetViewer(1, 1, router_widgets) 
 
@@ -80,10 +91,7 @@ class RouterWidget(WidgetTemplate):
         """
         Get index of router in data list by id.
         """
-        for i, router in enumerate(self.router_data):
-            if router['id'] == id:
-                return i
-        return -1
+        return self.router_data.find(id)
 
     def add_new_router(self):
         """
@@ -94,13 +102,13 @@ class RouterWidget(WidgetTemplate):
         
         self.logger.debug(f"Adding new router...")
         new_router_data = RouterUtil.get_new_router(self.router_data)
-        self.router_data.append(new_router_data)
-        
         RouterUtil.save_router_preview(new_router_data)
+        self.routerUpdated.emit(new_router_data)
 
         self.logger.debug(f"Creating widget for new router...")
         new_router_widget = RouterFileWidget(new_router_data)
         new_router_widget.deleteRequested.connect(self.__on_router_delete_requested__)
+        new_router_widget.dataUpdated.connect(self.routerUpdated.emit)
 
         self._file_preview_widget.append_widgets([new_router_widget])
         self.update_add_button_text() 
@@ -123,7 +131,7 @@ class RouterWidget(WidgetTemplate):
         FileProcessor.remove_file(filepath)
 
         router_list_idx = self._get_router_list_idx(id)
-        self.router_data.pop(router_list_idx)
+        self.routerRemoved.emit(id)
         self._file_preview_widget.pop_widget(router_list_idx)
         self.update_add_button_text()
         self.logger.debug(f"Router #{str(id)} removed successfully.")
\ No newline at end of file
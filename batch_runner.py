@@ -0,0 +1,16 @@
+import argparse
+
+from app.backend.utils.image_conversion.batch import BatchDigitizer
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Digitize a folder of plate photos without the GUI.')
+    parser.add_argument('photo_folder', help='folder containing plate photos')
+    parser.add_argument('manifest', help="CSV with 'filename', 'width_(x)' and 'height_(y)' columns")
+    parser.add_argument('output_folder', help='folder for intermediate images, contours and reports')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--station', default=None, help='station profile used to flatten photos without corner detection')
+    parser.add_argument('--lens', default=None, help='lens calibration used to undistort photos')
+    args = parser.parse_args()
+
+    digitizer = BatchDigitizer(args.photo_folder, args.manifest, args.output_folder, args.workers, args.station, args.lens)
+    digitizer.run()
@@ -0,0 +1,237 @@
+import os
+import sys
+import time
+import json
+import glob
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+import logging
+import statistics
+import cv2
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.backend.utils.image_conversion.image_converter import ImageConverter
+from app.backend.utils.image_conversion.utils import ProcessingProfile
+
+class PipelineBenchmark:
+    """
+    Benchmark of ImageConverter stages over bundled plate photos and synthetic upscaled variants.
+    Variants run with the default processing profile raised to their size, so loading does not downscale them back.
+    Wall time and tracemalloc peak are recorded for every stage, with the binary threshold swept over slider values.
+    Stage medians (time) and maxima (memory) per scale are compared against stored baselines.
+    Both metrics are measured with tracemalloc running, baselines must be recorded the same way.
+
+    ### Parameters:
+    - photo_folder: Folder containing plate photos.
+    - scales: Upscaling factors of synthetic photo variants, 1 means original photo.
+    - thresholds: Binary thresholds to sweep, None stands for automatic threshold.
+    - plate_size: Assumed plate dimensions in mm.
+
+    ### Raises:
+    - FileNotFoundError if photo folder contains no photos.
+    """
+    logger = logging.getLogger(__name__)
+    if not logger.hasHandlers():
+        logger.setLevel(logging.DEBUG)
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+
+    PHOTO_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests', 'data', 'plate images')
+    BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+    STAGES = ('load', 'binary', 'features', 'render', 'flatten', 'contours')
+
+    DEFAULT_SCALES = (1, 2, 4)
+    DEFAULT_THRESHOLDS = (64, 127, 191, None)
+    DEFAULT_PLATE_SIZE = (600, 400)
+
+    PIXMAP_HEIGHT = 600
+
+    TIME_TOLERANCE = 1.0 # relative slowdown allowed before stage counts as regressed, wall time is noisy
+    MEMORY_TOLERANCE = 0.2
+    MIN_TIME_DELTA = 0.01 # s, ignores regressions of stages too fast to time reliably
+
+    def __init__(self, photo_folder: str=PHOTO_FOLDER, scales: tuple=DEFAULT_SCALES, thresholds: tuple=DEFAULT_THRESHOLDS, plate_size: tuple=DEFAULT_PLATE_SIZE):
+        self.photo_paths = sorted(glob.glob(os.path.join(photo_folder, '*.jp*g')) + glob.glob(os.path.join(photo_folder, '*.png')))
+        if not self.photo_paths:
+            raise FileNotFoundError(f"No photos found in '{photo_folder}'.")
+
+        self.scales = scales
+        self.thresholds = thresholds
+        self.plate_size = plate_size
+
+    def run(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Runs all stages for every photo, scale and threshold.
+
+        Returns:
+        - Summary in {scale: {stage: {'time_s': median wall time, 'peak_mb': max peak memory, 'runs': count}}} format.
+        """
+        samples: Dict[str, Dict[str, List[tuple]]] = {self._scale_key(scale): {stage: [] for stage in self.STAGES} for scale in self.scales}
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for scale in self.scales:
+                scale_samples = samples[self._scale_key(scale)]
+                for photo_path in self.photo_paths:
+                    src_path, profile = self._get_variant(photo_path, scale, temp_dir)
+                    self._run_photo(src_path, os.path.join(temp_dir, 'data'), profile, scale_samples)
+                self.logger.info(f"Finished scale {self._scale_key(scale)}.")
+
+        return {scale: {stage: self._summarize(stage_samples) for stage, stage_samples in scale_samples.items() if stage_samples}
+                for scale, scale_samples in samples.items()}
+
+    def _run_photo(self, src_path: str, data_folder: str, profile: ProcessingProfile, samples: Dict[str, List[tuple]]):
+        """
+        Runs pipeline for a single photo, loading it once and sweeping thresholds over the remaining stages.
+        """
+        os.makedirs(data_folder, exist_ok=True)
+        converter = ImageConverter(data_folder, *self.plate_size, self.PIXMAP_HEIGHT, profile)
+        samples['load'].append(self._measure(lambda: converter.load_source_image(src_path)))
+
+        for threshold in self.thresholds:
+            value = threshold if threshold is not None else converter.get_auto_threshold()
+            samples['binary'].append(self._measure(lambda: converter.save_binary(value)))
+
+            try:
+                samples['features'].append(self._measure(converter.initialize_features))
+            except ValueError: # no usable contours at this threshold
+                continue
+            samples['render'].append(self._measure(converter.save_features))
+
+            flattened = []
+            try:
+                flatten_sample = self._measure(lambda: flattened.append(converter.save_flattened()))
+            except ValueError: # four corners found, but not one in each quadrant
+                continue
+            if not flattened[0]: # only photos with exactly four corners are flattened
+                continue
+            samples['flatten'].append(flatten_sample)
+            samples['contours'].append(self._measure(converter.get_finalized_contours))
+
+        shutil.rmtree(data_folder)
+
+    def _get_variant(self, photo_path: str, scale: int, temp_dir: str) -> Tuple[str, ProcessingProfile]:
+        """
+        Gets path of photo upscaled by given factor, stored as JPEG like camera output, and profile to process it with.
+        Profile of upscaled variants has max_image_dim raised to the variant size, original photos use default profile.
+        """
+        profile = ProcessingProfile.get()
+        if scale == 1:
+            return photo_path, profile
+
+        image = cv2.imread(photo_path, cv2.IMREAD_COLOR)
+        image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+        name = os.path.splitext(os.path.basename(photo_path))[0]
+        variant_path = os.path.join(temp_dir, f"{name}_{scale}x.jpeg")
+        cv2.imwrite(variant_path, image)
+
+        profile.max_image_dim = max(profile.max_image_dim, *image.shape[:2])
+        return variant_path, profile
+
+    @staticmethod
+    def _measure(stage: Callable[[], Any]) -> tuple:
+        """
+        Runs stage returning its wall time in seconds and peak traced memory in MB.
+        """
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            stage()
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return elapsed, peak / 2**20
+
+    @staticmethod
+    def _summarize(stage_samples: List[tuple]) -> Dict[str, float]:
+        return {
+            'time_s': round(statistics.median(sample[0] for sample in stage_samples), 4),
+            'peak_mb': round(max(sample[1] for sample in stage_samples), 2),
+            'runs': len(stage_samples)
+        }
+
+    @staticmethod
+    def _scale_key(scale: int) -> str:
+        return f"{scale}x"
+
+    @staticmethod
+    def compare(results: Dict[str, Dict[str, Dict[str, float]]], baselines: Dict[str, Dict[str, Dict[str, float]]]) -> List[str]:
+        """
+        Compares results against baselines.
+
+        Arguments:
+        - results: Summary returned by run.
+        - baselines: Summary of a previous run.
+
+        Returns:
+        - List of regression descriptions, empty if no stage regressed. Stages missing from baselines are skipped.
+        """
+        regressions = []
+
+        for scale, stages in results.items():
+            for stage, result in stages.items():
+                baseline = baselines.get(scale, {}).get(stage)
+                if baseline is None:
+                    continue
+
+                time_limit = max(baseline['time_s'] * (1 + PipelineBenchmark.TIME_TOLERANCE), baseline['time_s'] + PipelineBenchmark.MIN_TIME_DELTA)
+                if result['time_s'] > time_limit:
+                    regressions.append(f"{scale} {stage}: {result['time_s']:.4f} s > baseline {baseline['time_s']:.4f} s")
+
+                memory_limit = baseline['peak_mb'] * (1 + PipelineBenchmark.MEMORY_TOLERANCE)
+                if result['peak_mb'] > memory_limit:
+                    regressions.append(f"{scale} {stage}: {result['peak_mb']:.2f} MB > baseline {baseline['peak_mb']:.2f} MB")
+
+        return regressions
+
+    @staticmethod
+    def format_results(results: Dict[str, Dict[str, Dict[str, float]]]) -> str:
+        lines = [f"{'scale':<6}{'stage':<10}{'time (s)':>10}{'peak (MB)':>12}{'runs':>6}"]
+        for scale, stages in results.items():
+            for stage, result in stages.items():
+                lines.append(f"{scale:<6}{stage:<10}{result['time_s']:>10.4f}{result['peak_mb']:>12.2f}{result['runs']:>6}")
+        return '\n'.join(lines)
+
+def main(argv: List[str]=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark plate image pipeline stages against stored baselines.')
+    parser.add_argument('--photos', default=PipelineBenchmark.PHOTO_FOLDER, help='folder containing plate photos')
+    parser.add_argument('--scales', type=int, nargs='+', default=list(PipelineBenchmark.DEFAULT_SCALES), help='upscaling factors of synthetic variants')
+    parser.add_argument('--baselines', default=PipelineBenchmark.BASELINE_PATH, help='baseline JSON file')
+    parser.add_argument('--update-baselines', action='store_true', help='store results as new baselines instead of comparing')
+    parser.add_argument('--output', help='optional JSON file to write results to')
+    args = parser.parse_args(argv)
+
+    benchmark = PipelineBenchmark(args.photos, tuple(args.scales))
+    results = benchmark.run()
+    print(PipelineBenchmark.format_results(results))
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=4)
+
+    if args.update_baselines:
+        with open(args.baselines, 'w') as file:
+            json.dump(results, file, indent=4)
+        print(f"Baselines written to {args.baselines}")
+        return 0
+
+    if not os.path.exists(args.baselines):
+        print(f"No baselines found at {args.baselines}, run with --update-baselines first.")
+        return 1
+
+    with open(args.baselines, 'r') as file:
+        baselines = json.load(file)
+
+    regressions = PipelineBenchmark.compare(results, baselines)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,19 +1,35 @@
 import sys
+import atexit
 
 from PyQt6.QtWidgets import QApplication
 
 from app.backend.data_mgr import DataManager
+from app.backend.utils.memory_diagnostics import MemoryDiagnostics
 from app.frontend.main.main_window import MainWindow
 
 from app.config import \
     USER_PREFERENCE_FILE_PATH, \
     ROUTER_DATA_PATH, \
     PLATE_DATA_PATH, \
-    TEMP_PATHS
+    TEMP_PATHS, \
+    JOURNAL_PATH, \
+    STORAGE_BACKEND, \
+    INVENTORY_DB_PATH, \
+    PLATE_GEOMETRY_DATA_PATH, \
+    JOB_WORKSPACE_PATH, \
+    MEMORY_DIAGNOSTICS_ENABLED, \
+    MEMORY_REPORT_PATH
 
 if __name__ == '__main__':
+    if MEMORY_DIAGNOSTICS_ENABLED:
+        MemoryDiagnostics.enable()
+        atexit.register(MemoryDiagnostics.save_report, MEMORY_REPORT_PATH)
+
     app = QApplication([])
-    data_manager = DataManager(USER_PREFERENCE_FILE_PATH, ROUTER_DATA_PATH, PLATE_DATA_PATH, TEMP_PATHS)
+    database_path = INVENTORY_DB_PATH if STORAGE_BACKEND == 'sqlite' else None
+    data_manager = DataManager(USER_PREFERENCE_FILE_PATH, ROUTER_DATA_PATH, PLATE_DATA_PATH, TEMP_PATHS, JOURNAL_PATH,
+                               database_path=database_path, geometry_folder=PLATE_GEOMETRY_DATA_PATH,
+                               workspace_folder=JOB_WORKSPACE_PATH)
     main_window = MainWindow(data_manager)
     main_window.show()
     sys.exit(app.exec())
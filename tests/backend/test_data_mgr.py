@@ -0,0 +1,282 @@
+import os
+import time
+import atexit
+import pytest
+import numpy as np
+from app.backend.data_mgr import DataManager
+from app.backend.utils.file_processor import FileProcessor
+from app.backend.utils.contour_util import ContourUtil
+from app.backend.utils.job_workspace import JobWorkspace
+from app.backend.utils.plate_util import PlateUtil
+from app.backend.utils.image_conversion.utils import Size
+from app.backend.utils.image_conversion.multi_plate import PlateResult
+
+@pytest.fixture
+def paths(tmp_path):
+    paths = {
+        "user_pref_path": str(tmp_path / "user_preferences.json"),
+        "router_data_path": str(tmp_path / "router_data.csv"),
+        "plate_data_path": str(tmp_path / "plate_data.csv"),
+        "temp_data_folders": [],
+        "journal_path": str(tmp_path / "journal.jsonl")
+    }
+    FileProcessor.write_file(paths["user_pref_path"], {"processing_profile": "standard"}, 'json')
+    FileProcessor.write_file(paths["router_data_path"], [{"id": "0", "name": "Router"}])
+    FileProcessor.write_file(paths["plate_data_path"], [{"id": "0", "name": "Plate 0"}, {"id": "1", "name": "Plate 1"}])
+    return paths
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+def create(paths, **kwargs):
+    kwargs.setdefault("autosave_interval", 3600)
+    data_manager = DataManager(**paths, sync_interval=0, **kwargs)
+    atexit.unregister(data_manager._atexit)
+    return data_manager
+
+def test_replay_after_crash(paths):
+    data_manager = create(paths)
+    data_manager.plate_data[0]["name"] = "Renamed"
+    data_manager.update_plate(data_manager.plate_data[0])
+    data_manager.remove_plate(1)
+    new_plate = {"id": 2, "name": "Plate 2"}
+    data_manager.plate_data.append(new_plate)
+    data_manager.update_plate(new_plate)
+    data_manager.set_preference("processing_profile", "high")
+    data_manager._journal.close() # crash, snapshot files untouched
+
+    assert len(FileProcessor.read_file(paths["plate_data_path"])) == 2
+
+    recovered = create(paths)
+    assert [plate["name"] for plate in recovered.plate_data] == ["Renamed", "Plate 2"]
+    assert recovered.user_preferences["processing_profile"] == "high"
+    recovered._journal.close()
+
+def test_compaction(paths):
+    data_manager = create(paths, compaction_threshold=3)
+    for i in range(3):
+        router = {"id": i + 1, "name": f"Router {i + 1}"}
+        data_manager.router_data.append(router)
+        data_manager.update_router(router)
+    wait_for(lambda: data_manager._journal.entry_count == 0)
+
+    assert len(FileProcessor.read_file(paths["router_data_path"])) == 4
+    assert not os.path.exists(paths["journal_path"] + ".old")
+    assert data_manager._journal.entry_count == 0
+    data_manager._journal.close()
+
+def test_autosave_coalesces_edits(paths):
+    data_manager = create(paths, autosave_interval=0.2)
+    saves = []
+    save_snapshot = data_manager._save_snapshot
+    data_manager._save_snapshot = lambda snapshot: saves.append(set(snapshot)) or save_snapshot(snapshot)
+
+    for i in range(5):
+        data_manager.set_preference("processing_profile", f"profile {i}")
+    data_manager.remove_router(0)
+    wait_for(lambda: saves)
+    time.sleep(0.3)
+
+    assert saves == [{"preferences", "routers"}]
+    assert FileProcessor.read_file(paths["user_pref_path"])["processing_profile"] == "profile 4"
+    assert FileProcessor.read_file(paths["router_data_path"]) == []
+    data_manager._atexit()
+
+def test_failed_snapshot_keeps_collections_dirty(paths):
+    data_manager = create(paths)
+    data_manager.remove_router(0)
+    get_snapshot = data_manager._get_snapshot
+    data_manager._get_snapshot = lambda collections: 1 / 0
+
+    data_manager._compact()
+    assert data_manager._dirty == {"routers"}
+
+    data_manager._get_snapshot = get_snapshot
+    data_manager._compact()
+    assert FileProcessor.read_file(paths["router_data_path"]) == []
+    assert data_manager._dirty == set()
+    data_manager._journal.close()
+
+def test_recorded_copy_leaves_snapshot_untouched(paths):
+    data_manager = create(paths)
+    data_manager.remove_router(0)
+    snapshot = data_manager._get_snapshot({"plates"})
+
+    plate = data_manager.plate_data[0].copy()
+    plate["name"] = "Renamed"
+    data_manager.update_plate(plate)
+
+    assert snapshot["plates"][0]["name"] == "Plate 0"
+    assert data_manager.plate_data[0] is plate
+    data_manager._journal.close()
+
+def test_atexit_saves_snapshot(paths):
+    data_manager = create(paths)
+    data_manager.remove_router(0)
+    data_manager._atexit()
+
+    assert FileProcessor.read_file(paths["router_data_path"]) == []
+    assert create(paths).router_data == []
+
+def test_interrupted_compaction_is_recovered(paths):
+    data_manager = create(paths)
+    data_manager.remove_plate(0)
+    data_manager._journal.rotate() # crash before snapshot was saved
+    data_manager._journal.close()
+
+    recovered = create(paths)
+    assert [plate["id"] for plate in recovered.plate_data] == [1]
+    assert not os.path.exists(paths["journal_path"] + ".old")
+    assert [plate["id"] for plate in FileProcessor.read_file(paths["plate_data_path"])] == ["1"]
+    recovered._journal.close()
+
+def test_sqlite_backend_migrates_and_persists(paths, tmp_path):
+    database_path = str(tmp_path / "inventory.db")
+    data_manager = create(paths, database_path=database_path)
+
+    assert data_manager.plate_data.ids() == [0, 1]
+    assert data_manager.router_data[0]["name"] == "Router"
+    assert data_manager.user_preferences == {"processing_profile": "standard"}
+
+    plate = data_manager.plate_data[0]
+    plate["material"] = "Steel"
+    data_manager.update_plate(plate)
+    data_manager.remove_plate(1)
+    data_manager.set_preference("processing_profile", "draft")
+    data_manager._atexit()
+
+    reopened = create(paths, database_path=database_path)
+    assert reopened.plate_data.ids() == [0]
+    assert reopened.plate_data[0]["material"] == "Steel"
+    assert reopened.user_preferences["processing_profile"] == "draft"
+    assert [plate["id"] for plate in reopened.query_plates(material="Steel")] == [0]
+    reopened._atexit()
+
+def test_query_plates_without_store(paths):
+    data_manager = create(paths)
+    for plate in data_manager.plate_data:
+        plate.update({"material": "Steel", "thickness_(z)": "5", "width_(x)": "100", "height_(y)": "400"})
+
+    assert len(data_manager.query_plates(material="Steel", thickness=5, min_width=300, min_height=50)) == 2
+    assert data_manager.query_plates(min_width=300, min_height=300) == []
+    data_manager._journal.close()
+
+def test_geometry_sidecars(paths, tmp_path):
+    geometry_folder = str(tmp_path / "geometry")
+    data_manager = create(paths, geometry_folder=geometry_folder)
+    plate = data_manager.plate_data[0]
+    plate["contours"] = [[[0, 0], [10, 0], [10, 10]]]
+    plate["contour_parents"] = [-1]
+    data_manager.update_plate(plate)
+    data_manager._atexit()
+
+    saved = FileProcessor.read_file(paths["plate_data_path"])
+    assert saved[0]["contours"].startswith(ContourUtil.SIDECAR_PREFIX)
+    assert len(os.listdir(geometry_folder)) == 2
+
+    reloaded = create(paths, geometry_folder=geometry_folder)
+    assert ContourUtil.serialize(ContourUtil.deserialize(reloaded.plate_data[0]["contours"])) == [[[0, 0], [10, 0], [10, 10]]]
+
+    reloaded.plate_data[0]["contours"] = [[[0, 0], [5, 0], [5, 5]]]
+    reloaded.update_plate(reloaded.plate_data[0])
+    reloaded._atexit()
+
+    saved = FileProcessor.read_file(paths["plate_data_path"])
+    assert sorted(os.listdir(geometry_folder)) == sorted(os.path.basename(path) for path in ContourUtil.get_sidecar_paths(saved[0]["contours"]))
+
+def test_saved_geometry_is_referenced_by_live_plate(paths, tmp_path, monkeypatch):
+    data_manager = create(paths, geometry_folder=str(tmp_path / "geometry"))
+    plate = data_manager.plate_data[0].copy()
+    plate["contours"] = [[[0, 0], [10, 0], [10, 10]]]
+    data_manager.update_plate(plate)
+    data_manager._compact()
+
+    assert ContourUtil.is_sidecar(plate._contours)
+    assert ContourUtil.serialize(plate["contours"]) == [[[0, 0], [10, 0], [10, 10]]]
+
+    saved = []
+    save_sidecar = ContourUtil.save_sidecar
+    monkeypatch.setattr(ContourUtil, "save_sidecar", lambda *args: saved.append(args) or save_sidecar(*args))
+    other = data_manager.plate_data[1].copy()
+    other["name"] = "Renamed"
+    data_manager.update_plate(other)
+    data_manager._compact()
+
+    assert saved == []
+    assert FileProcessor.read_file(paths["plate_data_path"])[0]["contours"] == plate._contours
+    data_manager._journal.close()
+
+def test_only_changed_files_are_written(paths):
+    data_manager = create(paths)
+    modified = {key: os.stat(paths[key]).st_mtime_ns for key in ("user_pref_path", "router_data_path", "plate_data_path")}
+    data_manager.remove_router(0)
+    data_manager._atexit()
+
+    assert os.stat(paths["user_pref_path"]).st_mtime_ns == modified["user_pref_path"]
+    assert os.stat(paths["plate_data_path"]).st_mtime_ns == modified["plate_data_path"]
+    assert FileProcessor.read_file(paths["router_data_path"]) == []
+
+def test_find_fitting_plates(paths):
+    data_manager = create(paths)
+    for plate in data_manager.plate_data:
+        plate.update({"material": "Steel", "thickness_(z)": 5, "width_(x)": 100, "height_(y)": 400})
+
+    assert [plate["id"] for plate in data_manager.find_fitting_plates("Steel", 5, 300, 80)] == [0, 1]
+    assert data_manager.find_fitting_plates("Steel", 5, 300, 80, allow_rotation=False) == []
+
+    plate = data_manager.plate_data[1]
+    plate["width_(x)"] = 50
+    data_manager.update_plate(plate)
+    assert [plate["id"] for plate in data_manager.find_fitting_plates("Steel", 5, 300, 80)] == [0]
+
+    data_manager.remove_plate(0)
+    assert data_manager.find_fitting_plates("Steel", 5, 300, 80) == []
+    data_manager._journal.close()
+
+def test_find_fitting_plates_after_widget_removal(paths):
+    data_manager = create(paths)
+    for plate in data_manager.plate_data:
+        plate.update({"material": "Steel", "thickness_(z)": 5, "width_(x)": 100, "height_(y)": 400})
+    assert [plate["id"] for plate in data_manager.find_fitting_plates("Steel", 5, 300, 80)] == [0, 1]
+
+    data_manager.plate_data.pop(0) # record already gone when its removal is recorded
+    data_manager.remove_plate(0)
+    assert [plate["id"] for plate in data_manager.find_fitting_plates("Steel", 5, 300, 80)] == [1]
+    data_manager._journal.close()
+
+def test_add_digitized_plates(paths, tmp_path, monkeypatch):
+    monkeypatch.setattr(PlateUtil, "get_preview_path", lambda id: str(tmp_path / f"{id}.png"))
+    data_manager = create(paths)
+    data_manager.plate_data[1]["preview_path"] = str(tmp_path / "1.png")
+    contours = [np.array([[0, 0], [300, 0], [300, 200], [0, 200]], dtype=np.float32)]
+    results = [
+        PlateResult(0, None, Size(301, 199), 1, contours=contours, contour_parents=[-1]),
+        PlateResult(1, None, Size(150.04, 80.02), None, contours=contours, contour_parents=[-1]),
+        PlateResult(2, None, error="3 corners found, plate needs review")
+    ]
+
+    plates = data_manager.add_digitized_plates(results, "draft")
+
+    assert [plate["id"] for plate in plates] == [1, 2]
+    assert np.array_equal(data_manager.plate_data.get(1).contours[0], contours[0])
+    assert (plates[1]["width_(x)"], plates[1]["height_(y)"], plates[1]["processing_profile"]) == (150.0, 80.0, "draft")
+    assert len(data_manager.plate_data) == 3 and os.path.exists(plates[1]["preview_path"])
+    data_manager._journal.close()
+
+def test_imported_parts_restored_from_workspace(paths, tmp_path):
+    workspace_folder = str(tmp_path / "workspace")
+    source_path = tmp_path / "part.stl"
+    source_path.write_bytes(b"solid part")
+
+    data_manager = create(paths, workspace_folder=workspace_folder)
+    assert data_manager.imported_parts == []
+    data_manager.imported_parts.append({"filename": "part.stl", "amount": 3, "outer_contour": [[0, 0], [1, 0], [1, 1]],
+                                        "thickness": 2.0, "preview_path": None, **JobWorkspace.get_source_info(str(source_path))})
+    data_manager._atexit()
+
+    restored = create(paths, workspace_folder=workspace_folder)
+    assert [(part["filename"], part["amount"]) for part in restored.imported_parts] == [("part.stl", 3)]
+    restored._journal.close()
@@ -0,0 +1,72 @@
+import time
+import threading
+import pytest
+from app.backend.utils.autosave import Autosave
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_invalid_interval():
+    with pytest.raises(ValueError):
+        Autosave(lambda: None, -1)
+
+def test_no_thread_without_changes():
+    autosave = Autosave(lambda: None, 0)
+    assert autosave._thread is None
+    autosave.stop()
+
+def test_notifications_are_coalesced():
+    saves = []
+    autosave = Autosave(lambda: saves.append(time.monotonic()), 0.2)
+    start = time.monotonic()
+    for _ in range(10):
+        autosave.notify()
+
+    assert wait_for(lambda: saves)
+    time.sleep(0.3)
+    assert len(saves) == 1
+    assert saves[0] - start >= 0.2
+
+    autosave.notify()
+    assert wait_for(lambda: len(saves) == 2)
+    autosave.stop()
+
+def test_urgent_notification_saves_right_away():
+    saves = []
+    autosave = Autosave(lambda: saves.append(1), 3600)
+    autosave.notify()
+    autosave.notify(urgent=True)
+    assert wait_for(lambda: saves)
+    autosave.stop()
+
+def test_stop_waits_for_save_in_progress():
+    started, finished = threading.Event(), []
+    def save():
+        started.set()
+        time.sleep(0.2)
+        finished.append(1)
+
+    autosave = Autosave(save, 0)
+    autosave.notify()
+    started.wait(5)
+    autosave.stop()
+    assert finished == [1]
+
+    autosave.notify()
+    assert not autosave._thread.is_alive()
+
+def test_save_errors_are_logged():
+    saves = []
+    def save():
+        saves.append(1)
+        raise OSError("disk full")
+
+    autosave = Autosave(save, 0)
+    autosave.notify()
+    assert wait_for(lambda: saves)
+    autosave.notify()
+    assert wait_for(lambda: len(saves) == 2)
+    autosave.stop()
@@ -0,0 +1,83 @@
+import os
+import csv
+import json
+import numpy as np
+import cv2
+import pytest
+from app.backend.utils.image_conversion.batch import BatchDigitizer
+from app.backend.utils.image_conversion.filters import BinaryFilter
+from app.backend.utils.image_conversion.station import StationProfile
+from app.backend.utils.image_conversion.utils import Size
+
+@pytest.fixture
+def batch_input(tmp_path):
+    photo_folder = tmp_path / 'photos'
+    photo_folder.mkdir()
+
+    plate = np.full((2000, 2000, 3), 40, dtype=np.uint8)
+    cv2.rectangle(plate, (300, 300), (1700, 1700), (200, 200, 200), -1)
+    cv2.circle(plate, (1000, 1000), 150, (40, 40, 40), -1)
+    cv2.imwrite(str(photo_folder / 'plate.png'), plate)
+
+    triangle = np.full((2000, 2000, 3), 40, dtype=np.uint8)
+    cv2.fillPoly(triangle, [np.array([[300, 1700], [1700, 1700], [1000, 300]])], (200, 200, 200))
+    cv2.imwrite(str(photo_folder / 'triangle.png'), triangle)
+
+    manifest_path = tmp_path / 'manifest.csv'
+    with open(manifest_path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=['filename', 'width_(x)', 'height_(y)', 'material'])
+        writer.writeheader()
+        writer.writerow({'filename': 'plate.png', 'width_(x)': 200, 'height_(y)': 200, 'material': 'Aluminum'})
+        writer.writerow({'filename': 'triangle.png', 'width_(x)': 200, 'height_(y)': 200, 'material': 'Aluminum'})
+        writer.writerow({'filename': 'missing.png', 'width_(x)': 200, 'height_(y)': 200, 'material': 'Aluminum'})
+
+    return str(photo_folder), str(manifest_path), str(tmp_path / 'output')
+
+def test_auto_threshold_separates_plate(tmp_path):
+    image = np.full((100, 100, 3), 40, dtype=np.uint8)
+    image[25:75, 25:75] = 200
+    src_path = str(tmp_path / 'raw.png')
+    cv2.imwrite(src_path, image)
+
+    assert 40 <= BinaryFilter.get_auto_threshold(src_path) < 200
+
+def test_batch_digitizer(batch_input):
+    output_folder = batch_input[2]
+    results = BatchDigitizer(*batch_input, max_workers=2).run()
+
+    assert [result.status for result in results] == [BatchDigitizer.ACCEPTED, BatchDigitizer.REVIEW, BatchDigitizer.FAILED]
+
+    accepted = results[0]
+    assert len(accepted.corners) == 4
+    assert accepted.contour_parents[0] == -1
+    assert len(accepted.contours) == len(accepted.contour_parents) > 1
+    assert accepted.plate['material'] == 'Aluminum'
+
+    with open(os.path.join(accepted.data_folder, BatchDigitizer.CONTOURS_NAME)) as file:
+        assert json.load(file)['contour_parents'] == accepted.contour_parents
+
+    with open(os.path.join(output_folder, BatchDigitizer.REVIEW_QUEUE_NAME), newline='') as file:
+        assert [row['filename'] for row in csv.DictReader(file)] == ['triangle.png', 'missing.png']
+
+def test_batch_digitizer_station_without_plate(batch_input, tmp_path):
+    photo_folder, manifest_path, output_folder = batch_input
+    station_path = str(tmp_path / 'station.json')
+    StationProfile([(300, 300), (1700, 300), (300, 1700), (1700, 1700)], Size(2000, 2000)).save(station_path)
+
+    cv2.imwrite(os.path.join(photo_folder, 'plate.png'), np.zeros((2000, 2000, 3), dtype=np.uint8))
+    stale_folder = os.path.join(output_folder, 'plate')
+    os.makedirs(stale_folder)
+    cv2.imwrite(os.path.join(stale_folder, 'flat.png'), np.full((400, 400), 255, dtype=np.uint8)) # left by an earlier run
+
+    results = BatchDigitizer(photo_folder, manifest_path, output_folder, max_workers=1, station_profile_path=station_path).run()
+
+    assert results[0].status == BatchDigitizer.REVIEW
+    assert results[0].error == "no plate found"
+    assert results[0].contours is None
+
+def test_batch_digitizer_invalid_manifest(tmp_path):
+    manifest_path = tmp_path / 'manifest.csv'
+    manifest_path.write_text('filename,width_(x)\nplate.png,200\n')
+
+    with pytest.raises(ValueError):
+        BatchDigitizer(str(tmp_path), str(manifest_path), str(tmp_path / 'output'))
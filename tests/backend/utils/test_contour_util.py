@@ -0,0 +1,108 @@
+import os
+import pytest
+import numpy as np
+import cv2
+from concurrent.futures import ThreadPoolExecutor
+from app.backend.utils.contour_util import ContourUtil
+
+@pytest.fixture
+def plate_with_hole():
+    image = np.zeros((500, 500), dtype=np.uint8)
+    cv2.rectangle(image, (50, 50), (450, 450), 255, -1)
+    cv2.rectangle(image, (150, 150), (250, 250), 0, -1)
+    return image
+
+def test_finalize_plate_with_hole(plate_with_hole):
+    contours, hierarchy = cv2.findContours(plate_with_hole, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    finalized, parents = ContourUtil.finalize(contours, hierarchy, 5, 0.5)
+
+    assert parents == [-1, 0]
+    assert all(contour.dtype == np.float32 for contour in finalized)
+    assert all(contour.shape == (4, 2) for contour in finalized)
+    assert finalized[0].min() == pytest.approx(10)
+    assert finalized[0].max() == pytest.approx(90)
+
+def test_finalize_drops_degenerate_contours():
+    square = np.array([[[0, 0]], [[10, 0]], [[10, 10]], [[0, 10]]], dtype=np.int32)
+    line = np.array([[[0, 0]], [[10, 0]]], dtype=np.int32)
+    # outline -> degenerate line -> square
+    hierarchy = np.array([[[-1, -1, 1, -1], [-1, -1, 2, 0], [-1, -1, -1, 1]]], dtype=np.int32)
+
+    finalized, parents = ContourUtil.finalize([square, line, square], hierarchy, 1, 0.5)
+
+    assert len(finalized) == 2
+    assert parents == [-1, 0]
+
+def test_finalize_empty():
+    assert ContourUtil.finalize([], None, 5, 0.5) == ([], [])
+
+def test_get_depths():
+    assert ContourUtil.get_depths([-1, 0, 1, -1, 2]) == [0, 1, 2, 0, 3]
+
+def test_serialize_round_trip():
+    contours = [np.array([[1.234, 2.345], [3.0, 4.0], [5.5, 6.5]], dtype=np.float32)]
+    data = ContourUtil.serialize(contours)
+
+    assert data == [[[1.23, 2.35], [3.0, 4.0], [5.5, 6.5]]]
+    restored = ContourUtil.deserialize(data)
+    assert restored[0].dtype == np.float32
+    assert np.allclose(restored[0], contours[0], atol=0.01)
+
+def test_deserialize_csv_string():
+    contours = ContourUtil.deserialize('[[[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]]')
+    assert contours[0].shape == (3, 2)
+    assert ContourUtil.deserialize_parents('[-1]') == [-1]
+    assert ContourUtil.deserialize('') == []
+    assert ContourUtil.deserialize(None) == []
+
+def test_sidecar_round_trip(tmp_path):
+    contours = [[[0, 0], [10, 0], [10, 10]], [[2, 2], [4, 2], [4, 4], [2, 4]]]
+    reference = ContourUtil.save_sidecar(str(tmp_path), "3", contours)
+
+    assert ContourUtil.is_sidecar(reference)
+    assert all(os.path.exists(path) for path in ContourUtil.get_sidecar_paths(reference))
+
+    loaded = ContourUtil.deserialize(reference)
+    assert isinstance(loaded[0].base, np.memmap) or isinstance(loaded[0], np.memmap)
+    assert ContourUtil.serialize(loaded) == contours
+
+def test_sidecar_unchanged_geometry_is_reused(tmp_path):
+    contours = [[[0, 0], [10, 0], [10, 10]]]
+    reference = ContourUtil.save_sidecar(str(tmp_path), "1", contours)
+    modified = os.path.getmtime(ContourUtil.get_sidecar_paths(reference)[0])
+
+    assert ContourUtil.save_sidecar(str(tmp_path), "1", np.array(contours, dtype=np.float32)) == reference
+    assert os.path.getmtime(ContourUtil.get_sidecar_paths(reference)[0]) == modified
+    assert ContourUtil.save_sidecar(str(tmp_path), "1", [[[0, 0], [5, 0], [5, 5]]]) != reference
+
+def test_empty_sidecar(tmp_path):
+    reference = ContourUtil.save_sidecar(str(tmp_path), "0", [])
+    assert ContourUtil.deserialize(reference) == []
+
+def test_sidecar_cache_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(ContourUtil, "SIDECAR_CACHE_SIZE", 2)
+    ContourUtil._sidecar_cache.clear()
+    references = [ContourUtil.save_sidecar(str(tmp_path), str(i), [[[0, 0], [i, 0], [i, i]]]) for i in range(1, 4)]
+
+    for reference in references:
+        ContourUtil.deserialize(reference)
+    assert list(ContourUtil._sidecar_cache) == references[1:]
+
+    ContourUtil.deserialize(references[1])
+    assert list(ContourUtil._sidecar_cache) == [references[2], references[1]]
+    ContourUtil._sidecar_cache.clear()
+
+def test_sidecar_cache_shared_between_threads(tmp_path, monkeypatch):
+    monkeypatch.setattr(ContourUtil, "SIDECAR_CACHE_SIZE", 2)
+    ContourUtil._sidecar_cache.clear()
+    references = [ContourUtil.save_sidecar(str(tmp_path), str(i), [[[0, 0], [i, 0], [i, i]]]) for i in range(1, 9)]
+
+    def load(offset):
+        return [ContourUtil.deserialize(references[(offset + i) % len(references)])[0][1][0] for i in range(200)]
+
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(load, range(4)))
+
+    assert all(result == [float((offset + i) % len(references) + 1) for i in range(200)] for offset, result in enumerate(results))
+    assert len(ContourUtil._sidecar_cache) == 2
+    ContourUtil._sidecar_cache.clear()
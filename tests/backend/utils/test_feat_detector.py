@@ -1,5 +1,6 @@
 import os
 import numpy as np
+import cv2
 import pytest
 from app.backend.utils.image_conversion.utils import Size
 from app.backend.utils.image_conversion.features import FeatDetector
@@ -18,4 +19,33 @@ def test_contours_extraction(valid_input):
 
     assert features.plate_contour is not None
     assert isinstance(features.plate_contour, np.ndarray)
-    assert isinstance(features.other_contours, list)
\ No newline at end of file
+    assert isinstance(features.other_contours, list)
+
+@pytest.fixture
+def synthetic_input(tmp_path):
+    image = np.zeros((1000, 1000), dtype=np.uint8)
+    cv2.rectangle(image, (200, 200), (800, 800), 255, -1)  # plate
+    cv2.rectangle(image, (400, 400), (500, 500), 0, -1)    # hole
+    cv2.rectangle(image, (0, 0), (60, 60), 255, -1)        # noise touching image edge
+    cv2.rectangle(image, (900, 100), (905, 105), 255, -1)  # noise below area threshold
+    src_path = str(tmp_path / 'bin.png')
+    cv2.imwrite(src_path, image)
+    return src_path, Size(1000, 1000)
+
+def test_contours_filtered_by_area_and_edge(synthetic_input):
+
+    features = FeatDetector(*synthetic_input).features
+
+    assert cv2.boundingRect(features.plate_contour) == (200, 200, 601, 601)
+    assert len(features.other_contours) == 1
+    assert cv2.boundingRect(features.other_contours[0]) == (399, 399, 103, 103)
+
+def test_corners_of_rectangular_plate(tmp_path):
+    image = np.zeros((2000, 2000), dtype=np.uint8)
+    cv2.rectangle(image, (300, 300), (1700, 1700), 255, -1)
+    src_path = str(tmp_path / 'bin.png')
+    cv2.imwrite(src_path, image)
+
+    corners = FeatDetector(src_path, Size(2000, 2000)).features.corners
+
+    assert sorted(corners) == [(300, 300), (300, 1700), (1700, 300), (1700, 1700)]
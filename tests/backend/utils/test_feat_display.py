@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from app.backend.utils.image_conversion.utils import Size, Colors
+from app.backend.utils.image_conversion.features import Features, FeatDisplay, FeatEditor
+
+def square_contour(x, y, side):
+    return np.array([[[x, y]], [[x + side, y]], [[x + side, y + side]], [[x, y + side]]], dtype=np.int32)
+
+@pytest.fixture
+def features():
+    return Features(
+        plate_contour=square_contour(50, 50, 900),
+        other_contours=[square_contour(200, 200, 50), square_contour(600, 200, 50), square_contour(200, 600, 50)],
+        corners=[(50, 50), (950, 50), (950, 950), (50, 950)]
+    )
+
+def fresh_render(features):
+    display = FeatDisplay("unused.png", Size(1000, 1000), features, Colors())
+    display.render()
+    return display.canvas
+
+def test_first_render_is_full(features):
+    display = FeatDisplay("unused.png", Size(1000, 1000), features, Colors())
+    assert display.render() == [(0, 0, 1000, 1000)]
+    assert display.render() == []
+
+def test_incremental_render_matches_full_render(features):
+    display = FeatDisplay("unused.png", Size(1000, 1000), features, Colors())
+    editor = FeatEditor(Size(1000, 1000), features, 1000)
+    display.render()
+
+    editor.select_contour(1)
+    rects = display.render()
+    assert all(w * h < 100 * 100 for _, _, w, h in rects)
+    assert np.array_equal(display.canvas, fresh_render(features))
+
+    editor.remove_contour()
+    display.render()
+    assert np.array_equal(display.canvas, fresh_render(features))
+
+    editor.select_corner(2)
+    display.render()
+    assert np.array_equal(display.canvas, fresh_render(features))
+
+    editor.remove_corner()
+    display.render()
+    assert np.array_equal(display.canvas, fresh_render(features))
+
+def test_region_redraw_only_touches_intersecting_contours(features):
+    display = FeatDisplay("unused.png", Size(1000, 1000), features, Colors())
+    contours = display._get_contours_in_region((190, 190), (80, 80))
+    assert len(contours) == 1 and contours[0] is features.other_contours[0]
+    assert display._get_contours_in_region((400, 400), (100, 100)) == []
+    assert len(display._get_contours_in_region((0, 0), (1000, 1000))) == 3
+
+def test_save_features(features, tmp_path):
+    dst_path = tmp_path / 'feat.png'
+    FeatDisplay(str(dst_path), Size(1000, 1000), features, Colors()).save_features()
+    assert dst_path.exists()
@@ -1,6 +1,7 @@
 import pytest
 import math
-from app.backend.utils.image_conversion.features import FeatEditor, Size, Features
+import numpy as np
+from app.backend.utils.image_conversion.features import FeatEditor, FeatIndex, Size, Features
 
 # fix these tests
 
@@ -49,4 +50,71 @@ def test_remove_contour(feat_editor):
 def test_add_corner(feat_editor):
     feat_editor.features.corners = []
     feat_editor.add_corner((50, 60))
-    assert feat_editor.features.corners == [(int(50/feat_editor.pixmap_scale_factor), int(60/feat_editor.pixmap_scale_factor))]
\ No newline at end of file
+    assert feat_editor.features.corners == [(int(50/feat_editor.pixmap_scale_factor), int(60/feat_editor.pixmap_scale_factor))]
+
+def test_feature_selected_contour(feat_editor):
+    feat_editor.features.other_contours = [np.array([[[100, 100]], [[100, 200]]]), np.array([[[500, 500]], [[600, 500]]])]
+    feat_editor.features.corners = [(900, 900)]
+    assert feat_editor.feature_selected((110, 105))  # pixmap scale factor is 0.2
+    assert feat_editor.features.selected_contour_idx == 1
+    assert feat_editor.features.selected_corner_idx is None
+
+def test_feature_selected_corner(feat_editor):
+    feat_editor.features.other_contours = [np.array([[[100, 100]], [[100, 200]]])]
+    feat_editor.features.corners = [(10, 10), (900, 900)]
+    assert feat_editor.feature_selected((175, 185))
+    assert feat_editor.features.selected_corner_idx == 1
+    assert feat_editor.features.selected_contour_idx is None
+
+def test_feature_selected_nothing_close(feat_editor):
+    feat_editor.features.other_contours = [np.array([[[100, 100]], [[100, 200]]])]
+    feat_editor.features.corners = [(900, 900)]
+    assert not feat_editor.feature_selected((100, 100))
+
+def test_feature_selected_after_removal(feat_editor):
+    feat_editor.features.other_contours = [np.array([[[100, 100]]]), np.array([[[500, 500]]]), np.array([[[900, 900]]])]
+    feat_editor.features.corners = []
+    feat_editor.select_contour(0)
+    feat_editor.remove_contour()
+    assert not feat_editor.feature_selected((20, 20))
+    assert feat_editor.feature_selected((180, 180))
+    assert feat_editor.features.selected_contour_idx == 1
+
+def test_feature_selected_added_corner(feat_editor):
+    feat_editor.features.other_contours = []
+    feat_editor.features.corners = []
+    feat_editor.add_corner((50, 60))
+    assert feat_editor.feature_selected((52, 58))
+    assert feat_editor.features.selected_corner_idx == 0
+
+def test_feature_selected_after_replacement(feat_editor):
+    feat_editor.features.other_contours = [np.array([[[100, 100]]]), np.array([[[500, 500]]])]
+    feat_editor.features.corners = []
+    assert feat_editor.feature_selected((100, 100))
+    assert feat_editor.features.selected_contour_idx == 1
+
+    feat_editor.features.other_contours = [np.array([[[900, 900]]]), np.array([[[300, 300]]])] # same length, new contours
+    assert not feat_editor.feature_selected((100, 100))
+    assert feat_editor.feature_selected((60, 60))
+    assert feat_editor.features.selected_contour_idx == 1
+
+    feat_editor.features.other_contours.reverse()
+    assert feat_editor.feature_selected((60, 60))
+    assert feat_editor.features.selected_contour_idx == 0
+
+def test_feature_selected_after_corner_removal(feat_editor):
+    feat_editor.features.other_contours = []
+    feat_editor.features.corners = [(100, 100), (500, 500), (900, 900)]
+    feat_editor.select_corner(0)
+    feat_editor.remove_corner()
+    assert feat_editor.feature_selected((180, 180))
+    assert feat_editor.features.selected_corner_idx == 1
+
+def test_feat_index_remove():
+    index = FeatIndex(20)
+    index.insert(FeatIndex.CONTOUR, 0, np.array([[10, 10], [300, 300]]))
+    index.insert(FeatIndex.CONTOUR, 1, np.array([[15, 15]]))
+    assert index.nearest((14, 14), 20, FeatIndex.CONTOUR) == 1
+    index.remove(FeatIndex.CONTOUR, 1)
+    assert index.nearest((14, 14), 20, FeatIndex.CONTOUR) == 0
+    assert index.nearest((14, 14), 20, FeatIndex.CORNER) is None
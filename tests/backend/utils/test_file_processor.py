@@ -1,4 +1,5 @@
 import os
+import time
 import tempfile
 import json
 import csv
@@ -81,6 +82,37 @@ def test_write_multiple_json_to_folder(temp_dir):
         with open(filepath, "r") as f:
             assert json.load(f) == item
 
+def test_write_multiple_json_to_folder_is_incremental(temp_dir):
+    data = [{"filename": f"file{i}.json", "value": i} for i in range(3)]
+    FileProcessor.write_multiple_json_to_folder(data, temp_dir)
+    paths = [os.path.join(temp_dir, item["filename"]) for item in data]
+    stats = [os.stat(path).st_mtime_ns for path in paths]
+    with open(os.path.join(temp_dir, "stray.txt"), "w") as f:
+        f.write("")
+
+    time.sleep(0.01)
+    data[1]["value"] = 10
+    FileProcessor.write_multiple_json_to_folder(data[:2] + [{"filename": "file3.json"}], temp_dir)
+
+    assert os.stat(paths[0]).st_mtime_ns == stats[0]
+    assert os.stat(paths[1]).st_mtime_ns != stats[1]
+    assert sorted(os.listdir(temp_dir)) == [FileProcessor.MANIFEST_FILE, "file0.json", "file1.json", "file3.json"]
+    assert FileProcessor.read_all_json_in_folder(temp_dir) == [data[0], data[1], {"filename": "file3.json"}]
+
+def test_write_multiple_json_to_folder_rewrites_modified_files(temp_dir):
+    data = [{"filename": "file1.json"}]
+    FileProcessor.write_multiple_json_to_folder(data, temp_dir)
+    with open(os.path.join(temp_dir, "file1.json"), "w") as f:
+        f.write("{}")
+
+    FileProcessor.write_multiple_json_to_folder(data, temp_dir)
+    assert FileProcessor.read_all_json_in_folder(temp_dir) == data
+
+def test_write_multiple_json_to_folder_invalid_data(temp_dir):
+    FileProcessor.write_multiple_json_to_folder([{"filename": "file1.json"}], temp_dir)
+    FileProcessor.write_multiple_json_to_folder([{"id": 1}], temp_dir)
+    assert os.path.exists(os.path.join(temp_dir, "file1.json"))
+
 def test_get_all_filenames_in_folder(temp_dir):
     filenames = ["file1.json", "file2.json"]
     for filename in filenames:
@@ -112,3 +144,66 @@ def test_copy_file(temp_dir):
         f.write("")
     FileProcessor.copy_file(src_path, dst_path)
     assert os.path.exists(dst_path)
+
+def test_write_is_atomic(temp_dir, monkeypatch):
+    filepath = os.path.join(temp_dir, "test.csv")
+    FileProcessor.write_file(filepath, [{"name": "Aleksandr", "age": "17"}])
+
+    def failing_rows():
+        yield {"name": "Lucas", "age": "18"}
+        raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError):
+        FileProcessor.write_file(filepath, failing_rows())
+
+    assert FileProcessor.read_file(filepath) == [{"name": "Aleksandr", "age": "17"}]
+    assert os.listdir(temp_dir) == ["test.csv"]
+
+def test_write_unchanged_is_skipped(temp_dir):
+    filepath = os.path.join(temp_dir, "test.json")
+    FileProcessor.write_file(filepath, {"key": "value"}, format='json', fsync=True)
+    inode = os.stat(filepath).st_ino
+
+    FileProcessor.write_file(filepath, {"key": "value"}, format='json')
+    assert os.stat(filepath).st_ino == inode
+
+    FileProcessor.write_file(filepath, {"key": "other"}, format='json')
+    assert os.stat(filepath).st_ino != inode
+    assert FileProcessor.read_file(filepath) == {"key": "other"}
+
+def test_write_unchanged_leaves_no_temp_file(temp_dir):
+    filepath = os.path.join(temp_dir, "test.csv")
+    FileProcessor.write_file(filepath, [{"id": "0"}])
+    assert not FileProcessor._write_atomic(filepath, FileProcessor._write_csv, [{"id": "0"}], False)
+    assert os.listdir(temp_dir) == ["test.csv"]
+
+def test_write_after_external_change(temp_dir):
+    filepath = os.path.join(temp_dir, "test.json")
+    FileProcessor.write_file(filepath, {"key": "value"}, format='json')
+    with open(filepath, "w") as f:
+        f.write('{"key": "edited externally"}')
+
+    FileProcessor.write_file(filepath, {"key": "value"}, format='json')
+    assert FileProcessor.read_file(filepath) == {"key": "value"}
+
+def test_write_csv_streamed_and_mixed_columns(temp_dir):
+    filepath = os.path.join(temp_dir, "test.csv")
+    temp_sizes = []
+
+    def rows():
+        for i in range(20000):
+            if i == 19999:
+                temp_sizes.append(os.path.getsize(filepath + FileProcessor.TEMP_SUFFIX))
+            yield {"id": str(i)}
+
+    FileProcessor.write_file(filepath, rows())
+    assert temp_sizes[0] > 0 # rows reach the temporary file before the last one is produced
+    assert FileProcessor.read_file(filepath)[-1] == {"id": "19999"}
+
+    FileProcessor.write_file(filepath, [{"id": "0"}, {"id": "1", "extra": "x"}])
+    assert FileProcessor.read_file(filepath) == [{"id": "0", "extra": ""}, {"id": "1", "extra": "x"}]
+
+def test_write_empty_csv(temp_dir):
+    filepath = os.path.join(temp_dir, "test.csv")
+    FileProcessor.write_file(filepath, [])
+    assert FileProcessor.read_file(filepath) == []
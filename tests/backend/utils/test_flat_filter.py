@@ -1,3 +1,5 @@
+import numpy as np
+import cv2
 import pytest
 from app.backend.utils.image_conversion.utils import Size, Colors
 from app.backend.utils.image_conversion.filters import FlatFilter
@@ -27,3 +29,32 @@ def test_invalid_corners(valid_input, invalid_corners):
     src_path, dst_path, size, _ = valid_input
     with pytest.raises(TypeError):
         FlatFilter(src_path, dst_path, size, invalid_corners)
+
+def test_corners_sharing_quadrant(valid_input):
+    src_path, dst_path, size, _ = valid_input
+    with pytest.raises(ValueError):
+        FlatFilter(src_path, dst_path, size, [(8, 45), (743, 3214), (2349, 448), (151, 47)])
+
+@pytest.fixture
+def feature_image(tmp_path):
+    image = np.full((400, 600, 3), 255, dtype=np.uint8)
+    cv2.rectangle(image, (250, 150), (350, 250), (0, 0, 0), 8)
+    src_path = str(tmp_path / 'feat.png')
+    cv2.imwrite(src_path, image)
+    return src_path
+
+def test_save_tiled_matches_save_image(feature_image, tmp_path):
+    corners = [(50.0, 50.0), (550.0, 50.0), (50.0, 350.0), (550.0, 350.0)]
+    size = Size(700, 500)
+
+    FlatFilter(feature_image, str(tmp_path / 'flat.png'), size, corners).save_image()
+    untiled = cv2.imread(str(tmp_path / 'flat.png'), cv2.IMREAD_GRAYSCALE) > 0
+
+    flat_filter = FlatFilter(feature_image, str(tmp_path / 'flat.npy'), size, corners)
+    flat_filter.TILE_SIZE = 128
+    flat_filter.save_tiled(preview_path=str(tmp_path / 'preview.png'))
+    tiled = np.load(str(tmp_path / 'flat.npy'), mmap_mode='r') > 0
+
+    assert tiled.shape == (500, 700)
+    assert np.count_nonzero(tiled != untiled) <= 0.001 * tiled.size
+    assert cv2.imread(str(tmp_path / 'preview.png'), cv2.IMREAD_GRAYSCALE).shape == (500, 700)
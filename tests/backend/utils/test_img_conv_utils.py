@@ -1,5 +1,9 @@
 import pytest
-from app.backend.utils.image_conversion.utils import Colors, Size
+import numpy as np
+import cv2
+from app.backend.utils.image_conversion.utils import Colors, Size, ImageLoader, ProcessingProfile
+from app.backend.utils.image_conversion.image_converter import ImageConverter
+from app.config import DEFAULT_PROCESSING_PROFILE, PROCESSING_SCALE_FACTOR
 
 @pytest.fixture
 def default_colors():
@@ -41,4 +45,80 @@ def test_colors_custom(custom_colors):
     assert colors.contour_color == custom_colors['ctr_col']
     assert colors.selected_element_color == custom_colors['select_elem_col']
     assert colors.plate_color == custom_colors['plate_col']
-    assert colors.corner_color == custom_colors['corner_col']
\ No newline at end of file
+    assert colors.corner_color == custom_colors['corner_col']
+
+@pytest.fixture
+def large_photo(tmp_path):
+    image = np.zeros((3000, 4200, 3), dtype=np.uint8)
+    cv2.rectangle(image, (600, 600), (3600, 2400), (200, 200, 200), -1)
+    path = str(tmp_path / 'photo.jpg')
+    cv2.imwrite(path, image)
+    return path
+
+def test_image_loader_header_size(large_photo, tmp_path):
+    size = ImageLoader.get_header_size(large_photo)
+    assert (size.w, size.h) == (4200, 3000)
+
+    png_path = str(tmp_path / 'photo.png')
+    cv2.imwrite(png_path, np.zeros((30, 40, 3), dtype=np.uint8))
+    size = ImageLoader.get_header_size(png_path)
+    assert (size.w, size.h) == (40, 30)
+
+def test_image_loader_header_size_unsupported(tmp_path):
+    path = tmp_path / 'photo.txt'
+    path.write_bytes(b'not an image')
+    assert ImageLoader.get_header_size(str(path)) is None
+
+def test_image_loader_reduced_flag():
+    assert ImageLoader.get_reduced_flag(Size(4200, 3000), 2000, 2000) == cv2.IMREAD_REDUCED_COLOR_2
+    assert ImageLoader.get_reduced_flag(Size(8000, 6000), 2000, 2000) == cv2.IMREAD_REDUCED_COLOR_4
+    assert ImageLoader.get_reduced_flag(Size(16000, 12000), 2000, 2000) == cv2.IMREAD_REDUCED_COLOR_8
+    assert ImageLoader.get_reduced_flag(Size(3000, 2000), 2000, 2000) == cv2.IMREAD_COLOR
+
+def test_image_loader_load(large_photo):
+    image = ImageLoader.load(large_photo, 2000, 2000)
+    assert image.shape == (1429, 2000, 3)
+    assert abs(int(image[700, 1000, 0]) - 200) <= 2
+
+def test_processing_profile_get():
+    assert ProcessingProfile.get('draft').name == 'draft'
+    assert ProcessingProfile.get('unknown').name == DEFAULT_PROCESSING_PROFILE
+    assert ProcessingProfile.get().px_per_mm == PROCESSING_SCALE_FACTOR
+    assert ProcessingProfile.get('high').detection_scale == 1.5
+
+def test_image_converter_draft_profile(tmp_path):
+    photo = np.full((2000, 2000, 3), 40, dtype=np.uint8)
+    cv2.rectangle(photo, (300, 300), (1700, 1700), (200, 200, 200), -1)
+    cv2.circle(photo, (1000, 1000), 150, (40, 40, 40), -1)
+    photo_path = str(tmp_path / 'photo.png')
+    cv2.imwrite(photo_path, photo)
+
+    profile = ProcessingProfile.get('draft')
+    converter = ImageConverter(str(tmp_path), 200, 200, 600, profile)
+    converter.load_source_image(photo_path)
+    converter.save_binary(converter.get_auto_threshold())
+    converter.initialize_features()
+
+    assert (converter.img_size.w, converter.img_size.h) == (1200, 1200)
+    assert len(converter.features.corners) == 4
+    assert converter.save_flattened()
+    assert cv2.imread(converter.flat_path).shape[:2] == (400, 400)
+    contours, parents = converter.get_finalized_contours()
+    assert parents[0] == -1 and len(contours) > 1
+
+def test_image_converter_hole_topology(tmp_path):
+    photo = np.full((2000, 2000, 3), 40, dtype=np.uint8)
+    cv2.rectangle(photo, (300, 300), (1700, 1700), (200, 200, 200), -1)
+    cv2.circle(photo, (1000, 1000), 150, (40, 40, 40), -1)
+    photo_path = str(tmp_path / 'photo.png')
+    cv2.imwrite(photo_path, photo)
+
+    converter = ImageConverter(str(tmp_path), 200, 200, 600, ProcessingProfile.get('draft'))
+    converter.load_source_image(photo_path)
+    converter.save_binary(converter.get_auto_threshold())
+    converter.initialize_features()
+
+    assert converter.save_flattened()
+    contours, parents = converter.get_finalized_contours()
+    assert parents == [-1, 0]
+    assert cv2.contourArea(contours[1]) == pytest.approx(np.pi * (150 / 7)**2, rel=0.1)
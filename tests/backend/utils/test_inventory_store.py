@@ -0,0 +1,111 @@
+import time
+import numpy as np
+import pytest
+from app.backend.utils.inventory_store import InventoryStore
+from app.backend.utils.records import LazyRecords
+from app.backend.utils.contour_util import ContourUtil
+
+def get_plate(id, material="Aluminum", thickness=5, width=1000, height=500, contours=None, parents=None):
+    return {
+        "id": id, "preview_path": f"{id}.png", "width_(x)": width, "height_(y)": height, "thickness_(z)": thickness,
+        "material": material, "contours": contours, "contour_parents": parents, "processing_profile": None
+    }
+
+@pytest.fixture
+def store(tmp_path):
+    store = InventoryStore(str(tmp_path / "inventory.db"))
+    yield store
+    store.close()
+
+def test_wal_mode(store):
+    assert store._connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+def test_plate_round_trip(store):
+    contours = [[[0, 0], [10, 0], [10, 10]], [[2, 2], [4, 2], [4, 4], [2, 4]]]
+    plate = get_plate(3, contours=contours, parents=[-1, 0])
+    store.upsert_plate(plate)
+
+    loaded = store.get_plate(3)
+    assert {key: value for key, value in loaded.items() if key != "contours"} == {key: value for key, value in plate.items() if key != "contours"}
+    assert list(loaded.keys()) == list(plate.keys())
+    assert all(isinstance(contour, np.ndarray) and contour.dtype == np.float32 for contour in loaded["contours"])
+    assert [contour.tolist() for contour in loaded["contours"]] == contours
+    assert store.get_plate(4) is None
+
+def test_plate_from_csv_strings(store):
+    plate = get_plate("1", width="800", contours="[[[0, 0], [1, 0], [1, 1]]]", parents="[-1]")
+    store.upsert_plate(plate)
+
+    loaded = store.get_plate(1)
+    assert loaded["id"] == 1
+    assert [contour.tolist() for contour in loaded["contours"]] == [[[0, 0], [1, 0], [1, 1]]]
+    assert loaded["contour_parents"] == [-1]
+    assert store.query_plates(min_width=800) == [1]
+
+def test_pack_unpack():
+    contours = [np.array([[0, 0], [1.5, 2]], dtype=np.float32), np.array([[3, 3], [4, 4], [5, 5]], dtype=np.float32)]
+    unpacked = ContourUtil.unpack(ContourUtil.pack(contours))
+    assert len(unpacked) == 2
+    assert all(np.array_equal(a, b) for a, b in zip(contours, unpacked))
+    assert ContourUtil.unpack(ContourUtil.pack([])) == []
+
+def test_query_plates(store):
+    store.import_data({}, [], [
+        get_plate(0, "Aluminum", 5, 1000, 500),
+        get_plate(1, "Aluminum", 10, 1000, 500),
+        get_plate(2, "Steel", 5, 300, 1200),
+        get_plate(3, "Aluminum", 5, 200, 200)
+    ])
+
+    assert store.query_plates(material="Aluminum", thickness=5) == [0, 3]
+    assert store.query_plates(min_width=900, min_height=250) == [0, 1, 2]
+    assert store.query_plates(min_width=900, min_height=250, allow_rotation=False) == [0, 1]
+
+def test_query_uses_indexes(store):
+    plan = store._connection.execute("EXPLAIN QUERY PLAN SELECT id FROM plates WHERE material = ? AND thickness = ?", ("Steel", 5)).fetchall()
+    assert any("plates_material_thickness" in row[-1] for row in plan)
+
+def test_routers_and_preferences(store):
+    router = {"id": 0, "name": "Router", "machineable_area_(x-axis)": 1000}
+    store.upsert_router(router)
+    store.set_preference("processing_profile", "high")
+
+    assert store.get_router_ids() == [0]
+    assert store.get_router(0) == router
+    assert store.get_preferences() == {"processing_profile": "high"}
+
+    store.remove_router(0)
+    assert store.get_router_ids() == []
+
+def test_is_empty(store):
+    assert store.is_empty()
+    store.set_preference("key", 1)
+    assert not store.is_empty()
+
+def test_lazy_records_load_on_access(store):
+    store.import_data({}, [], [get_plate(i) for i in range(3)])
+    records = LazyRecords(store.get_plate_ids(), store.get_plate)
+
+    assert len(records) == 3
+    assert records._records == {}
+    assert records[1]["id"] == 1
+    assert list(records._records) == [1]
+    assert records[1] is records[1]
+
+    records.append(get_plate(7))
+    assert records.find(7) == 3
+    del records[0]
+    assert records.ids() == [1, 2, 7]
+    assert records.find(0) == -1
+
+def test_large_inventory_loads_lazily(store):
+    store.import_data({}, [], [get_plate(i, thickness=i % 20, contours=[[[0, 0], [1, 0], [1, 1]]], parents=[-1]) for i in range(20000)])
+
+    start = time.perf_counter()
+    records = LazyRecords(store.get_plate_ids(), store.get_plate)
+    matches = store.query_plates(material="Aluminum", thickness=7)
+    elapsed = time.perf_counter() - start
+
+    assert len(records) == 20000
+    assert len(matches) == 1000
+    assert elapsed < 1
@@ -0,0 +1,63 @@
+import os
+import numpy as np
+import pytest
+from app.backend.utils.job_workspace import JobWorkspace
+
+@pytest.fixture
+def workspace(tmp_path):
+    return JobWorkspace(str(tmp_path / "workspace"))
+
+def create_part(tmp_path, workspace, name="part.stl", content=b"solid part"):
+    source_path = tmp_path / name
+    source_path.write_bytes(content)
+    preview_path = os.path.join(workspace.folder, name + ".png")
+    with open(preview_path, "wb") as f:
+        f.write(b"png")
+    return {
+        "filename": name, "amount": 2, "outer_contour": np.array([[0.0, 0.0], [10.0, 0.0], [10.0, 5.0]]),
+        "thickness": 3.0, "preview_path": preview_path, **JobWorkspace.get_source_info(str(source_path))
+    }
+
+def test_empty_workspace(workspace):
+    assert workspace.load() == []
+    assert os.path.isdir(workspace.folder)
+
+def test_unchanged_parts_are_restored(tmp_path, workspace):
+    part = create_part(tmp_path, workspace)
+    workspace.save([part])
+
+    parts = JobWorkspace(workspace.folder).load()
+    assert len(parts) == 1
+    assert isinstance(parts[0]["outer_contour"], np.ndarray)
+    assert np.array_equal(parts[0]["outer_contour"], part["outer_contour"])
+    assert parts[0]["amount"] == 2 and parts[0]["thickness"] == 3.0
+
+def test_touched_source_with_same_content_is_restored(tmp_path, workspace):
+    part = create_part(tmp_path, workspace)
+    workspace.save([part])
+    os.utime(part["source_path"], ns=(0, 0))
+
+    parts = workspace.load()
+    assert len(parts) == 1
+    assert parts[0]["source_mtime_ns"] == 0
+
+def test_changed_and_missing_sources_are_dropped(tmp_path, workspace):
+    changed = create_part(tmp_path, workspace, "changed.stl")
+    missing = create_part(tmp_path, workspace, "missing.stl")
+    workspace.save([changed, missing])
+
+    with open(changed["source_path"], "wb") as f:
+        f.write(b"solid other")
+    os.remove(missing["source_path"])
+
+    assert workspace.load() == []
+    assert not os.path.exists(changed["preview_path"])
+    assert not os.path.exists(missing["preview_path"])
+
+def test_save_removes_unused_previews(tmp_path, workspace):
+    kept = create_part(tmp_path, workspace, "kept.stl")
+    removed = create_part(tmp_path, workspace, "removed.stl")
+    workspace.save([kept])
+
+    assert os.path.exists(kept["preview_path"])
+    assert not os.path.exists(removed["preview_path"])
@@ -0,0 +1,66 @@
+import json
+import numpy as np
+import pytest
+from app.backend.utils.journal import Journal
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return str(tmp_path / "journal.jsonl")
+
+def test_append_and_replay(journal_path):
+    journal = Journal(journal_path, 0)
+    journal.replay()
+    journal.append({"op": "set", "key": "a", "value": 1})
+    journal.append({"op": "set", "key": "b", "value": np.float32(2.5)})
+    journal.close()
+
+    entries = Journal(journal_path).replay()
+    assert [entry["key"] for entry in entries] == ["a", "b"]
+    assert entries[1]["value"] == 2.5
+
+def test_replay_drops_incomplete_last_entry(journal_path):
+    with open(journal_path, "w") as file:
+        file.write(json.dumps({"key": "a"}) + "\n" + '{"key": "b"')
+
+    journal = Journal(journal_path)
+    assert journal.replay() == [{"key": "a"}]
+    journal.append({"key": "c"})
+    journal.close()
+
+    assert Journal(journal_path).replay() == [{"key": "a"}, {"key": "c"}]
+
+def test_replay_skips_corrupted_entry(journal_path):
+    with open(journal_path, "w") as file:
+        file.write('{"key": "a"}\nnot json\n{"key": "c"}\n')
+
+    assert Journal(journal_path).replay() == [{"key": "a"}, {"key": "c"}]
+
+def test_sync_is_batched(journal_path):
+    journal = Journal(journal_path, 60)
+    journal.replay()
+    journal.append({"key": "a"})
+    assert journal._unsynced
+
+    journal.sync()
+    assert not journal._unsynced
+    journal.close()
+
+def test_rotate(journal_path):
+    journal = Journal(journal_path, 0)
+    journal.replay()
+    journal.append({"key": "a"})
+
+    assert journal.rotate()
+    assert journal.entry_count == 0
+    assert not journal.rotate() # previous rotated journal not yet removed
+
+    journal.append({"key": "b"})
+    journal.close()
+    assert Journal(journal_path).replay() == [{"key": "a"}, {"key": "b"}]
+
+    journal.remove_rotated()
+    assert Journal(journal_path).replay() == [{"key": "b"}]
+
+def test_negative_sync_interval(journal_path):
+    with pytest.raises(ValueError):
+        Journal(journal_path, -1)
@@ -0,0 +1,101 @@
+import numpy as np
+import cv2
+import pytest
+from app.backend.utils.image_conversion.utils import Size
+from app.backend.utils.image_conversion.lens import LensCalibration
+from app.backend.utils.image_conversion.image_converter import ImageConverter
+
+@pytest.fixture
+def calibration():
+    camera_matrix = np.array([[800, 0, 400], [0, 800, 300], [0, 0, 1]], dtype=np.float64)
+    return LensCalibration(camera_matrix, np.array([-0.3, 0.1, 0, 0, 0]), Size(800, 600))
+
+def test_maps_are_fixed_point_and_cached(calibration):
+    map1, map2 = calibration.get_maps(Size(400, 300))
+    assert map1.dtype == np.int16 and map1.shape == (300, 400, 2)
+    assert map2.dtype == np.uint16
+    assert calibration.get_maps(Size(400, 300))[0] is map1
+
+def test_undistort_moves_point_to_undistorted_position(calibration):
+    distorted = (700.0, 500.0)
+    expected = cv2.undistortPoints(np.array([[distorted]]), calibration.camera_matrix, calibration.dist_coeffs, P=calibration.camera_matrix).ravel()
+
+    image = np.zeros((600, 800), dtype=np.uint8)
+    cv2.circle(image, (int(distorted[0]), int(distorted[1])), 3, 255, -1)
+    undistorted = calibration.undistort(image)
+
+    moments = cv2.moments(undistorted)
+    center = (moments['m10'] / moments['m00'], moments['m01'] / moments['m00'])
+    assert np.allclose(center, expected, atol=1.5)
+
+def test_zero_distortion_is_identity():
+    calibration = LensCalibration(np.array([[500, 0, 200], [0, 500, 150], [0, 0, 1]]), np.zeros(5), Size(400, 300))
+    image = np.random.default_rng(0).integers(0, 255, (300, 400), dtype=np.uint8)
+    assert np.array_equal(calibration.undistort(image), image)
+
+def test_save_load_cached(calibration, tmp_path):
+    path = str(tmp_path / 'lens.json')
+    calibration.save(path)
+    loaded = LensCalibration.load(path)
+    assert np.allclose(loaded.camera_matrix, calibration.camera_matrix)
+    assert np.allclose(loaded.dist_coeffs, calibration.dist_coeffs)
+    assert LensCalibration.load(path) is loaded
+
+def test_image_converter_undistorts_raw(calibration, tmp_path):
+    path = str(tmp_path / 'lens.json')
+    calibration.save(path)
+    photo_path = str(tmp_path / 'photo.png')
+    cv2.imwrite(photo_path, np.full((600, 800, 3), 127, dtype=np.uint8))
+
+    converter = ImageConverter(str(tmp_path), 100, 100, 600)
+    converter.load_lens_calibration(path)
+    converter.load_source_image(photo_path)
+
+    assert (2000, 1500) in converter.lens_calibration._maps
+    assert (converter.img_size.w, converter.img_size.h) == (2000, 1500)
+
+def _save_chessboard_views(folder, count: int) -> list:
+    board = np.full((700, 1000), 255, dtype=np.uint8)
+    for i in range(10):
+        for j in range(7):
+            if (i + j) % 2 == 0:
+                board[j*100:(j+1)*100, i*100:(i+1)*100] = 0
+    board = cv2.copyMakeBorder(board, 100, 100, 100, 100, cv2.BORDER_CONSTANT, value=255)
+
+    rng = np.random.default_rng(1)
+    src = np.float32([[0, 0], [1200, 0], [0, 900], [1200, 900]])
+    paths = []
+    for i in range(count):
+        dst = src * 0.7 + 100 + rng.uniform(-60, 60, (4, 2)).astype(np.float32)
+        view = cv2.warpPerspective(board, cv2.getPerspectiveTransform(src, dst), (1200, 900), borderValue=255)
+        paths.append(str(folder / f'{i}.png'))
+        cv2.imwrite(paths[-1], view)
+    return paths
+
+def test_calibrate_from_chessboard(tmp_path):
+    calibration = LensCalibration.calibrate(_save_chessboard_views(tmp_path, 4), (9, 6))
+    assert calibration.camera_matrix.shape == (3, 3)
+    assert (calibration.resolution.w, calibration.resolution.h) == (1200, 900)
+
+def test_calibrate_requires_three_views(tmp_path):
+    with pytest.raises(ValueError):
+        LensCalibration.calibrate(_save_chessboard_views(tmp_path, 2), (9, 6))
+
+def test_maps_reject_aspect_ratio_mismatch(calibration):
+    with pytest.raises(ValueError):
+        calibration.get_maps(Size(800, 400))
+
+def test_maps_persisted_next_to_calibration(calibration, tmp_path):
+    path = str(tmp_path / 'lens.json')
+    calibration.save(path)
+    map1, map2 = calibration.get_maps(Size(400, 300))
+    assert (tmp_path / 'lens_maps_400x300.npz').exists()
+
+    LensCalibration._loaded.pop(path, None)
+    loaded = LensCalibration.load(path)
+    loaded_map1, loaded_map2 = loaded.get_maps(Size(400, 300))
+    assert np.array_equal(loaded_map1, map1) and np.array_equal(loaded_map2, map2)
+
+    changed = LensCalibration(calibration.camera_matrix, np.zeros(5), calibration.resolution)
+    changed.path = path
+    assert not np.array_equal(changed.get_maps(Size(400, 300))[0], map1)
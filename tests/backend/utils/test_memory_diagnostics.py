@@ -0,0 +1,69 @@
+import pytest
+from app.backend.utils.memory_diagnostics import MemoryDiagnostics
+
+@pytest.fixture(autouse=True)
+def diagnostics():
+    MemoryDiagnostics.records.clear()
+    yield
+    MemoryDiagnostics.disable()
+    MemoryDiagnostics.records.clear()
+
+def test_disabled_stage_records_nothing():
+    with MemoryDiagnostics.stage("disabled"):
+        data = bytearray(2**20)
+
+    assert MemoryDiagnostics.records == []
+
+def test_stage_records_growth_and_sites():
+    MemoryDiagnostics.enable()
+    with MemoryDiagnostics.stage("allocate"):
+        data = [bytearray(2**20) for _ in range(4)]
+
+    record = MemoryDiagnostics.records[0]
+    assert record["name"] == "allocate"
+    assert record["traced_growth"] >= 4 * 2**20
+    assert record["traced_peak"] >= record["traced_growth"]
+    assert any("test_memory_diagnostics.py" in site for site in record["top_sites"])
+
+def test_track_decorator():
+    MemoryDiagnostics.enable()
+
+    @MemoryDiagnostics.track("tracked")
+    def allocate(size):
+        return bytearray(size)
+
+    assert len(allocate(2**20)) == 2**20
+    assert MemoryDiagnostics.records[0]["name"] == "tracked"
+
+def test_checkpoint_detects_surviving_growth():
+    MemoryDiagnostics.enable()
+    leaked = []
+
+    MemoryDiagnostics.checkpoint_start("window")
+    leaked.append(bytearray(2**21))
+    temporary = bytearray(2**21)
+    del temporary
+    MemoryDiagnostics.checkpoint_end("window")
+
+    record = MemoryDiagnostics.records[0]
+    assert record["kind"] == "checkpoint"
+    assert 2**21 <= record["traced_growth"] < 2 * 2**21
+
+def test_checkpoint_end_without_start_is_ignored():
+    MemoryDiagnostics.enable()
+    MemoryDiagnostics.checkpoint_end("missing")
+
+    assert MemoryDiagnostics.records == []
+
+def test_save_report(tmp_path):
+    MemoryDiagnostics.enable()
+    with MemoryDiagnostics.stage("report"):
+        data = bytearray(2**20)
+
+    path = tmp_path / "report.txt"
+    MemoryDiagnostics.save_report(str(path))
+    assert "[stage] report" in path.read_text()
+
+def test_get_rss():
+    rss = MemoryDiagnostics.get_rss()
+    assert rss is None or rss > 0
@@ -0,0 +1,73 @@
+import numpy as np
+import cv2
+import pytest
+from app.backend.utils.image_conversion.utils import Size
+from app.backend.utils.image_conversion.features import MultiPlateDetector
+from app.backend.utils.image_conversion.image_converter import ImageConverter
+from app.backend.utils.image_conversion.multi_plate import MultiPlateConverter
+from app.backend.utils.image_conversion.station import StationProfile
+
+@pytest.fixture
+def cart_photo(tmp_path):
+    image = np.full((1500, 2000, 3), 40, dtype=np.uint8)
+    cv2.rectangle(image, (200, 200), (800, 600), (200, 200, 200), -1)     # 300 x 200 mm with hole
+    cv2.circle(image, (500, 400), 80, (40, 40, 40), -1)
+    cv2.rectangle(image, (1000, 300), (1800, 1300), (200, 200, 200), -1)  # 400 x 500 mm
+    triangle = np.array([[200, 1300], [700, 1300], [450, 900]])
+    cv2.fillPoly(image, [triangle], (200, 200, 200))                      # not a plate with four corners
+    path = str(tmp_path / 'cart.png')
+    cv2.imwrite(path, image)
+    return path
+
+@pytest.fixture
+def converter(cart_photo, tmp_path):
+    converter = ImageConverter(str(tmp_path), 1, 1, 600)
+    converter.load_source_image(cart_photo)
+    converter.save_binary(converter.get_auto_threshold())
+    return converter
+
+def test_detects_all_plates(converter):
+    plates = MultiPlateDetector(converter.bin_path, converter.img_size).plates
+
+    assert len(plates) == 3
+    assert [len(plate.corners) for plate in plates[:2]] == [4, 4]
+    assert len(plates[0].other_contours) == 1
+    assert plates[1].other_contours is None
+
+def test_process_matches_inventory(converter):
+    inventory = [
+        {"id": 7, "width_(x)": "500", "height_(y)": "400"},
+        {"id": 3, "width_(x)": "300", "height_(y)": "205"},
+        {"id": 9, "width_(x)": "1000", "height_(y)": "1000"}
+    ]
+    multi_converter = MultiPlateConverter(converter, px_per_mm=2)
+    results = multi_converter.process(inventory, max_workers=2)
+
+    assert [result.plate_id for result in results] == [3, 7, None]
+
+    first, second, triangle = results
+    assert first.measured_size.w == pytest.approx(300, abs=2)
+    assert first.measured_size.h == pytest.approx(200, abs=2)
+    assert first.contour_parents[0] == -1 and len(first.contours) > 1
+    assert second.contours and second.error is None
+    assert triangle.contours is None and triangle.error is not None
+
+def test_invalid_scale(converter):
+    with pytest.raises(ValueError):
+        MultiPlateConverter(converter, 0)
+
+def test_scale_from_station_profile(converter):
+    with pytest.raises(ValueError):
+        MultiPlateConverter(converter)
+
+    converter.station_profile = StationProfile([(200, 200), (800, 200), (200, 600), (800, 600)], Size(2000, 1500), Size(300, 200))
+    assert MultiPlateConverter(converter).px_per_mm == pytest.approx(2)
+
+def test_process_rotates_contours_to_inventory_orientation(converter):
+    inventory = [{"id": 3, "width_(x)": "200", "height_(y)": "300"}]
+    first = MultiPlateConverter(converter, px_per_mm=2).process(inventory, max_workers=1)[0]
+
+    assert first.plate_id == 3
+    outline = first.contours[first.contour_parents.index(-1)]
+    assert outline[:, 0].max() == pytest.approx(200, abs=2)
+    assert outline[:, 1].max() == pytest.approx(300, abs=2)
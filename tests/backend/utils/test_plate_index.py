@@ -0,0 +1,83 @@
+import pytest
+from app.backend.utils.plate_index import PlateIndex
+
+def get_plate(id, material="Aluminum", thickness=5, width=1000, height=500, contours=None, parents=None):
+    return {
+        "id": id, "width_(x)": width, "height_(y)": height, "thickness_(z)": thickness,
+        "material": material, "contours": contours, "contour_parents": parents
+    }
+
+@pytest.fixture
+def plates():
+    return [
+        get_plate(0, width=1000, height=500),
+        get_plate(1, width=300, height=300),
+        get_plate(2, width=1200, height=1200, thickness=10),
+        get_plate(3, width=2000, height=2000, material="Steel"),
+        # L-shaped remnant, 400x100 strip along bottom and 100x400 strip along left side
+        get_plate(4, width=400, height=400, contours=[[[0, 0], [400, 0], [400, 100], [100, 100], [100, 400], [0, 400]]], parents=[-1])
+    ]
+
+@pytest.fixture
+def index(plates):
+    loaded = []
+    def loader(material, thickness):
+        loaded.append((material, thickness))
+        return [plate for plate in plates if plate["material"] == material and float(plate["thickness_(z)"]) == float(thickness)]
+    index = PlateIndex(loader)
+    index.loaded = loaded
+    return index
+
+def test_find_groups_by_material_and_thickness(index):
+    assert index.find("Aluminum", 5, 200, 200) == [0, 1]
+    assert index.find("Aluminum", "10", 200, 200) == [2]
+    assert index.find("Steel", 5, 200, 200) == [3]
+    assert index.find("Steel", 10, 200, 200) == []
+    assert index.find("Copper", 5, 1, 1) == []
+
+def test_find_with_rotation(index):
+    assert index.find("Aluminum", 5, 400, 900) == [0]
+    assert index.find("Aluminum", 5, 400, 900, allow_rotation=False) == []
+
+def test_find_uses_usable_region(index):
+    assert index.find("Aluminum", 5, 350, 80, allow_rotation=False) == [0, 4]
+    assert index.find("Aluminum", 5, 80, 350, allow_rotation=False) == [0, 4]
+    assert 4 not in index.find("Aluminum", 5, 200, 200)
+
+def test_groups_built_once(index):
+    index.find("Aluminum", 5, 10, 10)
+    index.find("Aluminum", 5.0, 20, 20)
+    assert index.loaded == [("Aluminum", 5.0)]
+
+def test_update_and_remove(index, plates):
+    assert index.find("Aluminum", 5, 900, 900) == []
+
+    plates[1]["width_(x)"], plates[1]["height_(y)"] = 1000, 1000
+    index.update(plates[1])
+    assert index.find("Aluminum", 5, 900, 900) == [1]
+
+    plates[1]["material"] = "Steel"
+    index.update(plates[1])
+    assert index.find("Aluminum", 5, 900, 900) == []
+
+    index.remove(0)
+    assert index.find("Aluminum", 5, 1, 1) == [4]
+
+class RecordingList(list):
+    def __init__(self, entries):
+        super().__init__(entries)
+        self.visited = []
+
+    def __getitem__(self, index):
+        self.visited.append(index)
+        return super().__getitem__(index)
+
+def test_find_skips_entries_too_low():
+    plates = [get_plate(id, width=1000 + id, height=100) for id in range(50)] + [get_plate(50, width=1100, height=600)]
+    index = PlateIndex(lambda material, thickness: plates)
+    index.find("Aluminum", 5, 1, 1)
+    key = ("Aluminum", 5.0)
+    index._groups[key] = RecordingList(index._groups[key])
+
+    assert index.find("Aluminum", 5, 500, 500, allow_rotation=False) == [50]
+    assert index._groups[key].visited == [50]
@@ -2,7 +2,11 @@ import os
 import pytest
 import tempfile
 import numpy as np
+import cv2
 from app.backend.utils.plate_util import PlateUtil
+from app.backend.utils.contour_util import ContourUtil
+from app.backend.utils.image_conversion.utils import ProcessingProfile
+from app.backend.utils.image_conversion.image_converter import ImageConverter
 from app.config import PLATE_PREVIEW_DATA_PATH
 
 @pytest.fixture
@@ -20,6 +24,8 @@ def test_get_new_plate():
     assert new_plate["thickness_(z)"] == PlateUtil.DEFAULT_Z
     assert new_plate["material"] == PlateUtil.DEFAULT_MATERIAL
     assert new_plate["contours"] == None
+    assert new_plate["contour_parents"] == None
+    assert new_plate["processing_profile"] == None
 
 def test__get_next_plate_id_empty_list():
     plate_data = []
@@ -45,4 +51,78 @@ def test_save_plate_preview(temp_dir):
         "contours": None
     } 
     PlateUtil.save_preview_image(plate_data)
-    assert os.path.exists(plate_data["preview_path"])
\ No newline at end of file
+    assert os.path.exists(plate_data["preview_path"])
+
+def test_match_plates():
+    plate_data = [
+        {"id": 0, "width_(x)": "500", "height_(y)": "400"},
+        {"id": 1, "width_(x)": 300, "height_(y)": 200},
+        {"id": 2, "width_(x)": 302, "height_(y)": 201}
+    ]
+    matches = PlateUtil.match_plates([(200, 300), (301, 200), (401, 500), (900, 900)], plate_data, tolerance=5)
+    assert matches == [1, 2, 0, None]
+
+@pytest.fixture
+def full_plate(temp_dir):
+    return {
+        "id": 1,
+        "preview_path": os.path.join(temp_dir, "1.png"),
+        "width_(x)": 100,
+        "height_(y)": 50,
+        "contours": None,
+        "contour_parents": None
+    }
+
+def test_subtract_parts_leaves_hole(full_plate):
+    part = np.array([[10, 10], [30, 10], [30, 30], [10, 30]])
+    PlateUtil.subtract_parts(full_plate, [part], tool_diameter=2)
+
+    assert full_plate["contour_parents"] == [-1, 0]
+    outline, hole = (np.array(contour) for contour in full_plate["contours"])
+    assert outline.min(axis=0) == pytest.approx([0, 0], abs=0.5)
+    assert outline.max(axis=0) == pytest.approx([99.8, 49.8], abs=0.5)
+    assert hole.min(axis=0) == pytest.approx([8, 8], abs=0.5)
+    assert hole.max(axis=0) == pytest.approx([32, 32], abs=0.5)
+    assert os.path.exists(full_plate["preview_path"])
+
+def test_subtract_parts_keeps_existing_holes(full_plate):
+    PlateUtil.subtract_parts(full_plate, [np.array([[10, 10], [20, 10], [20, 20], [10, 20]])], tool_diameter=0)
+    full_plate["contours"] = str(full_plate["contours"]) # as read back from csv
+    full_plate["contour_parents"] = str(full_plate["contour_parents"])
+
+    PlateUtil.subtract_parts(full_plate, [np.array([[80, -5], [105, -5], [105, 55], [80, 55]])], tool_diameter=0)
+
+    assert full_plate["contour_parents"] == [-1, 0]
+    outline = np.array(full_plate["contours"][0])
+    assert outline[:, 0].max() == pytest.approx(79.8, abs=0.5)
+
+def test_get_usable_rectangles_full_plate(full_plate):
+    assert PlateUtil.get_usable_rectangles(full_plate) == [(100, 50)]
+
+def test_get_usable_rectangles_with_hole(full_plate):
+    part = np.array([[40, 0], [60, 0], [60, 50], [40, 50]]) # splits plate into two 40x50 areas
+    PlateUtil.subtract_parts(full_plate, [part], tool_diameter=0)
+
+    rectangles = PlateUtil.get_usable_rectangles(full_plate)
+    assert len(rectangles) == 1
+    assert rectangles[0] == pytest.approx((40, 50), abs=2)
+    assert all(w <= 40 and h <= 50 for w, h in rectangles)
+
+def test_usable_mask_converted_plate_with_hole(temp_dir):
+    photo = np.full((2000, 2000, 3), 40, dtype=np.uint8)
+    cv2.rectangle(photo, (300, 300), (1700, 1700), (200, 200, 200), -1)
+    cv2.circle(photo, (1000, 1000), 150, (40, 40, 40), -1)
+    photo_path = os.path.join(temp_dir, "photo.png")
+    cv2.imwrite(photo_path, photo)
+
+    converter = ImageConverter(temp_dir, 200, 200, 600, ProcessingProfile.get('draft'))
+    converter.load_source_image(photo_path)
+    converter.save_binary(converter.get_auto_threshold())
+    converter.initialize_features()
+    assert converter.save_flattened()
+    contours, parents = converter.get_finalized_contours()
+
+    plate = {"id": 1, "width_(x)": 200, "height_(y)": 200, "contours": ContourUtil.serialize(contours), "contour_parents": parents}
+    mask = PlateUtil._get_usable_mask(plate, scale=1)
+    assert mask[100, 100] == 0
+    assert mask[40, 40] == 255
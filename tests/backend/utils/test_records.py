@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+from app.backend.utils.records import PlateRecord, RouterRecord, RecordCollection, LazyRecords
+
+def get_plate(id, contours=None):
+    return PlateRecord.from_dict({
+        "id": id, "preview_path": f"{id}.png", "width_(x)": 1000, "height_(y)": 500, "thickness_(z)": 5,
+        "material": "Aluminum", "contours": contours, "contour_parents": None, "processing_profile": None
+    })
+
+def test_record_dict_access():
+    plate = PlateRecord.from_dict({"id": "3", "width_(x)": "1000", "thickness_(z)": "2.5", "material": "Steel", "note": "extra"})
+
+    assert plate["id"] == 3 and plate.id == 3
+    assert plate["width_(x)"] == 1000 and plate.width == 1000
+    assert plate["thickness_(z)"] == 2.5
+    assert plate["note"] == "extra"
+    assert plate.get("missing", 1) == 1
+    assert "note" in plate and "missing" not in plate
+
+    plate["height_(y)"] = "400"
+    assert plate.height == 400
+    assert list(plate.keys())[-1] == "note"
+
+def test_record_has_no_dict():
+    router = RouterRecord.from_dict({"id": 0, "name": "Router"})
+    assert not hasattr(router, "__dict__")
+    with pytest.raises(AttributeError):
+        router.unknown = 1
+
+def test_record_equals_dict():
+    plate = get_plate(1)
+    assert plate == plate.to_dict()
+    assert plate == get_plate(1)
+    assert plate != get_plate(2)
+
+def test_plate_contours_as_arrays():
+    plate = get_plate(1, contours="[[[0, 0], [10, 0], [10, 10]]]")
+    contours = plate["contours"]
+
+    assert isinstance(contours[0], np.ndarray) and contours[0].dtype == np.float32
+    assert plate["contours"] is contours
+    assert plate.to_dict()["contours"] == [[[0.0, 0.0], [10.0, 0.0], [10.0, 10.0]]]
+
+    plate["contours"] = ""
+    assert plate["contours"] is None
+
+def test_record_copy_is_independent():
+    plate = get_plate(1, contours="[[[0, 0], [10, 0], [10, 10]]]")
+    plate["note"] = "extra"
+    copy = plate.copy()
+
+    assert copy._contours == "[[[0, 0], [10, 0], [10, 10]]]"
+    assert copy.to_dict() == plate.to_dict() and copy is not plate
+    copy["width_(x)"], copy["note"] = 200, "changed"
+    assert (plate["width_(x)"], plate["note"]) == (1000, "extra")
+
+def test_collection_find_and_next_id():
+    plates = RecordCollection([get_plate(0), get_plate(4), get_plate(2)])
+
+    assert plates.find(4) == 1
+    assert plates.find("2") == 2
+    assert plates.find(7) == -1
+    assert plates.get(2)["id"] == 2
+    assert plates.next_id() == 5
+
+    del plates[0]
+    assert plates.find(4) == 0 and plates.find(2) == 1 and plates.find(0) == -1
+    del plates[1]
+    assert plates.next_id() == 5 # removed ids are not reused
+
+def test_collection_rejects_duplicate_ids():
+    plates = RecordCollection([get_plate(0), get_plate(1)])
+    with pytest.raises(ValueError):
+        plates.append(get_plate(1))
+    with pytest.raises(ValueError):
+        plates[0] = get_plate(1)
+
+    plates[0] = get_plate(5)
+    assert plates.ids() == [5, 1]
+    assert plates.find(0) == -1 and plates.find(5) == 0
+
+def test_lazy_records_load_on_access():
+    loaded = []
+    def loader(id):
+        loaded.append(id)
+        return get_plate(id)
+
+    plates = LazyRecords([0, 1, 2], loader)
+    assert len(plates) == 3 and plates.next_id() == 3
+    assert plates.find(2) == 2
+    assert loaded == []
+
+    assert plates[1] is plates[1]
+    assert loaded == [1]
@@ -0,0 +1,105 @@
+import os
+import numpy as np
+import cv2
+import pytest
+from app.backend.utils.image_conversion.utils import Size
+from app.backend.utils.image_conversion.station import StationProfile
+from app.backend.utils.image_conversion.image_converter import ImageConverter
+
+@pytest.fixture
+def profile():
+    return StationProfile([(1700, 1700), (300, 300), (300, 1700), (1700, 300)], Size(2000, 2000))
+
+def _save_photo(path: str, offset: int=0):
+    image = np.full((2000, 2000, 3), 40, dtype=np.uint8)
+    cv2.rectangle(image, (300 + offset, 300 + offset), (1700 + offset, 1700 + offset), (200, 200, 200), -1)
+    cv2.circle(image, (1000, 1000), 150, (40, 40, 40), -1)
+    cv2.imwrite(path, image)
+
+def test_corners_sorted(profile):
+    assert profile.corners == [(300, 300), (1700, 300), (300, 1700), (1700, 1700)]
+
+def test_invalid_corners():
+    with pytest.raises(ValueError):
+        StationProfile([(0, 0), (1, 1), (2, 2)], Size(10, 10))
+
+def test_transformation_matrix_maps_corners(profile):
+    matrix = profile.get_transformation_matrix(Size(1000, 1000), Size(500, 250))
+    corners = np.array(profile.get_corners(Size(1000, 1000)), dtype=np.float32).reshape(-1, 1, 2)
+    mapped = cv2.perspectiveTransform(corners, matrix).reshape(-1, 2)
+    assert np.allclose(mapped, [[0, 0], [500, 0], [0, 250], [500, 250]], atol=1e-3)
+
+def test_aspect_ratio_mismatch(profile):
+    with pytest.raises(ValueError):
+        profile.get_corners(Size(2000, 1000))
+
+def test_save_load(profile, tmp_path):
+    path = str(tmp_path / 'station.json')
+    profile.save(path)
+    loaded = StationProfile.load(path)
+    assert loaded.corners == profile.corners
+    assert np.allclose(loaded.homography, profile.homography)
+
+def test_jig_size_save_load(tmp_path):
+    path = str(tmp_path / 'station.json')
+    StationProfile([(100, 100), (700, 100), (100, 500), (700, 500)], Size(1000, 1000), Size(300, 200)).save(path)
+    loaded = StationProfile.load(path)
+    assert (loaded.jig_size.w, loaded.jig_size.h) == (300, 200)
+    assert loaded.get_px_per_mm(Size(500, 500)) == pytest.approx(1)
+
+def test_refine_corners():
+    image = np.full((500, 500), 40, dtype=np.uint8)
+    cv2.rectangle(image, (103, 98), (403, 402), 200, -1)
+    refined = StationProfile.refine_corners(image, [(100, 100), (400, 100), (100, 400), (400, 400)])
+    assert np.allclose(refined, [(103, 98), (403, 98), (103, 402), (403, 402)], atol=1)
+
+def test_image_converter_station_mode(tmp_path):
+    calibration_path, photo_path = str(tmp_path / 'calibration.png'), str(tmp_path / 'photo.png')
+    station_path = str(tmp_path / 'station.json')
+    _save_photo(calibration_path)
+    _save_photo(photo_path, offset=3)
+
+    calibration = ImageConverter(str(tmp_path), 200, 200, 600)
+    calibration.load_source_image(calibration_path)
+    calibration.save_binary(calibration.get_auto_threshold())
+    calibration.initialize_features()
+    assert calibration.save_station_profile(station_path)
+
+    data_folder = tmp_path / 'station'
+    data_folder.mkdir()
+    converter = ImageConverter(str(data_folder), 200, 200, 600)
+    converter.load_source_image(photo_path)
+    converter.save_binary(converter.get_auto_threshold())
+    converter.load_station_profile(station_path)
+
+    assert converter.save_flattened_station()
+    contours, parents = converter.get_finalized_contours()
+    assert -1 in parents
+    assert len(contours) == len(parents) > 1
+    assert os.path.exists(converter.flat_path)
+
+def test_image_converter_station_hole_topology(tmp_path):
+    calibration_path, photo_path = str(tmp_path / 'calibration.png'), str(tmp_path / 'photo.png')
+    station_path = str(tmp_path / 'station.json')
+    _save_photo(calibration_path)
+    _save_photo(photo_path)
+
+    calibration = ImageConverter(str(tmp_path), 200, 200, 600)
+    calibration.load_source_image(calibration_path)
+    calibration.save_binary(calibration.get_auto_threshold())
+    calibration.initialize_features()
+    assert calibration.save_station_profile(station_path)
+    assert calibration.save_flattened()
+    manual_contours, manual_parents = calibration.get_finalized_contours()
+
+    data_folder = tmp_path / 'station'
+    data_folder.mkdir()
+    converter = ImageConverter(str(data_folder), 200, 200, 600)
+    converter.load_source_image(photo_path)
+    converter.save_binary(converter.get_auto_threshold())
+    converter.load_station_profile(station_path)
+
+    assert converter.save_flattened_station()
+    contours, parents = converter.get_finalized_contours()
+    assert parents == manual_parents == [-1, 0]
+    assert cv2.contourArea(contours[1]) == pytest.approx(cv2.contourArea(manual_contours[1]), rel=0.05)
@@ -0,0 +1,26 @@
+from benchmarks.pipeline_benchmark import PipelineBenchmark
+
+def get_summary(time_s, peak_mb, stage="binary", scale="1x"):
+    return {scale: {stage: {"time_s": time_s, "peak_mb": peak_mb, "runs": 4}}}
+
+def test_compare_within_tolerances():
+    baselines = get_summary(0.1, 10)
+    assert PipelineBenchmark.compare(get_summary(0.19, 11.9), baselines) == []
+    assert PipelineBenchmark.compare(get_summary(0.05, 5), baselines) == []
+
+def test_compare_time_regression():
+    regressions = PipelineBenchmark.compare(get_summary(0.21, 10), get_summary(0.1, 10))
+    assert regressions == ["1x binary: 0.2100 s > baseline 0.1000 s"]
+
+def test_compare_ignores_small_time_deltas():
+    baselines = get_summary(0.002, 10)
+    assert PipelineBenchmark.compare(get_summary(0.011, 10), baselines) == []
+    assert len(PipelineBenchmark.compare(get_summary(0.013, 10), baselines)) == 1
+
+def test_compare_memory_regression():
+    regressions = PipelineBenchmark.compare(get_summary(0.1, 12.5), get_summary(0.1, 10))
+    assert regressions == ["1x binary: 12.50 MB > baseline 10.00 MB"]
+
+def test_compare_skips_stages_without_baseline():
+    results = {**get_summary(1.0, 100), **get_summary(1.0, 100, "load", "4x")}
+    assert PipelineBenchmark.compare(results, get_summary(0.1, 10, "render")) == []
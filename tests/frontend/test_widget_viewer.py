@@ -0,0 +1,42 @@
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+import cv2
+import pytest
+from PyQt6.QtWidgets import QApplication, QWidget
+from app.frontend.utils.util_widgets.widget_viewer import WidgetViewer
+from app.frontend.utils.util_widgets.preview_widget import PreviewWidget
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+def test_pages_built_when_shown(app):
+    built = []
+    def factory(idx):
+        built.append(idx)
+        return QWidget()
+
+    viewer = WidgetViewer(2, 1, [None] * 5, factory)
+    assert built == [0, 1]
+
+    viewer.next_tab()
+    assert built == [0, 1, 2, 3]
+
+    viewer.prev_tab()
+    assert built == [0, 1, 2, 3]
+
+def test_preview_loaded_when_shown(app, tmp_path):
+    png_path = str(tmp_path / "preview.png")
+    cv2.imwrite(png_path, np.full((10, 20), 255, dtype=np.uint8))
+
+    preview = PreviewWidget(png_path)
+    viewer = WidgetViewer(1, 1, [QWidget(), preview])
+    viewer.show()
+    assert preview.pixmap is None
+
+    viewer.next_tab()
+    app.processEvents()
+    assert preview.pixmap is not None and preview.pixmap.width() == 20
+    viewer.close()